@@ -1,4 +1,5 @@
 from admin.actions import (
+    ProfilesAdminView,
     ReingestFileAdminView,
     ReingestFromS3AdminView,
     RetrieveFailedSubmissionAdminView,
@@ -43,3 +44,4 @@ def register_admin_views(flask_admin, db):
             name="Retrieve Failed Submission", endpoint="retrieve_failed_submission", category="Admin actions"
         )
     )
+    flask_admin.add_view(ProfilesAdminView(name="Profiles", endpoint="profiles", category="Admin actions"))
@@ -1,7 +1,7 @@
 from io import BytesIO
 
 import requests
-from flask import current_app, flash, g, redirect, request, url_for
+from flask import Response, current_app, flash, g, redirect, request, url_for
 from flask_admin import BaseView, expose
 from flask_admin.helpers import flash_errors
 from sqlalchemy.exc import NoResultFound
@@ -19,6 +19,7 @@ from data_store.controllers.ingest import ingest
 from data_store.controllers.retrieve_submission_file import retrieve_submission_file
 from data_store.db import db
 from data_store.db.entities import Submission
+from data_store.profiling import ProfileStore
 
 
 class BaseAdminView(AdminAuthorizationMixin, BaseView):
@@ -195,3 +196,33 @@ class RetrieveFailedSubmissionAdminView(BaseAdminView):
             flash_errors(form, "%(error)s")
 
         return self.render("admin/retrieve_failed_submission.html", form=form)
+
+
+class ProfilesAdminView(BaseAdminView):
+    @expose("/", methods=["GET"])
+    def index(self):
+        profiles = ProfileStore.from_config(current_app.config).list_profiles()
+        sources = sorted({profile.source for profile in profiles})
+
+        source = request.args.get("source")
+        if source:
+            profiles = [profile for profile in profiles if profile.source == source]
+
+        sort = request.args.get("sort", "recent")
+        if sort == "duration":
+            profiles.sort(key=lambda profile: profile.duration, reverse=True)
+
+        return self.render("admin/profiles.html", profiles=profiles, sources=sources, source=source, sort=sort)
+
+    @expose("/<profile>", methods=["GET"])
+    def download(self, profile: str):
+        try:
+            content = ProfileStore.from_config(current_app.config).get_profile(profile)
+        except FileNotFoundError as e:
+            flash(str(e), "error")
+            return redirect(url_for("profiles.index"))
+
+        current_app.logger.warning("Profile %s downloaded by %s", profile, g.user.email)
+        return Response(
+            content, mimetype="text/plain", headers={"Content-Disposition": f'attachment; filename="{profile}"'}
+        )
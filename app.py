@@ -27,7 +27,9 @@ from config import Config
 from data_store.celery import make_task
 from data_store.cli import create_cli
 from data_store.db import db, migrate
+from data_store.db.query_profiler import query_profiler
 from data_store.metrics import metrics_reporter
+from data_store.profiling import sampling_profiler
 from submit import setup_funds_and_auth
 
 WORKING_DIR = Path(__file__).parent
@@ -79,6 +81,8 @@ def create_app(config_class=Config) -> Flask:
         )
 
     metrics_reporter.init_app(flask_app)
+    query_profiler.init_app(flask_app)
+    sampling_profiler.init_app(flask_app)
 
     # Template configuration
     flask_app.jinja_env.lstrip_blocks = True
@@ -1,5 +1,6 @@
+import threading
 from io import BytesIO, IOBase
-from typing import IO, Union
+from typing import IO, TYPE_CHECKING, Union
 from uuid import UUID
 
 from boto3 import client
@@ -10,18 +11,43 @@ from config import Config
 from data_store.const import EXCEL_MIMETYPE
 from data_store.util import get_file_format_from_content_type, get_human_readable_file_size
 
-if hasattr(Config, "AWS_ACCESS_KEY_ID") and hasattr(Config, "AWS_SECRET_ACCESS_KEY"):
-    _S3_CLIENT = client(
-        "s3",
-        aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
-        region_name=Config.AWS_REGION,
-        endpoint_url=Config.AWS_ENDPOINT_OVERRIDE,
-        config=Config.AWS_CONFIG if hasattr(Config, "AWS_CONFIG") else None,
-    )
-else:
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+_S3_CLIENT: "S3Client | None" = None
+_S3_CLIENT_LOCK = threading.Lock()
+
+
+def get_s3_client() -> "S3Client":
+    """Returns the process-wide S3 client, creating it on first use.
+
+    Creating a botocore client loads the S3 service model from disk, which is slow enough to noticeably delay every
+    process that imports this module. Deferring creation means gunicorn workers, Celery workers and CLI commands that
+    never touch S3 do not pay for it. Creation is guarded by a lock so concurrent first calls share a single client.
+
+    :return: a boto3 S3 client
+    """
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        with _S3_CLIENT_LOCK:
+            if _S3_CLIENT is None:
+                _S3_CLIENT = _create_s3_client()
+    return _S3_CLIENT
+
+
+def _create_s3_client() -> "S3Client":
+    if hasattr(Config, "AWS_ACCESS_KEY_ID") and hasattr(Config, "AWS_SECRET_ACCESS_KEY"):
+        return client(
+            "s3",
+            aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+            region_name=Config.AWS_REGION,
+            endpoint_url=Config.AWS_ENDPOINT_OVERRIDE,
+            config=Config.AWS_CONFIG if hasattr(Config, "AWS_CONFIG") else None,
+        )
+
     # boto gets access keys from the environment directly in AWS
-    _S3_CLIENT = client(
+    return client(
         "s3",
         region_name=Config.AWS_REGION,
     )
@@ -49,7 +75,7 @@ def upload_file(file: Union[IO, FileStorage], bucket: str, object_name: str, met
         raise TypeError("Unsupported file type. Expected IO or FileStorage.")
 
     file.seek(0)
-    _S3_CLIENT.upload_fileobj(
+    get_s3_client().upload_fileobj(
         file.stream if isinstance(file, FileStorage) else file,
         bucket,
         object_name,
@@ -65,7 +91,7 @@ def get_file(bucket: str, object_name: str) -> tuple[BytesIO, dict, str]:
     :param object_name: S3 object name
     :return: retrieved file as a BytesIO
     """
-    response = _S3_CLIENT.get_object(Bucket=bucket, Key=object_name)
+    response = get_s3_client().get_object(Bucket=bucket, Key=object_name)
     return BytesIO(response["Body"].read()), response["Metadata"], response["ContentType"]
 
 
@@ -79,7 +105,7 @@ def get_failed_file_key(failure_uuid: UUID) -> str:
     :return: the full key used in S3 for the failed file
     """
     uuid_str = str(failure_uuid)
-    response = _S3_CLIENT.list_objects_v2(Bucket=Config.AWS_S3_BUCKET_FAILED_FILES)
+    response = get_s3_client().list_objects_v2(Bucket=Config.AWS_S3_BUCKET_FAILED_FILES)
     file_list = response["Contents"]
     file_key = next((file["Key"] for file in file_list if uuid_str in file["Key"]), None)
     if not file_key:
@@ -96,7 +122,7 @@ def get_file_header(bucket_name: str, file_key: str) -> dict:
     """
 
     try:
-        s3_response = _S3_CLIENT.head_object(Bucket=bucket_name, Key=file_key)
+        s3_response = get_s3_client().head_object(Bucket=bucket_name, Key=file_key)
     except ClientError as error:
         if error.response["Error"]["Code"] == "404":
             raise FileNotFoundError(f"Could not find file {file_key} in S3.") from error
@@ -128,7 +154,7 @@ def create_presigned_url(bucket_name: str, file_key: str, filename: str, expirat
     except FileNotFoundError as error:
         raise error
 
-    presigned_url = _S3_CLIENT.generate_presigned_url(
+    presigned_url = get_s3_client().generate_presigned_url(
         "get_object",
         Params={
             "Bucket": bucket_name,
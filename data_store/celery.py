@@ -1,14 +1,19 @@
 import time
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from os import getpid
 
 from celery import Task
 
+from data_store.db.query_profiler import log_query_profile, profile_queries
+from data_store.memory import track_memory
+from data_store.profiling import sample_profile, should_sample
+
 
 def make_task(app):
     class FSDTask(Task):
         abstract = True
         start = None
+        memory: dict = {}
 
         @property
         def queue_name(self):
@@ -20,6 +25,22 @@ def make_task(app):
             with app.app_context():
                 yield
 
+        def warn_if_over_memory_ceiling(self):
+            max_memory_kib = app.config["CELERY"].get("worker_max_memory_per_child")
+            if max_memory_kib and self.memory.get("peak_rss", 0) > max_memory_kib * 1024:
+                app.logger.warning(
+                    "Celery task %s (task_id: %s) took the worker over its memory ceiling, so it will be replaced",
+                    self.name,
+                    self.request.id,
+                    extra={
+                        "task_id": self.request.id,
+                        "celery_task": self.name,
+                        "peak_rss": self.memory["peak_rss"],
+                        "max_memory_per_child": max_memory_kib * 1024,
+                        "process_": getpid(),
+                    },
+                )
+
         def on_success(self, retval, task_id, args, kwargs):
             with self.app_context():
                 elapsed_time = time.monotonic() - self.start
@@ -35,6 +56,7 @@ def make_task(app):
                         "celery_task": self.name,
                         "queue_name": self.queue_name,
                         "time_taken": elapsed_time,
+                        **self.memory,
                         # avoid name collision with LogRecord's own `process` attribute
                         "process_": getpid(),
                     },
@@ -55,6 +77,7 @@ def make_task(app):
                         "celery_task": self.name,
                         "queue_name": self.queue_name,
                         "time_taken": elapsed_time,
+                        **self.memory,
                         # avoid name collision with LogRecord's own `process` attribute
                         "process_": getpid(),
                     },
@@ -79,6 +102,22 @@ def make_task(app):
                     },
                 )
 
-                return super().__call__(*args, **kwargs)
+                with ExitStack() as profilers:
+                    # callbacks run in reverse, so this runs once the memory has been measured
+                    profilers.callback(self.warn_if_over_memory_ceiling)
+                    self.memory = profilers.enter_context(track_memory(app.config["CELERY_TRACEMALLOC_TOP_N"]))
+                    if should_sample(app.config["SAMPLING_PROFILER_RATE"]):
+                        profilers.enter_context(sample_profile(self.name))
+
+                    if not app.config["ENABLE_QUERY_PROFILER"]:
+                        return super().__call__(*args, **kwargs)
+
+                    with profile_queries(app.config["QUERY_PROFILER_SLOWEST"]) as query_profile:
+                        try:
+                            return super().__call__(*args, **kwargs)
+                        finally:
+                            log_query_profile(
+                                query_profile, self.name, task_id=self.request.id, queue_name=self.queue_name
+                            )
 
     return FSDTask
@@ -17,7 +17,12 @@ from data_store.controllers.admin_tasks import reingest_file, reingest_files
 from data_store.controllers.failed_submission import get_failed_submission
 from data_store.controllers.retrieve_submission_file import retrieve_submission_file
 from data_store.db import db
-from data_store.reference_data import seed_fund_table, seed_geospatial_dim_table, seed_reporting_round_table
+from data_store.reference_data import (
+    clear_reference_data_caches,
+    seed_fund_table,
+    seed_geospatial_dim_table,
+    seed_reporting_round_table,
+)
 from data_store.util import load_example_data
 
 resources = Path(__file__).parent / ".." / "tests" / "resources"
@@ -95,6 +100,7 @@ def reset():
         db.session.commit()
         db.drop_all()
         db.create_all()
+        clear_reference_data_caches()
         seed_geospatial_dim_table()
         seed_fund_table()
         seed_reporting_round_table()
@@ -114,6 +120,7 @@ def drop():
         db.session.commit()
         db.drop_all()
         db.create_all()
+        clear_reference_data_caches()
 
     print("Database dropped.")
 
@@ -165,34 +172,42 @@ def retrieve_failed(failure_uuid):
 @admin_cli.command("reingest-file")
 @click.argument("filepath", required=True, type=click.Path(exists=True, dir_okay=False, file_okay=True))
 @click.argument("submission_id", required=True, type=str)
-def reingest_local_single_file(filepath, submission_id):
+@click.option("--differential", is_flag=True, help="Only write the rows that have changed")
+@click.option("--max-errors", type=click.IntRange(min=1), help="Stop validating after this many errors")
+def reingest_local_single_file(filepath, submission_id, differential, max_errors):
     """Reingest a locally-saved submission file.
 
     :param filepath (str):  Path to a submission file to be re-ingested
     :param submission_id (str):  String of the human readable submission ID (eg. S-PF-R01-1) being reingested
+    :param differential (bool):  Only write the rows that have changed, rather than replacing the submission
+    :param max_errors (int):  Stop validating after this many errors, rather than finding them all
 
     Example usage:
-        flask admin reingest-file <filepath> <submission_id>
+        flask admin reingest-file <filepath> <submission_id> [--differential] [--max-errors 1]
     """
     with current_app.app_context():
         print(f"Reingesting submission {submission_id} from {filepath}.")
-        reingest_file(filepath, submission_id)
+        reingest_file(filepath, submission_id, differential_load=differential, max_validation_errors=max_errors)
 
 
 @admin_cli.command("reingest-s3")
 @click.argument("filepath", required=True, type=click.Path(exists=True, dir_okay=False, file_okay=True))
-def reingest_files_from_s3(filepath):
+@click.option("--differential", is_flag=True, help="Only write the rows that have changed")
+@click.option("--max-errors", type=click.IntRange(min=1), help="Stop validating each submission after this many errors")
+def reingest_files_from_s3(filepath, differential, max_errors):
     """Reingest files from the 'sucessful files' S3.
 
     :param filepath (str):  Path to a file containing line-separated submission IDs to be re-ingested
+    :param differential (bool):  Only write the rows that have changed, rather than replacing each submission
+    :param max_errors (int):  Stop validating each submission after this many errors, rather than finding them all
 
     Example usage:
-        flask admin reingest-s3 <filepath>
+        flask admin reingest-s3 <filepath> [--differential] [--max-errors 1]
     """
 
     with current_app.app_context():
         with click.open_file(filepath) as file:
-            reingest_outputs = reingest_files(file)
+            reingest_outputs = reingest_files(file, differential_load=differential, max_validation_errors=max_errors)
             if False in reingest_outputs["Success"].values:
                 print("Some submissions failed to re-ingest. Please see the output for details.")
             else:
@@ -191,6 +191,13 @@ class OrganisationTypeEnum(StrEnum):
     LOCAL_AUTHORITY = "Local Authority"
 
 
+class DownloadJobStatusEnum(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 # maps a fund id to its full name (we only store ids in the data model)
 FUND_ID_TO_NAME = {
     FundTypeIdEnum.HIGH_STREET_FUND: "High Street Fund",
@@ -14,12 +14,14 @@ from data_store.db import db
 from data_store.db.entities import Submission
 
 
-def reingest_file(filepath, submission_id):
+def reingest_file(filepath, submission_id, differential_load=False, max_validation_errors=None):
     """
     Re-ingests a submission file saved locally eg. in the case of a manual data correction.
 
     :param filepath (str): The path to the file to be re-ingested.
     :param submission_id (int): The ID of the submission.
+    :param differential_load (bool): Only write the rows that have changed, rather than replacing the submission.
+    :param max_validation_errors (int): Stop validating after this many errors, rather than finding them all.
 
     :raises NoResultFound: If no submission is found in the database with the given submission ID.
 
@@ -52,18 +54,24 @@ def reingest_file(filepath, submission_id):
                 submitting_account_id=account_id,
                 submitting_user_email=user_email,
                 auth=None,  # Don't run any auth checks because we're admins
+                differential_load=differential_load,
+                max_validation_errors=max_validation_errors,
             )
             if status_code == 200:
                 print(f"Successfully re-ingested submission {submission.submission_id}")
+                if load_report := response_data.get("load_report"):
+                    print(f"Rows touched: {load_report['rows_touched']} {load_report['tables']}")
             else:
                 print(f"Issues re-ingesting submission {submission.submission_id}: {status_code} {response_data}")
 
 
-def reingest_files(file):
+def reingest_files(file, differential_load=False, max_validation_errors=None):
     """
     Re-ingests one or more files that are stored in the 'sucessful files' S3 bucket.
 
     :param file: A text file containing one or more line-separated submission IDs.
+    :param differential_load: Only write the rows that have changed, rather than replacing each submission.
+    :param max_validation_errors: Stop validating each submission after this many errors, rather than finding them all.
 
     :return pandas.DataFrame: A DataFrame containing the re-ingestion results, including submission ID,
     reporting round, success status, and any errors encountered during re-ingestion.
@@ -122,6 +130,8 @@ def reingest_files(file):
                     submitting_account_id=account_id,
                     submitting_user_email=user_email,
                     auth=None,
+                    differential_load=differential_load,
+                    max_validation_errors=max_validation_errors,
                 )
                 if status_code == 200:
                     print(f"Successfully re-ingested submission {submission.submission_id}")
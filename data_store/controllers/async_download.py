@@ -1,13 +1,34 @@
+import hashlib
+import io
+import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
-from celery import shared_task
+from botocore.exceptions import BotoCoreError, ClientError
+from celery import chord, shared_task
 from flask import current_app
 from notifications_python_client.notifications import NotificationsAPIClient
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.datastructures import FileStorage
 
 from config import Config
-from data_store.aws import upload_file
-from data_store.controllers.download import download
+from data_store.aws import get_s3_client, upload_file
+from data_store.const import DownloadJobStatusEnum
+from data_store.controllers.download import assemble_download_parts, count_download_projects, download_sheet_part
+from data_store.db import db
+from data_store.db.entities import DownloadJob, DownloadJobRequester
+from data_store.db.utils import acquire_advisory_xact_lock
+from data_store.serialisation.data_serialiser import DOWNLOAD_SHEETS
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3.type_defs import ObjectIdentifierTypeDef
+
+# the parts of in-progress downloads are stored under this prefix in the find download files bucket
+DOWNLOAD_PARTS_PREFIX = "download-parts/"
+
+IN_FLIGHT_DOWNLOAD_JOB_STATUSES = (DownloadJobStatusEnum.QUEUED, DownloadJobStatusEnum.RUNNING)
 
 
 def trigger_async_download(body: dict) -> None:
@@ -25,6 +46,9 @@ def trigger_async_download(body: dict) -> None:
     - rp_start: the start of the reporting period
     - rp_end: the end of the reporting period
     - outcome_categories: a list of outcome category to filter the download by
+
+    If an identical download (same file format and filters) is already in flight, the user is added to its requesters
+    and emailed a link to its file when it completes, rather than a new download being started.
     """
     email_address = body["email_address"]
     if body["file_format"] not in ["json", "xlsx"]:
@@ -37,9 +61,7 @@ def trigger_async_download(body: dict) -> None:
     rp_end = body.get("rp_end", None)
     outcome_categories = body.get("outcome_categories", None)
 
-    async_download.delay(
-        email_address=email_address,
-        file_format=file_format,
+    filters = normalise_download_filters(
         funds=funds,
         organisations=organisations,
         regions=regions,
@@ -47,10 +69,236 @@ def trigger_async_download(body: dict) -> None:
         rp_end=rp_end,
         outcome_categories=outcome_categories,
     )
+    download_job, created = request_download(email_address, file_format, filters)
+    if not created:
+        current_app.logger.info(
+            "Joined in-flight download job {download_job_id}",
+            extra=dict(download_job_id=str(download_job.id), requesters=len(download_job.requesters)),
+        )
+        return
 
+    try:
+        async_download.apply_async(
+            kwargs=dict(
+                email_address=email_address, file_format=file_format, download_job_id=str(download_job.id), **filters
+            ),
+            queue=get_download_queue(**filters),
+        )
+    except Exception:
+        # discard any failed transaction, and don't leave a job that will never run for other requests to join
+        db.session.rollback()
+        set_download_job_status(str(download_job.id), DownloadJobStatusEnum.FAILED)
+        raise
 
-@shared_task(ignore_result=False)
+
+def normalise_download_filters(**filters) -> dict:
+    """Normalises download filters so that requests for the same data compare equal.
+
+    Lists are de-duplicated and sorted, and empty values (which don't filter the download) become None.
+
+    :param filters: the download's filters, as passed to `download`
+    :return: the normalised filters
+    """
+    return {name: (sorted(set(value)) if isinstance(value, list) else value) or None for name, value in filters.items()}
+
+
+def download_filters_key(file_format: str, filters: dict) -> str:
+    """Hashes a download's file format and normalised filters, to find identical downloads.
+
+    :param file_format: the format of the file to download
+    :param filters: the download's filters, from `normalise_download_filters`
+    :return: a hex digest identifying the download
+    """
+    payload = json.dumps(dict(file_format=file_format, **filters), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def request_download(email_address: str, file_format: str, filters: dict) -> tuple[DownloadJob, bool]:
+    """Adds the user to the requesters of an identical in-flight download job, or creates a new job if there is none.
+
+    Jobs that haven't been updated for `DOWNLOAD_JOB_TIMEOUT_MINUTES` are assumed to have been lost (eg. the worker was
+    killed) and aren't joined.
+
+    :param email_address: the email address of the user to send the download link to
+    :param file_format: the format of the file to download
+    :param filters: the download's filters, from `normalise_download_filters`
+    :return: the download job, and whether it was created for this request
+    """
+    filters_key = download_filters_key(file_format, filters)
+    # serialises against other requests for, and the completion of, the same download
+    acquire_advisory_xact_lock("download_job", filters_key)
+
+    now = datetime.now()
+    download_job = db.session.scalars(
+        select(DownloadJob)
+        .where(
+            DownloadJob.filters_key == filters_key,
+            DownloadJob.status.in_(IN_FLIGHT_DOWNLOAD_JOB_STATUSES),
+            DownloadJob.updated_at >= now - timedelta(minutes=Config.DOWNLOAD_JOB_TIMEOUT_MINUTES),
+        )
+        .order_by(DownloadJob.created_at.desc())
+        .limit(1)
+    ).first()
+    created = download_job is None
+    if download_job is None:
+        download_job = DownloadJob(
+            filters_key=filters_key, file_format=file_format, filters=filters, created_at=now, updated_at=now
+        )
+        db.session.add(download_job)
+
+    download_job.requesters.append(DownloadJobRequester(email_address=email_address, requested_at=now))
+    db.session.commit()
+    return download_job, created
+
+
+def get_download_job(download_job_id: uuid.UUID | str) -> DownloadJob:
+    """Gets a download job by its ID.
+
+    :param download_job_id: the ID of the download job
+    :return: the download job
+    :raises ValueError: if there is no download job with the ID
+    """
+    download_job = db.session.get(DownloadJob, download_job_id)
+    if download_job is None:
+        raise ValueError(f"Download job {download_job_id} not found")
+    return download_job
+
+
+def set_download_job_status(download_job_id: uuid.UUID | str, status: DownloadJobStatusEnum) -> None:
+    """Updates the status of a download job.
+
+    :param download_job_id: the ID of the download job
+    :param status: the new status
+    """
+    download_job = get_download_job(download_job_id)
+    download_job.status = status
+    download_job.updated_at = datetime.now()
+    db.session.commit()
+
+
+def start_download_job(download_job_id: uuid.UUID | str, sheets_total: int) -> None:
+    """Marks a download job as running and resets its progress.
+
+    :param download_job_id: the ID of the download job
+    :param sheets_total: the number of sheets the download will write
+    """
+    download_job = get_download_job(download_job_id)
+    download_job.status = DownloadJobStatusEnum.RUNNING
+    download_job.sheets_total = sheets_total
+    download_job.sheets_done = download_job.rows_written = download_job.bytes_uploaded = 0
+    download_job.updated_at = datetime.now()
+    db.session.commit()
+
+
+def record_download_sheet_progress(download_job_id: uuid.UUID | str, rows: int) -> None:
+    """Adds a written sheet to a download job's progress.
+
+    Sheets are written by parallel tasks, so the counts are incremented in the database rather than read and written.
+
+    :param download_job_id: the ID of the download job
+    :param rows: the number of rows in the sheet
+    """
+    db.session.execute(
+        update(DownloadJob)
+        .where(DownloadJob.id == download_job_id)
+        .values(
+            sheets_done=DownloadJob.sheets_done + 1,
+            rows_written=DownloadJob.rows_written + rows,
+            updated_at=datetime.now(),
+        )
+    )
+    db.session.commit()
+
+
+def complete_download_job(download_job_id: uuid.UUID | str, file_name: str, bytes_uploaded: int) -> list[str]:
+    """Marks a download job as completed, so that later identical requests start a new job.
+
+    :param download_job_id: the ID of the download job
+    :param file_name: the name of the downloaded file in S3
+    :param bytes_uploaded: the size of the downloaded file
+    :return: the email addresses of the job's requesters, without duplicates
+    """
+    download_job = get_download_job(download_job_id)
+    # requesters can't join once the lock is held, so none of them miss the email
+    acquire_advisory_xact_lock("download_job", download_job.filters_key)
+    db.session.refresh(download_job)
+    download_job.status = DownloadJobStatusEnum.COMPLETED
+    download_job.file_name = file_name
+    download_job.bytes_uploaded = bytes_uploaded
+    download_job.updated_at = datetime.now()
+    email_addresses = list(dict.fromkeys(requester.email_address for requester in download_job.requesters))
+    db.session.commit()
+    return email_addresses
+
+
+def get_user_download_jobs(email_address: str, limit: int) -> list[DownloadJob]:
+    """Gets the download jobs a user has requested, most recent first.
+
+    :param email_address: the user's email address
+    :param limit: the maximum number of jobs to return
+    :return: the user's most recent download jobs
+    """
+    requested = select(DownloadJobRequester.download_job_id).where(DownloadJobRequester.email_address == email_address)
+    return list(
+        db.session.scalars(
+            select(DownloadJob)
+            .where(DownloadJob.id.in_(requested))
+            .order_by(DownloadJob.created_at.desc())
+            .limit(limit)
+        )
+    )
+
+
+def get_user_download_job(download_job_id: uuid.UUID | str, email_address: str) -> DownloadJob | None:
+    """Gets a download job, if the user is one of its requesters.
+
+    :param download_job_id: the ID of the download job
+    :param email_address: the user's email address
+    :return: the download job, or None if it doesn't exist or the user didn't request it
+    """
+    return db.session.scalars(
+        select(DownloadJob)
+        .join(DownloadJob.requesters)
+        .where(DownloadJob.id == download_job_id, DownloadJobRequester.email_address == email_address)
+        .limit(1)
+    ).first()
+
+
+def serialise_download_job(download_job: DownloadJob) -> dict:
+    """Serialises the state and progress of a download job.
+
+    :param download_job: the download job
+    :return: the job's state and progress
+    """
+    return {
+        "id": str(download_job.id),
+        "status": download_job.status,
+        "file_format": download_job.file_format,
+        "filters": download_job.filters,
+        "created_at": download_job.created_at.isoformat(),
+        "updated_at": download_job.updated_at.isoformat(),
+        "sheets_total": download_job.sheets_total,
+        "sheets_done": download_job.sheets_done,
+        "rows_written": download_job.rows_written,
+        "bytes_uploaded": download_job.bytes_uploaded,
+        "file_name": download_job.file_name,
+    }
+
+
+def get_download_queue(**filters) -> str:
+    """Picks the Celery queue for a download, so that large downloads don't hold up small ones behind them.
+
+    :param filters: the download's filters, as passed to `download`
+    :return: the name of the queue
+    """
+    if count_download_projects(**filters) > Config.LARGE_DOWNLOAD_PROJECT_THRESHOLD:
+        return Config.LARGE_DOWNLOAD_QUEUE
+    return Config.SMALL_DOWNLOAD_QUEUE
+
+
+@shared_task(bind=True, ignore_result=False)
 def async_download(
+    self,
     email_address: str,
     file_format: str,
     funds: list[str] | None = None,
@@ -59,9 +307,14 @@ def async_download(
     rp_start: str | None = None,
     rp_end: str | None = None,
     outcome_categories: list[str] | None = None,
+    download_job_id: str | None = None,
 ):
     """Download data, store file in S3 and send an email to the user with the download link.
 
+    Each sheet is queried and serialised by a separate `download_sheet` task, so that large downloads are spread across
+    workers and a failed sheet can be retried on its own. The parts are written to S3 under a temporary prefix and,
+    once they are all done, the `assemble_download` chord callback combines them, uploads the file and sends the email.
+
     parameters:
     - email_address: the email address of the user to send the download link to
     - file_format: the format of the file to download
@@ -71,10 +324,12 @@ def async_download(
     - rp_start: the start of the reporting period
     - rp_end: the end of the reporting period
     - outcome_categories: a list of outcome category to filter the download by
+    - download_job_id: the download job this task computes, whose requesters are all emailed the download link
     """
+    if file_format not in ["json", "xlsx"]:
+        raise ValueError(f"Bad file_format: {file_format}.")
 
-    file_obj = download(
-        file_format=file_format,
+    filters = dict(
         funds=funds,
         organisations=organisations,
         regions=regions,
@@ -82,7 +337,135 @@ def async_download(
         rp_end=rp_end,
         outcome_categories=outcome_categories,
     )
+    parts_prefix = f"{DOWNLOAD_PARTS_PREFIX}{download_job_id or uuid.uuid4()}/"
+    # keep the sheets on the queue this download was routed to, see `get_download_queue`
+    queue = (self.request.delivery_info or {}).get("routing_key")
+
+    if download_job_id is not None:
+        start_download_job(download_job_id, sheets_total=len(DOWNLOAD_SHEETS))
+    try:
+        chord(
+            [
+                download_sheet.s(file_format, sheet, parts_prefix, download_job_id, **filters)
+                for sheet in DOWNLOAD_SHEETS
+            ],
+            assemble_download.s(email_address, file_format, parts_prefix, download_job_id).on_error(
+                download_failed.s(parts_prefix=parts_prefix, download_job_id=download_job_id)
+            ),
+        ).apply_async(queue=queue)
+    except Exception:
+        # tasks run eagerly raise here, as does failing to enqueue the chord
+        _clean_up_failed_download(parts_prefix, download_job_id)
+        raise
+
+
+@shared_task(
+    ignore_result=False,
+    autoretry_for=(SQLAlchemyError, BotoCoreError, ClientError),
+    max_retries=Config.DOWNLOAD_SHEET_MAX_RETRIES,
+    retry_backoff=True,
+)
+def download_sheet(
+    file_format: str, sheet: str, parts_prefix: str, download_job_id: str | None = None, **filters
+) -> dict:
+    """Query and serialise one sheet of a download, and store it in S3 to be assembled by `assemble_download`.
+
+    Transient database and S3 errors are retried, without redoing the download's other sheets.
+
+    :param file_format: the format of the file to download
+    :param sheet: the name of the sheet
+    :param parts_prefix: the S3 prefix under which the download's parts are stored
+    :param download_job_id: the download job to report the sheet's progress to
+    :param filters: the download's filters, as passed to `download`
+    :return: the sheet name, the S3 key of its part and its number of rows
+    """
+    part, rows = download_sheet_part(file_format, sheet, **filters)
+    key = f"{parts_prefix}{sheet}"
+    get_s3_client().put_object(Bucket=Config.AWS_S3_BUCKET_FIND_DOWNLOAD_FILES, Key=key, Body=part)
+    if download_job_id is not None:
+        record_download_sheet_progress(download_job_id, rows)
+    return dict(sheet=sheet, key=key, rows=rows)
+
+
+@shared_task(ignore_result=False)
+def assemble_download(
+    parts: list[dict],
+    email_address: str,
+    file_format: str,
+    parts_prefix: str,
+    download_job_id: str | None = None,
+) -> None:
+    """Combine the parts stored by `download_sheet` into the download file, store it in S3 and email the download link.
+
+    :param parts: the results of the download's `download_sheet` tasks, in sheet order
+    :param email_address: the email address to send the download link to, if there is no download job
+    :param file_format: the format of the file to download
+    :param parts_prefix: the S3 prefix under which the download's parts are stored
+    :param download_job_id: the download job being computed, whose requesters are emailed instead
+    """
+    bucket = Config.AWS_S3_BUCKET_FIND_DOWNLOAD_FILES
+    # if this raises, the `download_failed` error callback cleans up
+    file_obj = assemble_download_parts(
+        file_format,
+        # parts are fetched one at a time as they are assembled, rather than all being held in memory
+        ((part["sheet"], get_s3_client().get_object(Bucket=bucket, Key=part["key"])["Body"].read()) for part in parts),
+    )
+    uploaded = _upload_and_email(file_obj, email_address, file_format, download_job_id)
+
+    delete_download_parts(parts_prefix)
+    if not uploaded and download_job_id is not None:
+        set_download_job_status(download_job_id, DownloadJobStatusEnum.FAILED)
+
+
+@shared_task
+def download_failed(request, exc, traceback, parts_prefix: str, download_job_id: str | None = None) -> None:
+    """Chord error callback that cleans up after a download whose sheets could not all be produced.
+
+    :param request: the request of the task that failed
+    :param exc: the exception it raised
+    :param traceback: the exception's traceback
+    :param parts_prefix: the S3 prefix under which the download's parts are stored
+    :param download_job_id: the download job that failed
+    """
+    current_app.logger.error(
+        "Download failed: {error}",
+        extra=dict(error=str(exc), failed_task_id=request.id, download_job_id=download_job_id),
+    )
+    _clean_up_failed_download(parts_prefix, download_job_id)
+
+
+def _clean_up_failed_download(parts_prefix: str, download_job_id: str | None) -> None:
+    if download_job_id is not None:
+        # the failure may have left the session's transaction unusable
+        db.session.rollback()
+        set_download_job_status(download_job_id, DownloadJobStatusEnum.FAILED)
+    delete_download_parts(parts_prefix)
 
+
+def delete_download_parts(parts_prefix: str) -> None:
+    """Delete the parts of a download from S3.
+
+    :param parts_prefix: the S3 prefix under which the download's parts are stored
+    """
+    s3_client = get_s3_client()
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=Config.AWS_S3_BUCKET_FIND_DOWNLOAD_FILES, Prefix=parts_prefix):
+        objects: list["ObjectIdentifierTypeDef"] = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+        if objects:
+            s3_client.delete_objects(Bucket=Config.AWS_S3_BUCKET_FIND_DOWNLOAD_FILES, Delete={"Objects": objects})
+
+
+def _upload_and_email(
+    file_obj: FileStorage, email_address: str, file_format: str, download_job_id: str | None = None
+) -> bool:
+    """Stores a download file in S3 and emails the download link to the requesters.
+
+    :param file_obj: the download file
+    :param email_address: the email address to send the download link to, if there is no download job
+    :param file_format: the format of the file to download
+    :param download_job_id: the download job being computed, whose requesters are emailed instead
+    :return: whether the file was uploaded
+    """
     # Upload the file to S3 and get presigned URL
     bucket = Config.AWS_S3_BUCKET_FIND_DOWNLOAD_FILES
     current_datetime = datetime.now().strftime("%Y-%m-%d-%H:%M:%S")
@@ -95,6 +478,8 @@ def async_download(
     if not find_service_base_url:
         raise ValueError("FIND_SERVICE_BASE_URL is not set.")
 
+    # the stream is closed once it has been uploaded
+    file_size = file_obj.stream.seek(0, io.SEEK_END)
     try:
         upload_file(file=file_obj, bucket=bucket, object_name=file_name)
     except KeyError as e:
@@ -102,13 +487,20 @@ def async_download(
             "Failed to upload file to S3: {error}",
             extra={"error": str(e)},
         )
-        return
+        return False
 
-    send_email_for_find_download(
-        email_address=email_address,
-        download_url=download_url,
-        find_service_url=find_service_download_url,
+    email_addresses = (
+        complete_download_job(download_job_id, file_name, bytes_uploaded=file_size)
+        if download_job_id is not None
+        else [email_address]
     )
+    for requester_email_address in email_addresses:
+        send_email_for_find_download(
+            email_address=requester_email_address,
+            download_url=download_url,
+            find_service_url=find_service_download_url,
+        )
+    return True
 
 
 def send_email_for_find_download(email_address: str, download_url: str, find_service_url: str):
@@ -0,0 +1,353 @@
+"""Differential loading of re-ingested submissions.
+
+When a submission is re-ingested, the default behaviour is to delete the existing submission and all of its children
+and insert every row again. Most re-ingests only correct a handful of cells, so this module instead compares the
+transformed data against the rows currently stored for the submission and applies only the inserts, updates and
+deletes needed to make them match. Rows are matched on a natural key per table, so unchanged rows (and the UUIDs
+other rows reference) are retained.
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as sqla
+from flask import current_app
+from sqlalchemy import delete, or_, select
+
+from data_store.controllers.load_functions import get_project_geospatial_associations
+from data_store.controllers.mappings import DataMapping
+from data_store.db import db
+from data_store.db.entities import ProgrammeJunction, Project, Submission, project_geospatial_association
+from data_store.db.types import GUID
+
+# The columns (or `data_blob.<key>` entries) that identify a row within a submission. Rows with the same natural key
+# are updated in place, so any value not in the key can change without the row being deleted and re-inserted.
+NATURAL_KEYS: dict[str, tuple[str, ...]] = {
+    "Programme Progress": ("data_blob.question",),
+    "Place Details": ("data_blob.question", "data_blob.indicator"),
+    "Funding Questions": ("data_blob.question", "data_blob.indicator"),
+    "Project Details": ("project_id",),
+    "Project Progress": ("project_id",),
+    "Funding": (
+        "project_id",
+        "programme_junction_id",
+        "start_date",
+        "end_date",
+        "data_blob.funding_source",
+        "data_blob.funding_category",
+        "data_blob.spend_type",
+        "data_blob.secured",
+        "data_blob.state",
+    ),
+    "Funding Comments": ("project_id",),
+    "Private Investments": ("project_id",),
+    "Output_Data": (
+        "project_id",
+        "programme_junction_id",
+        "output_id",
+        "start_date",
+        "end_date",
+        "data_blob.unit_of_measurement",
+        "data_blob.state",
+    ),
+    "Outcome_Data": (
+        "project_id",
+        "programme_junction_id",
+        "outcome_id",
+        "start_date",
+        "end_date",
+        "data_blob.unit_of_measurement",
+        "data_blob.geography_indicator",
+        "data_blob.state",
+        "data_blob.higher_frequency",
+    ),
+    "RiskRegister": ("project_id", "programme_junction_id", "data_blob.risk_name"),
+    "ProjectFinanceChange": ("data_blob.change_number",),
+    "Programme Management": ("start_date", "end_date", "data_blob.payment_type", "data_blob.state"),
+}
+
+SUBMISSION_COLUMNS = ("submission_date", "reporting_round_id", "data_blob")
+
+
+@dataclass
+class TableChanges:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def rows_touched(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+@dataclass
+class DifferentialLoadReport:
+    """The number of rows inserted, updated and deleted in each table by a differential load."""
+
+    submission_id: str
+    tables: dict[str, TableChanges] = field(default_factory=dict)
+
+    @property
+    def rows_touched(self) -> int:
+        return sum(changes.rows_touched for changes in self.tables.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "submission_id": self.submission_id,
+            "rows_touched": self.rows_touched,
+            "tables": {
+                table: {"inserted": changes.inserted, "updated": changes.updated, "deleted": changes.deleted}
+                for table, changes in self.tables.items()
+            },
+        }
+
+
+def load_submission_differences(
+    transformed_data: dict[str, pd.DataFrame],
+    mappings: tuple[DataMapping, ...],
+    load_mapping: dict[str, Callable],
+    existing_submission: GUID,
+    submission_id: str,
+    reporting_round_id: GUID,
+    **kwargs,
+) -> DifferentialLoadReport:
+    """Loads a re-ingested submission by applying only the changes between it and the stored submission.
+
+    Reference data (organisations, programmes, output and outcome names) is loaded by the usual load functions, as
+    these are already upserts. The submission row and programme junction are kept, and every other table is compared
+    row by row on its natural key. Data is written to the session via this method, but not committed.
+
+    :param transformed_data: a dictionary of DataFrames of table data to be loaded into the db.
+    :param mappings: the DataMappings, in the order they are loaded into the db.
+    :param load_mapping: dictionary of tables and functions to load the tables into the DB.
+    :param existing_submission: the UUID of the submission being re-ingested.
+    :param submission_id: the human-readable ID of the submission being re-ingested.
+    :param reporting_round_id: the ID of the reporting round associated with the data.
+    :param kwargs: additional key word args passed through to the reference data load functions.
+    :return: a report of the rows touched in each table.
+    :raises ValueError: if the submission being re-ingested does not exist.
+    """
+    report = DifferentialLoadReport(submission_id=submission_id)
+    submission = db.session.get(Submission, existing_submission)
+    if submission is None:
+        raise ValueError("Submission not found")
+    programme_junction = db.session.scalars(
+        select(ProgrammeJunction).where(ProgrammeJunction.submission_id == existing_submission)
+    ).one()
+
+    for mapping in mappings:
+        load_function = load_mapping.get(mapping.table)
+        if not load_function:
+            continue
+
+        if mapping.table == "Submission_Ref":
+            worksheet = transformed_data[mapping.table]
+            worksheet["Submission ID"] = submission_id
+            worksheet["Reporting Round ID"] = reporting_round_id
+            report.tables[mapping.table] = update_submission(submission, mapping.map_data_to_models(worksheet)[0])
+        elif mapping.table == "Programme Junction":
+            # the junction is retained, but mapping it sets the submission used to look up project FKs
+            programme_id = transformed_data["Programme_Ref"]["Programme ID"].iloc[0]
+            mapping.map_data_to_models(
+                pd.DataFrame(
+                    {
+                        "Submission ID": [submission_id],
+                        "Programme ID": [programme_id],
+                        "Reporting Round ID": [reporting_round_id],
+                    }
+                )
+            )
+        elif mapping.table in NATURAL_KEYS:
+            worksheet = transformed_data[mapping.table]
+            if "Submission ID" in mapping.column_mapping:
+                worksheet["Submission ID"] = submission_id
+            existing_rows = get_existing_rows(mapping, programme_junction.id)
+            incoming_rows = mapping.map_data_to_models(worksheet)
+            report.tables[mapping.table] = apply_table_differences(mapping, existing_rows, incoming_rows)
+        else:
+            load_function(
+                transformed_data,
+                mapping,
+                submission_id=submission_id,
+                reporting_round_id=reporting_round_id,
+                **kwargs,
+            )
+
+    current_app.logger.info(
+        "Differentially loaded {submission_id}: {rows_touched} rows touched",
+        extra=dict(submission_id=submission_id, rows_touched=report.rows_touched, load_report=report.to_dict()),
+    )
+    return report
+
+
+def update_submission(submission: Submission, incoming: Submission) -> TableChanges:
+    """Updates the stored submission with the values of the re-ingested submission, if they have changed.
+
+    :param submission: the stored submission.
+    :param incoming: the submission mapped from the re-ingested data.
+    :return: the changes made to the submission table.
+    """
+    changed = _set_changed_values(submission, incoming, SUBMISSION_COLUMNS)
+    return TableChanges(updated=int(changed))
+
+
+def get_existing_rows(mapping: DataMapping, programme_junction_id: GUID) -> list[db.Model]:
+    """Selects the rows of a table that belong to a submission, via its programme junction or its projects.
+
+    :param mapping: the mapping of the table.
+    :param programme_junction_id: the ID of the submission's programme junction.
+    :return: the stored rows.
+    """
+    model = mapping.model
+    conditions = []
+    if hasattr(model, "programme_junction_id"):
+        conditions.append(model.programme_junction_id == programme_junction_id)
+    if model is not Project and hasattr(model, "project_id"):
+        submission_projects = select(Project.id).where(Project.programme_junction_id == programme_junction_id)
+        conditions.append(model.project_id.in_(submission_projects))
+    return list(db.session.scalars(select(model).where(or_(*conditions))))
+
+
+def apply_table_differences(
+    mapping: DataMapping, existing_rows: list[db.Model], incoming_rows: list[db.Model]
+) -> TableChanges:
+    """Applies the minimal set of inserts, updates and deletes to make the stored rows match the incoming rows.
+
+    Rows are grouped by natural key. Within a group, incoming rows identical to a stored row are left alone, remaining
+    rows are paired up and updated in place, and any left over are inserted or deleted. Natural keys that are not
+    unique therefore still produce a correct, if less minimal, result.
+
+    :param mapping: the mapping of the table.
+    :param existing_rows: the rows currently stored for the submission.
+    :param incoming_rows: the rows mapped from the re-ingested data.
+    :return: the changes made to the table.
+    """
+    columns = [column.key for column in mapping.model.__table__.columns if column.key != "id"]
+    key_fields = NATURAL_KEYS[mapping.table]
+
+    existing_by_key = defaultdict(list)
+    for row in existing_rows:
+        existing_by_key[_natural_key(row, key_fields)].append(row)
+
+    to_insert: list[db.Model] = []
+    to_update: list[tuple[db.Model, db.Model]] = []
+    to_delete: list[db.Model] = []
+    incoming_by_key = defaultdict(list)
+    for row in incoming_rows:
+        incoming_by_key[_natural_key(row, key_fields)].append(row)
+
+    for key in existing_by_key.keys() | incoming_by_key.keys():
+        unmatched_existing = {id(row): row for row in existing_by_key.get(key, [])}
+        existing_values = {id(row): _row_values(row, columns) for row in unmatched_existing.values()}
+        unmatched_incoming = []
+        for incoming in incoming_by_key.get(key, []):
+            incoming_values = _row_values(incoming, columns)
+            match = next((i for i in unmatched_existing if existing_values[i] == incoming_values), None)
+            if match is None:
+                unmatched_incoming.append(incoming)
+            else:
+                del unmatched_existing[match]
+
+        remaining_existing = list(unmatched_existing.values())
+        to_update.extend(zip(remaining_existing, unmatched_incoming, strict=False))
+        to_delete.extend(remaining_existing[len(unmatched_incoming) :])
+        to_insert.extend(unmatched_incoming[len(remaining_existing) :])
+
+    if to_delete:
+        # children of deleted projects are removed by the database's ON DELETE CASCADE
+        db.session.execute(delete(mapping.model).where(mapping.model.id.in_([row.id for row in to_delete])))
+
+    relocated_projects = [
+        existing
+        for existing, incoming in to_update
+        if mapping.model is Project and _normalise(existing.postcodes) != _normalise(incoming.postcodes)
+    ]
+    for existing, incoming in to_update:
+        _set_changed_values(existing, incoming, columns)
+
+    db.session.add_all(to_insert)
+
+    if mapping.model is Project:
+        _replace_project_geospatial_associations(relocated_projects, to_insert)
+
+    return TableChanges(inserted=len(to_insert), updated=len(to_update), deleted=len(to_delete))
+
+
+def _replace_project_geospatial_associations(updated_projects: list[Project], inserted_projects: list[Project]):
+    """Rebuilds the geospatial associations of updated and inserted projects.
+
+    :param updated_projects: stored projects whose postcodes have changed.
+    :param inserted_projects: new projects.
+    """
+    projects = updated_projects + inserted_projects
+    if not projects:
+        return
+
+    associations = get_project_geospatial_associations(projects)
+    if updated_projects:
+        db.session.execute(
+            delete(project_geospatial_association).where(
+                project_geospatial_association.c.project_id.in_([project.id for project in updated_projects])
+            )
+        )
+    if associations:
+        # the projects must exist before they can be referenced by the association table
+        db.session.flush()
+        db.session.execute(project_geospatial_association.insert(), associations)
+
+
+def _set_changed_values(existing: db.Model, incoming: db.Model, columns) -> bool:
+    """Copies any values that differ from the incoming row to the stored row.
+
+    :return: True if any value was changed.
+    """
+    changed = False
+    for column in columns:
+        if _column_value(existing, column) != _column_value(incoming, column):
+            setattr(existing, column, getattr(incoming, column))
+            changed = True
+    return changed
+
+
+def _natural_key(row: db.Model, key_fields: tuple[str, ...]) -> tuple:
+    key = []
+    for key_field in key_fields:
+        if key_field.startswith("data_blob."):
+            key.append(_normalise((row.data_blob or {}).get(key_field.removeprefix("data_blob."))))
+        else:
+            key.append(_column_value(row, key_field))
+    return tuple(key)
+
+
+def _row_values(row: db.Model, columns: list[str]) -> tuple:
+    return tuple(_column_value(row, column) for column in columns)
+
+
+def _column_value(row: db.Model, column: str) -> Hashable:
+    """Returns the value of a column as it would be read back from the database, in a comparable form."""
+    value = getattr(row, column)
+    if isinstance(value, str) and isinstance(row.__table__.c[column].type, (sqla.Date, sqla.DateTime)):
+        value = pd.Timestamp(value)
+    return _normalise(value)
+
+
+def _normalise(value: Any) -> Hashable:
+    """Converts a value read from the database or mapped from a DataFrame to a comparable, hashable value."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalise(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalise(item) for item in value)
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
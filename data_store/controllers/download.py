@@ -5,13 +5,16 @@ and Excel. It retrieves data from the database and returns the data in the reque
 
 import io
 import json
-from datetime import datetime
-from typing import Generator
+from datetime import date, datetime
+from typing import Generator, Iterable
 
 import pandas as pd
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Query
 from werkzeug.datastructures import FileStorage
 
 from data_store.const import DATETIME_ISO_8601, EXCEL_MIMETYPE, TABLE_SORT_ORDERS
+from data_store.db.entities import Project
 from data_store.db.queries import download_data_base_query
 from data_store.serialisation.data_serialiser import serialise_download_data
 from data_store.util import custom_serialiser
@@ -41,11 +44,119 @@ def download(
     :param outcome_categories: filter by outcome category
     :return: FileStorage object containing the file in the requested format.
     """
+    query = get_download_query(funds, organisations, regions, rp_start, rp_end, outcome_categories)
+
+    data_generator = serialise_download_data(query, outcome_categories)
+
+    match file_format:
+        case "json":
+            serialised_data = {sheet: data for sheet, data in data_generator}
+            file_content: bytes = json.dumps(serialised_data, default=custom_serialiser).encode()
+        case "xlsx":
+            file_content = data_to_excel(data_generator)
+        case _:
+            raise ValueError(f"Bad file_format: {file_format}.")
+
+    return to_file_storage(file_content, file_format)
+
+
+def download_sheet_part(
+    file_format: str,
+    sheet: str,
+    funds: list[str] | None = None,
+    organisations: list[str] | None = None,
+    regions: list[str] | None = None,
+    rp_start: str | None = None,
+    rp_end: str | None = None,
+    outcome_categories: list[str] | None = None,
+) -> tuple[bytes, int]:
+    """Query the database for a single sheet of a download and serialise it, so that the sheets of a large download
+    can be produced in parallel and then combined with `assemble_download_parts`.
+
+    JSON parts are the sheet's fragment of the JSON file. XLSX parts are the sheet's rows, as JSON with dates and
+    datetimes tagged so that they are written to the spreadsheet as they would be by `download`.
+
+    :param file_format: file format of the download the part is for
+    :param sheet: the name of the sheet, from DOWNLOAD_SHEETS
+    :return: the serialised part and the number of rows in the sheet
+    """
+    query = get_download_query(funds, organisations, regions, rp_start, rp_end, outcome_categories)
+    [(_, sheet_data)] = serialise_download_data(query, outcome_categories, sheets_required=[sheet])
+
+    match file_format:
+        case "json":
+            part = json.dumps(sheet_data, default=custom_serialiser).encode()
+        case "xlsx":
+            part = json.dumps(sheet_data, default=_tag_date).encode()
+        case _:
+            raise ValueError(f"Bad file_format: {file_format}.")
+
+    return part, len(sheet_data)
+
+
+def assemble_download_parts(file_format: str, parts: Iterable[tuple[str, bytes]]) -> FileStorage:
+    """Combine the parts produced by `download_sheet_part` into the same file as `download` would produce.
+
+    :param file_format: file format of serialised data
+    :param parts: the name and part of each sheet, in the order they should appear in the file
+    :return: FileStorage object containing the file in the requested format.
+    """
+    match file_format:
+        case "json":
+            # each part is already serialised, so join them into an object rather than parsing and re-serialising
+            file_content = b"{" + b", ".join(json.dumps(sheet).encode() + b": " + part for sheet, part in parts) + b"}"
+        case "xlsx":
+            file_content = data_to_excel((sheet, json.loads(part, object_hook=_untag_date)) for sheet, part in parts)
+        case _:
+            raise ValueError(f"Bad file_format: {file_format}.")
+
+    return to_file_storage(file_content, file_format)
+
+
+def _tag_date(obj: date) -> dict:
+    if isinstance(obj, datetime):
+        return {"__datetime__": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__date__": obj.isoformat()}
+    raise TypeError(f"Cannot serialise object of type {type(obj)}")
+
+
+def _untag_date(obj: dict) -> dict | date:
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def to_file_storage(file_content: bytes, file_format: str) -> FileStorage:
+    content_type = EXCEL_MIMETYPE if file_format == "xlsx" else "application/json"
+    return FileStorage(io.BytesIO(file_content), content_type=content_type, filename=f"download.{file_format}")
+
+
+def get_download_query(
+    funds: list[str] | None = None,
+    organisations: list[str] | None = None,
+    regions: list[str] | None = None,
+    rp_start: str | None = None,
+    rp_end: str | None = None,
+    outcome_categories: list[str] | None = None,
+) -> Query:
+    """Builds the base query for a download from its filters, as passed to `download`.
+
+    :param funds: filter by fund ids
+    :param organisations: filter by organisation (UUID)
+    :param regions: filter by region (ITL codes)
+    :param rp_start: filter by reporting period start (ISO8601 format)
+    :param rp_end: filter by reporting period end (ISO8601 format)
+    :param outcome_categories: filter by outcome category
+    :return: the filtered base query
+    """
     rp_start_datetime = datetime.strptime(rp_start, DATETIME_ISO_8601) if rp_start else None
     rp_end_datetime = datetime.strptime(rp_end, DATETIME_ISO_8601) if rp_end else None
     rp_end_datetime = rp_end_datetime.replace(hour=23, minute=59, second=59) if rp_end_datetime else None
 
-    query = download_data_base_query(
+    return download_data_base_query(
         rp_start_datetime,
         rp_end_datetime,
         organisations,
@@ -54,22 +165,21 @@ def download(
         outcome_categories,
     )
 
-    data_generator = serialise_download_data(query, outcome_categories)
 
-    match file_format:
-        case "json":
-            serialised_data = {sheet: data for sheet, data in data_generator}
-            file_content: bytes = json.dumps(serialised_data, default=custom_serialiser).encode()
-            content_type = "application/json"
-            file_extension = "json"
-        case "xlsx":
-            file_content = data_to_excel(data_generator)
-            content_type = EXCEL_MIMETYPE
-            file_extension = "xlsx"
-        case _:
-            raise ValueError(f"Bad file_format: {file_format}.")
+def count_download_projects(
+    funds: list[str] | None = None,
+    organisations: list[str] | None = None,
+    regions: list[str] | None = None,
+    rp_start: str | None = None,
+    rp_end: str | None = None,
+    outcome_categories: list[str] | None = None,
+) -> int:
+    """Counts the project returns a download would include, as a cheap estimate of how large the download will be.
 
-    return FileStorage(io.BytesIO(file_content), content_type=content_type, filename=f"download.{file_extension}")
+    :return: the number of distinct project returns matching the filters
+    """
+    query = get_download_query(funds, organisations, regions, rp_start, rp_end, outcome_categories)
+    return query.with_entities(func.count(distinct(Project.id))).scalar()
 
 
 def data_to_excel(data_generator: Generator[tuple[str, list[dict]], None, None]) -> bytes:
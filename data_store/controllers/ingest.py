@@ -17,6 +17,7 @@ import data_store.table_extraction as ta
 from config import Config
 from data_store.aws import upload_file
 from data_store.const import DATETIME_ISO_8601, EXCEL_MIMETYPE, FAILED_FILE_S3_NAME_FORMAT
+from data_store.controllers.differential_load import DifferentialLoadReport, load_submission_differences
 from data_store.controllers.ingest_dependencies import (
     IngestDependencies,
     PFIngestDependencies,
@@ -37,13 +38,20 @@ from data_store.db.queries import (
     get_programme_by_id_and_round,
     get_reporting_round_id,
 )
-from data_store.db.utils import transaction_retry_wrapper
+from data_store.db.utils import acquire_advisory_xact_lock, transaction_retry_wrapper
 from data_store.exceptions import InitialValidationError, OldValidationError, ValidationError
 from data_store.messaging import Message, MessengerBase
 from data_store.messaging.messaging import failures_to_messages, group_validation_messages
-from data_store.metrics import capture_ingest_metrics
+from data_store.metrics import capture_ingest_metrics, ingest_stage
 from data_store.table_extraction.config.common import TableConfig
+from data_store.table_extraction.template_cache import (
+    control_tables_cache,
+    is_control_table,
+    template_fingerprint,
+    template_layouts_cache,
+)
 from data_store.validation import tf_validate
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.initial_validation.initial_validate import initial_validate
 from data_store.validation.pathfinders.schema_validation.exceptions import TableValidationErrors
 from data_store.validation.pathfinders.schema_validation.validate import TableValidator
@@ -77,6 +85,8 @@ def ingest(  # noqa: C901
     submitting_account_id: str | None = None,
     submitting_user_email: str | None = None,
     auth: dict[str, tuple[str, ...]] | None = None,
+    differential_load: bool = False,
+    max_validation_errors: int | None = None,
 ) -> tuple[dict, int]:  # noqa: C901
     """Ingests a spreadsheet submission and stores its contents in a database.
 
@@ -88,8 +98,17 @@ def ingest(  # noqa: C901
     validation messages that identify where in the spreadsheet is causing the validation failure.
     Otherwise, the data is cleaned and ingested into a database.
 
+    If `differential_load` is set and the submission has been ingested before, only the rows that have changed are
+    written to the database, rather than the existing submission being deleted and every row inserted again.
+
+    If `max_validation_errors` is set, validation stops once it has found that many errors, skipping the remaining
+    checks and stages, and only those errors are returned. Use 1 to stop at the first error when all that matters is
+    whether the submission is valid.
+
     :body: a dictionary of request body params
     :excel_file: the spreadsheet to ingest, from the request body
+    :differential_load: apply only the changes to an existing submission
+    :max_validation_errors: the number of validation errors to find before stopping, by default all are found
     :return: A JSON Response
     :raises ValidationError: raised if the data fails validation
     """
@@ -103,7 +122,9 @@ def ingest(  # noqa: C901
         raise RuntimeError(f"Ingest is not supported for {fund_name} round {reporting_round}")
 
     try:
-        workbook_data = extract_data(excel_file)
+        with ingest_stage("extract_data") as stage:
+            workbook_data = extract_data(excel_file)
+            stage.rows = count_rows(workbook_data)
     except ValueError as e:
         # FIXME: FPASF-249; remove this - temporary to remain compatible with existing error responses from connexion.
         return {
@@ -129,31 +150,46 @@ def ingest(  # noqa: C901
         ):
             ingest_dependencies = alter_validations_for_local_authorities(ingest_dependencies)
 
+    budget = ValidationBudget(max_validation_errors)
     try:
-        initial_validate(workbook_data, ingest_dependencies.initial_validation_schema, auth)
+        with ingest_stage("initial_validate"):
+            initial_validate(workbook_data, ingest_dependencies.initial_validation_schema, auth, budget)
         if fund_name == "Towns Fund":
             if not isinstance(ingest_dependencies, TFIngestDependencies):
                 raise ValueError("Ingest dependencies should be of type TFIngestDependencies")
-            transformed_data = ingest_dependencies.transform(workbook_data, reporting_round)
-            tf_validate(
-                transformed_data,
-                workbook_data,
-                ingest_dependencies.validation_schema,
-                ingest_dependencies.fund_specific_validation,
-                reporting_round,
-            )
+            with ingest_stage("transform") as stage:
+                transformed_data = ingest_dependencies.transform(workbook_data, reporting_round)
+                stage.rows = count_rows(transformed_data)
+            with ingest_stage("tf_validate") as stage:
+                stage.rows = count_rows(transformed_data)
+                tf_validate(
+                    transformed_data,
+                    workbook_data,
+                    ingest_dependencies.validation_schema,
+                    ingest_dependencies.fund_specific_validation,
+                    reporting_round,
+                    budget,
+                )
         else:
             if not isinstance(ingest_dependencies, PFIngestDependencies):
                 raise ValueError("Ingest dependencies should be of type PFIngestDependencies")
-            tables, p_error_messages = extract_process_validate_tables(
-                workbook_data, ingest_dependencies.extract_process_validate_schema
-            )
-            ct_error_messages = ingest_dependencies.cross_table_validate(tables)
+            with ingest_stage("extract_process_validate_tables") as stage:
+                tables, p_error_messages = extract_process_validate_tables(
+                    workbook_data, ingest_dependencies.extract_process_validate_schema, budget
+                )
+                stage.rows = count_rows(tables)
+            with ingest_stage("cross_table_validate") as stage:
+                stage.rows = count_rows(tables)
+                ct_error_messages = ingest_dependencies.cross_table_validate(tables, budget)
             error_messages = p_error_messages + ct_error_messages
             if error_messages:
                 raise ValidationError(error_messages)
-            coerce_data(tables, ingest_dependencies.extract_process_validate_schema)
-            transformed_data = ingest_dependencies.transform(tables, reporting_round)
+            with ingest_stage("coerce_data") as stage:
+                stage.rows = count_rows(tables)
+                coerce_data(tables, ingest_dependencies.extract_process_validate_schema)
+            with ingest_stage("transform") as stage:
+                transformed_data = ingest_dependencies.transform(tables, reporting_round)
+                stage.rows = count_rows(transformed_data)
     except InitialValidationError as e:
         return build_validation_error_response(initial_validation_messages=e.error_messages)
     except OldValidationError as validation_error:
@@ -175,9 +211,12 @@ def ingest(  # noqa: C901
             detail=f"Uncaught ingest exception: {type(uncaught_exception).__name__}: {str(uncaught_exception)}",
             failure_uuid=failure_uuid,
         )
-    clean_data(transformed_data)
+    with ingest_stage("clean_data") as stage:
+        stage.rows = count_rows(transformed_data)
+        clean_data(transformed_data)
+    load_report = None
     if do_load:
-        populate_db(
+        load_report = populate_db(
             round_number=reporting_round,
             transformed_data=transformed_data,
             mappings=INGEST_MAPPINGS,
@@ -185,13 +224,16 @@ def ingest(  # noqa: C901
             load_mapping=ingest_dependencies.table_to_load_function_mapping,
             submitting_account_id=submitting_account_id,
             submitting_user_email=submitting_user_email,
+            differential=differential_load,
         )
     programme_metadata = get_metadata(transformed_data)
-    return build_success_response(programme_metadata=programme_metadata, do_load=do_load)
+    return build_success_response(programme_metadata=programme_metadata, do_load=do_load, load_report=load_report)
 
 
 def extract_process_validate_tables(
-    workbook_data: dict[str, pd.DataFrame], tables_config: dict[str, TableConfig]
+    workbook_data: dict[str, pd.DataFrame],
+    tables_config: dict[str, TableConfig],
+    budget: ValidationBudget | None = None,
 ) -> tuple[dict[str, pd.DataFrame], list[Message]]:
     """Extracts, processes and validates tables from a workbook based on the specified configuration.
 
@@ -200,23 +242,50 @@ def extract_process_validate_tables(
     :param workbook_data: a dictionary containing worksheet names as keys and corresponding pandas DataFrames as values
     :param tables_config: a dictionary containing table names as keys and corresponding configuration dictionaries as
         values
+    :param budget: the number of errors to find before stopping, after which the remaining tables are neither processed
+        nor validated and are left out of the returned tables
     :return: a tuple containing a dictionary of tables and a list of error messages
     """
-    extractor = ta.TableExtractor(workbook_data)
+    budget = budget or ValidationBudget()
+    # the control tables are the same in every workbook made from a template, so are only processed and validated the
+    # first time the template is seen, and the positions of the other tables are remembered from then too
+    control_table_names = [table_name for table_name, config in tables_config.items() if is_control_table(config)]
+    # All PFV1 tables are singular, so we assume there is only one table. This may not be true for future templates.
+    control_extractor = ta.TableExtractor(workbook_data)
+    extracted = {
+        table_name: control_extractor.extract(tables_config[table_name].extract)[0]
+        for table_name in control_table_names
+    }
+    fingerprint = template_fingerprint(
+        {table_name: extracted[table_name].df for table_name in control_table_names}, tables_config
+    )
+    cached_control_tables = control_tables_cache.get(fingerprint) if fingerprint else None
+    known_layout = template_layouts_cache.get(fingerprint) if fingerprint else None
+
+    extractor = ta.TableExtractor(workbook_data, known_layout=known_layout)
+    for table_name, config in tables_config.items():
+        if table_name not in extracted:
+            extracted[table_name] = extractor.extract(config.extract)[0]
+    if fingerprint and known_layout is None:
+        template_layouts_cache.set(fingerprint, extractor.layout)
+
     tables = {}
     error_messages = []
     for table_name, config in tables_config.items():
+        if cached_control_tables is not None and table_name in cached_control_tables:
+            tables[table_name] = cached_control_tables[table_name].copy()
+            continue
+        if budget.exhausted:
+            break
         worksheet_name = config.extract.worksheet_name
-        extracted_tables = extractor.extract(config.extract)
         processor = ta.TableProcessor(config.process)
         validator = TableValidator(config.validate)
-        # All PFV1 tables are singular, so we assume there is only one table. This may not be true for future templates.
-        table = extracted_tables[0]
+        table = extracted[table_name]
         processor.process(table)
         try:
             validator.validate(table)
         except TableValidationErrors as e:
-            for error in e.validation_errors:
+            for error in budget.spend(e.validation_errors):
                 error_messages.append(
                     Message(
                         sheet=worksheet_name,
@@ -235,6 +304,16 @@ def extract_process_validate_tables(
                     ),
                 )
         tables[table_name] = table.df
+
+    if (
+        fingerprint
+        and cached_control_tables is None
+        and all(table_name in tables for table_name in control_table_names)
+        and not any(message.section in control_table_names for message in error_messages)
+    ):
+        control_tables_cache.set(
+            fingerprint, {table_name: tables[table_name].copy() for table_name in control_table_names}
+        )
     return tables, error_messages
 
 
@@ -300,23 +379,26 @@ def build_internal_error_response(
     )
 
 
-def build_success_response(programme_metadata: dict[str, pd.DataFrame], do_load: bool) -> tuple[dict, int]:
+def build_success_response(
+    programme_metadata: dict[str, pd.DataFrame], do_load: bool, load_report: DifferentialLoadReport | None = None
+) -> tuple[dict, int]:
     """Builds a success response.
 
     :param programme_metadata: metadata about the program being ingested
     :param do_load: if the data was loaded to the db
+    :param load_report: the rows touched by a differential load, if one was done
     :return: the response payload
     """
-    return (
-        dict(
-            detail=f"Spreadsheet successfully validated{' and ingested' if do_load else ' but NOT ingested'}",
-            status=200,
-            title="success",
-            metadata=programme_metadata,
-            loaded=do_load,
-        ),
-        200,
+    response = dict(
+        detail=f"Spreadsheet successfully validated{' and ingested' if do_load else ' but NOT ingested'}",
+        status=200,
+        title="success",
+        metadata=programme_metadata,
+        loaded=do_load,
     )
+    if load_report:
+        response["load_report"] = load_report.to_dict()
+    return response, 200
 
 
 def process_validation_failures(
@@ -414,6 +496,15 @@ def clean_data(transformed_data: dict[str, pd.DataFrame]) -> None:
         table.replace({pd.NaT: None}, inplace=True)
 
 
+def count_rows(tables: dict[str, pd.DataFrame]) -> int:
+    """Counts the rows across a set of tables, for reporting the size of each stage of an ingest.
+
+    :param tables: tables, keyed by name
+    :return: the total number of rows
+    """
+    return sum(len(table) for table in tables.values())
+
+
 def get_metadata(transformed_data: dict[str, pd.DataFrame]) -> dict:
     """Collect programme-level metadata on the submission.
 
@@ -423,7 +514,7 @@ def get_metadata(transformed_data: dict[str, pd.DataFrame]) -> dict:
     return dict(transformed_data["Programme_Ref"].iloc[0])
 
 
-@transaction_retry_wrapper(max_retries=5, sleep_duration=0.6, error_type=exc.IntegrityError)
+@transaction_retry_wrapper(max_retries=2, sleep_duration=0.6, error_type=exc.IntegrityError)
 def populate_db(
     *,
     round_number: int,
@@ -433,12 +524,18 @@ def populate_db(
     load_mapping: dict[str, Callable],
     submitting_account_id: str | None = None,
     submitting_user_email: str | None = None,
-) -> None:
+    differential: bool = False,
+) -> DifferentialLoadReport | None:
     """Populate the database with the data from the specified transformed_data using the provided data mappings.
 
-    If the same submission for the same reporting_round exists, delete the submission and its children.
+    If the same submission for the same reporting_round exists, delete the submission and its children, or if
+    `differential` is set, apply only the changes between it and the incoming data.
     If not, generate a new submission_id by auto-incrementing based on the last submission_id for that reporting_round.
 
+    Concurrent ingests of the same programme or organisation are serialised with transaction-scoped advisory locks, and
+    those that allocate a submission_id for the same fund and reporting_round by the lock on its counter, so they queue
+    rather than failing on unique constraints and being retried.
+
     :param transformed_data: A dictionary containing data in the form of pandas dataframes.
     :param mappings: A tuple of DataMapping objects, which contain the necessary information for mapping the data from
                      the workbook to the database.
@@ -446,35 +543,63 @@ def populate_db(
     :param load_mapping: dictionary of tables and functions to load the tables into the DB.
     :param submitting_account_id: The account ID of the submitting user.
     :param submitting_user_email: The email address of the submitting user.
-    :return: None
+    :param differential: apply only the changes to an existing submission, rather than replacing it.
+    :return: a report of the rows touched, if the submission was loaded differentially
     """
     programme_id = transformed_data["Programme_Ref"]["Programme ID"].iloc[0]
     fund_code = transformed_data["Programme_Ref"]["FundType_ID"].iloc[0]
+    organisation_name = transformed_data["Organisation_Ref"]["Organisation"].iloc[0]
+
+    # locks are always taken in the order programme, organisation, then the submission ID counter (in
+    # `next_submission_id`)
+    acquire_advisory_xact_lock("programme", programme_id)
+    acquire_advisory_xact_lock("organisation", organisation_name)
     programme_exists_previous_round = get_programme_by_id_and_previous_round(programme_id, round_number)
     programme_exists_same_round = get_programme_by_id_and_round(programme_id, round_number)
 
     submission_id, submission_to_del = get_or_generate_submission_id(
         programme_exists_same_round, round_number, fund_code
     )
-    if submission_to_del:
-        delete_existing_submission(submission_to_del)
-
     reporting_round_id = get_reporting_round_id(fund_code, round_number)
 
-    for mapping in mappings:
-        if load_function := load_mapping.get(mapping.table):
-            additional_kwargs = dict(
+    load_report = None
+    if submission_to_del and differential:
+        with ingest_stage("load_submission_differences") as stage:
+            load_report = load_submission_differences(
+                transformed_data,
+                mappings,
+                load_mapping,
+                existing_submission=submission_to_del,
                 submission_id=submission_id,
+                reporting_round_id=reporting_round_id,
                 programme_exists_previous_round=programme_exists_previous_round,
                 round_number=round_number,
-                reporting_round_id=reporting_round_id,
-            )  # some load functions also expect additional key word args
-            load_function(transformed_data, mapping, **additional_kwargs)
+            )
+            stage.rows = load_report.rows_touched
+    else:
+        if submission_to_del:
+            with ingest_stage("delete_existing_submission"):
+                delete_existing_submission(submission_to_del)
+
+        for mapping in mappings:
+            if load_function := load_mapping.get(mapping.table):
+                additional_kwargs = dict(
+                    submission_id=submission_id,
+                    programme_exists_previous_round=programme_exists_previous_round,
+                    round_number=round_number,
+                    reporting_round_id=reporting_round_id,
+                )  # some load functions also expect additional key word args
+                with ingest_stage(f"load:{mapping.table}") as stage:
+                    if mapping.table in transformed_data:
+                        stage.rows = len(transformed_data[mapping.table])
+                    load_function(transformed_data, mapping, **additional_kwargs)
 
     save_submission_file_name_and_user_metadata(excel_file, submission_id, submitting_account_id, submitting_user_email)
-    save_submission_file_s3(excel_file, submission_id)
+    with ingest_stage("s3_upload"):
+        save_submission_file_s3(excel_file, submission_id)
 
     db.session.commit()
+    return load_report
 
 
 def save_submission_file_name_and_user_metadata(
@@ -4,43 +4,13 @@ from typing import Callable
 
 import pandas as pd
 
-import data_store.validation.towns_fund.fund_specific_validation.fs_validate_r4 as tf_r4_validate
-import data_store.validation.towns_fund.fund_specific_validation.fs_validate_r6 as tf_r6_validate
 from data_store.controllers.load_functions import get_table_to_load_function_mapping
 from data_store.messaging import Message, MessengerBase
-from data_store.messaging.tf_messaging import TFMessenger
 from data_store.table_extraction.config.common import TableConfig
-from data_store.table_extraction.config.pf_r1_config import PF_TABLE_CONFIG as PF_R1_TABLE_CONFIG
-from data_store.table_extraction.config.pf_r2_config import PF_TABLE_CONFIG as PF_R2_TABLE_CONFIG
-from data_store.table_extraction.config.pf_r3_config import PF_TABLE_CONFIG as PF_R3_TABLE_CONFIG
-from data_store.transformation.pathfinders.pf_transform_r1 import transform as pf_r1_transform
-from data_store.transformation.pathfinders.pf_transform_r2 import transform as pf_r2_transform
-from data_store.transformation.pathfinders.pf_transform_r3 import transform as pf_r3_transform
-from data_store.transformation.towns_fund.tf_transform_r3 import transform as tf_r3_transform
-from data_store.transformation.towns_fund.tf_transform_r4 import transform as tf_r4_transform
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.initial_validation.checks import Check
-from data_store.validation.initial_validation.schemas import (
-    PF_ROUND_1_INIT_VAL_SCHEMA,
-    PF_ROUND_2_INIT_VAL_SCHEMA,
-    PF_ROUND_3_INIT_VAL_SCHEMA,
-    TF_ROUND_3_INIT_VAL_SCHEMA,
-    TF_ROUND_4_INIT_VAL_SCHEMA,
-    TF_ROUND_5_INIT_VAL_SCHEMA,
-    TF_ROUND_6_INIT_VAL_SCHEMA,
-    TF_ROUND_7_INIT_VAL_SCHEMA,
-)
-from data_store.validation.pathfinders.cross_table_validation.ct_validate_r1 import (
-    cross_table_validate as pf_r1_cross_table_validate,
-)
-from data_store.validation.pathfinders.cross_table_validation.ct_validate_r2 import (
-    cross_table_validate as pf_r2_cross_table_validate,
-)
 from data_store.validation.pathfinders.schema_validation.columns import float_column
 from data_store.validation.towns_fund.failures.user import GenericFailure
-from data_store.validation.towns_fund.schema_validation.schemas import (
-    TF_ROUND_3_VAL_SCHEMA,
-    TF_ROUND_4_VAL_SCHEMA,
-)
 
 
 @dataclass
@@ -89,94 +59,186 @@ class PFIngestDependencies(IngestDependencies):
     Attributes:
         cross_table_validate: a function that runs cross-table validation checks on the input DataFrames extracted from
             the original Excel file. These are checks that require data from multiple tables to be compared against each
-            other.
+            other. It stops early once the given validation budget has been spent.
         extract_process_validate_schema: a schema that defines how we should extract, process and validate the data from
             the original Excel file.
     """
 
-    cross_table_validate: Callable[[dict[str, pd.DataFrame]], list[Message]]
+    cross_table_validate: Callable[[dict[str, pd.DataFrame], ValidationBudget | None], list[Message]]
     extract_process_validate_schema: dict[str, TableConfig]
 
 
+# Builders are registered per (fund, reporting round) and only import the round's config, schema, validation and
+# transform modules when they are first called. This keeps those modules (and the pandas/pandera work they do at import)
+# out of processes that never ingest, such as find-only web workers and most CLI commands.
+_INGEST_DEPENDENCY_BUILDERS: dict[tuple[str, int], Callable[[], IngestDependencies]] = {}
+
+
+def _register(fund: str, reporting_round: int) -> Callable:
+    """Registers a builder function for the IngestDependencies of a fund and reporting round."""
+
+    def decorator(builder: Callable[[], IngestDependencies]) -> Callable[[], IngestDependencies]:
+        _INGEST_DEPENDENCY_BUILDERS[(fund, reporting_round)] = builder
+        return builder
+
+    return decorator
+
+
+@_register("Towns Fund", 3)
+def _tf_round_3() -> TFIngestDependencies:
+    from data_store.messaging.tf_messaging import TFMessenger
+    from data_store.transformation.towns_fund.tf_transform_r3 import transform as tf_r3_transform
+    from data_store.validation.initial_validation.schemas import TF_ROUND_3_INIT_VAL_SCHEMA
+    from data_store.validation.towns_fund.schema_validation.schemas import TF_ROUND_3_VAL_SCHEMA
+
+    return TFIngestDependencies(
+        transform=tf_r3_transform,
+        validation_schema=TF_ROUND_3_VAL_SCHEMA,
+        initial_validation_schema=TF_ROUND_3_INIT_VAL_SCHEMA,
+        messenger=TFMessenger(),
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
+    )
+
+
+@_register("Towns Fund", 4)
+def _tf_round_4() -> TFIngestDependencies:
+    import data_store.validation.towns_fund.fund_specific_validation.fs_validate_r4 as tf_r4_validate
+    from data_store.messaging.tf_messaging import TFMessenger
+    from data_store.transformation.towns_fund.tf_transform_r4 import transform as tf_r4_transform
+    from data_store.validation.initial_validation.schemas import TF_ROUND_4_INIT_VAL_SCHEMA
+    from data_store.validation.towns_fund.schema_validation.schemas import TF_ROUND_4_VAL_SCHEMA
+
+    return TFIngestDependencies(
+        transform=tf_r4_transform,
+        validation_schema=TF_ROUND_4_VAL_SCHEMA,
+        initial_validation_schema=TF_ROUND_4_INIT_VAL_SCHEMA,
+        messenger=TFMessenger(),
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
+        fund_specific_validation=tf_r4_validate.validate,
+    )
+
+
+@_register("Towns Fund", 5)
+def _tf_round_5() -> TFIngestDependencies:
+    import data_store.validation.towns_fund.fund_specific_validation.fs_validate_r4 as tf_r4_validate
+    from data_store.messaging.tf_messaging import TFMessenger
+    from data_store.transformation.towns_fund.tf_transform_r4 import transform as tf_r4_transform
+    from data_store.validation.initial_validation.schemas import TF_ROUND_5_INIT_VAL_SCHEMA
+    from data_store.validation.towns_fund.schema_validation.schemas import TF_ROUND_4_VAL_SCHEMA
+
+    return TFIngestDependencies(
+        transform=tf_r4_transform,
+        validation_schema=TF_ROUND_4_VAL_SCHEMA,
+        initial_validation_schema=TF_ROUND_5_INIT_VAL_SCHEMA,
+        messenger=TFMessenger(),
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
+        fund_specific_validation=tf_r4_validate.validate,
+    )
+
+
+@_register("Towns Fund", 6)
+def _tf_round_6() -> TFIngestDependencies:
+    import data_store.validation.towns_fund.fund_specific_validation.fs_validate_r6 as tf_r6_validate
+    from data_store.messaging.tf_messaging import TFMessenger
+    from data_store.transformation.towns_fund.tf_transform_r4 import transform as tf_r4_transform
+    from data_store.validation.initial_validation.schemas import TF_ROUND_6_INIT_VAL_SCHEMA
+    from data_store.validation.towns_fund.schema_validation.schemas import TF_ROUND_4_VAL_SCHEMA
+
+    return TFIngestDependencies(
+        transform=tf_r4_transform,
+        validation_schema=TF_ROUND_4_VAL_SCHEMA,
+        initial_validation_schema=TF_ROUND_6_INIT_VAL_SCHEMA,
+        messenger=TFMessenger(),
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
+        fund_specific_validation=tf_r6_validate.validate,
+    )
+
+
+@_register("Towns Fund", 7)
+def _tf_round_7() -> TFIngestDependencies:
+    import data_store.validation.towns_fund.fund_specific_validation.fs_validate_r6 as tf_r6_validate
+    from data_store.messaging.tf_messaging import TFMessenger
+    from data_store.transformation.towns_fund.tf_transform_r4 import transform as tf_r4_transform
+    from data_store.validation.initial_validation.schemas import TF_ROUND_7_INIT_VAL_SCHEMA
+    from data_store.validation.towns_fund.schema_validation.schemas import TF_ROUND_4_VAL_SCHEMA
+
+    return TFIngestDependencies(
+        transform=tf_r4_transform,
+        validation_schema=TF_ROUND_4_VAL_SCHEMA,
+        initial_validation_schema=TF_ROUND_7_INIT_VAL_SCHEMA,
+        messenger=TFMessenger(),
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
+        fund_specific_validation=tf_r6_validate.validate,
+    )
+
+
+@_register("Pathfinders", 1)
+def _pf_round_1() -> PFIngestDependencies:
+    from data_store.table_extraction.config.pf_r1_config import PF_TABLE_CONFIG as PF_R1_TABLE_CONFIG
+    from data_store.transformation.pathfinders.pf_transform_r1 import transform as pf_r1_transform
+    from data_store.validation.initial_validation.schemas import PF_ROUND_1_INIT_VAL_SCHEMA
+    from data_store.validation.pathfinders.cross_table_validation.ct_validate_r1 import (
+        cross_table_validate as pf_r1_cross_table_validate,
+    )
+
+    return PFIngestDependencies(
+        initial_validation_schema=PF_ROUND_1_INIT_VAL_SCHEMA,
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Pathfinders"),
+        cross_table_validate=pf_r1_cross_table_validate,
+        extract_process_validate_schema=PF_R1_TABLE_CONFIG,
+        transform=pf_r1_transform,
+    )
+
+
+@_register("Pathfinders", 2)
+def _pf_round_2() -> PFIngestDependencies:
+    from data_store.table_extraction.config.pf_r2_config import PF_TABLE_CONFIG as PF_R2_TABLE_CONFIG
+    from data_store.transformation.pathfinders.pf_transform_r2 import transform as pf_r2_transform
+    from data_store.validation.initial_validation.schemas import PF_ROUND_2_INIT_VAL_SCHEMA
+    from data_store.validation.pathfinders.cross_table_validation.ct_validate_r2 import (
+        cross_table_validate as pf_r2_cross_table_validate,
+    )
+
+    return PFIngestDependencies(
+        initial_validation_schema=PF_ROUND_2_INIT_VAL_SCHEMA,
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Pathfinders"),
+        cross_table_validate=pf_r2_cross_table_validate,
+        extract_process_validate_schema=PF_R2_TABLE_CONFIG,
+        transform=pf_r2_transform,
+    )
+
+
+@_register("Pathfinders", 3)
+def _pf_round_3() -> PFIngestDependencies:
+    from data_store.table_extraction.config.pf_r3_config import PF_TABLE_CONFIG as PF_R3_TABLE_CONFIG
+    from data_store.transformation.pathfinders.pf_transform_r3 import transform as pf_r3_transform
+    from data_store.validation.initial_validation.schemas import PF_ROUND_3_INIT_VAL_SCHEMA
+    from data_store.validation.pathfinders.cross_table_validation.ct_validate_r2 import (
+        cross_table_validate as pf_r2_cross_table_validate,
+    )
+
+    return PFIngestDependencies(
+        initial_validation_schema=PF_ROUND_3_INIT_VAL_SCHEMA,
+        table_to_load_function_mapping=get_table_to_load_function_mapping("Pathfinders"),
+        cross_table_validate=pf_r2_cross_table_validate,
+        extract_process_validate_schema=PF_R3_TABLE_CONFIG,
+        transform=pf_r3_transform,
+    )
+
+
 def ingest_dependencies_factory(fund: str, reporting_round: int) -> IngestDependencies | None:
     """Return the IngestDependencies for a fund and reporting round.
 
+    The modules backing a fund and round are imported the first time its dependencies are requested.
+
     :param fund: fund name
     :param reporting_round: reporting round
     :return: a set of IngestDependencies. If the fund and reporting round combination is unsupported, return None
     """
-    match (fund, reporting_round):
-        case ("Towns Fund", 3):
-            return TFIngestDependencies(
-                transform=tf_r3_transform,
-                validation_schema=TF_ROUND_3_VAL_SCHEMA,
-                initial_validation_schema=TF_ROUND_3_INIT_VAL_SCHEMA,
-                messenger=TFMessenger(),
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
-            )
-        case ("Towns Fund", 4):
-            return TFIngestDependencies(
-                transform=tf_r4_transform,
-                validation_schema=TF_ROUND_4_VAL_SCHEMA,
-                initial_validation_schema=TF_ROUND_4_INIT_VAL_SCHEMA,
-                messenger=TFMessenger(),
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
-                fund_specific_validation=tf_r4_validate.validate,
-            )
-        case ("Towns Fund", 5):
-            return TFIngestDependencies(
-                transform=tf_r4_transform,
-                validation_schema=TF_ROUND_4_VAL_SCHEMA,
-                initial_validation_schema=TF_ROUND_5_INIT_VAL_SCHEMA,
-                messenger=TFMessenger(),
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
-                fund_specific_validation=tf_r4_validate.validate,
-            )
-        case ("Towns Fund", 6):
-            return TFIngestDependencies(
-                transform=tf_r4_transform,
-                validation_schema=TF_ROUND_4_VAL_SCHEMA,
-                initial_validation_schema=TF_ROUND_6_INIT_VAL_SCHEMA,
-                messenger=TFMessenger(),
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
-                fund_specific_validation=tf_r6_validate.validate,
-            )
-        case ("Towns Fund", 7):
-            return TFIngestDependencies(
-                transform=tf_r4_transform,
-                validation_schema=TF_ROUND_4_VAL_SCHEMA,
-                initial_validation_schema=TF_ROUND_7_INIT_VAL_SCHEMA,
-                messenger=TFMessenger(),
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Towns Fund"),
-                fund_specific_validation=tf_r6_validate.validate,
-            )
-
-        case ("Pathfinders", 1):
-            return PFIngestDependencies(
-                initial_validation_schema=PF_ROUND_1_INIT_VAL_SCHEMA,
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Pathfinders"),
-                cross_table_validate=pf_r1_cross_table_validate,
-                extract_process_validate_schema=PF_R1_TABLE_CONFIG,
-                transform=pf_r1_transform,
-            )
-        case ("Pathfinders", 2):
-            return PFIngestDependencies(
-                initial_validation_schema=PF_ROUND_2_INIT_VAL_SCHEMA,
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Pathfinders"),
-                cross_table_validate=pf_r2_cross_table_validate,
-                extract_process_validate_schema=PF_R2_TABLE_CONFIG,
-                transform=pf_r2_transform,
-            )
-        case ("Pathfinders", 3):
-            return PFIngestDependencies(
-                initial_validation_schema=PF_ROUND_3_INIT_VAL_SCHEMA,
-                table_to_load_function_mapping=get_table_to_load_function_mapping("Pathfinders"),
-                cross_table_validate=pf_r2_cross_table_validate,
-                extract_process_validate_schema=PF_R3_TABLE_CONFIG,
-                transform=pf_r3_transform,
-            )
-        case _:
-            return None
+    builder = _INGEST_DEPENDENCY_BUILDERS.get((fund, reporting_round))
+    if builder is None:
+        return None
+    return builder()
 
 
 def alter_validations_for_local_authorities(ingest_dependency: IngestDependencies) -> IngestDependencies:
@@ -4,20 +4,79 @@ This module contains methods used for loading data into the database,
 as well as helper functions for loading.
 """
 
+import time
+import uuid
+from collections import defaultdict
+
 import pandas as pd
+from flask import current_app
+from sqlalchemy import Table, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 from data_store.const import SUBMISSION_ID_FORMAT, OrganisationTypeEnum
 from data_store.controllers.mappings import DataMapping
 from data_store.db import db
-from data_store.db.entities import GeospatialDim, Organisation, Programme, ProgrammeJunction, ReportingRound, Submission
+from data_store.db.entities import (
+    Funding,
+    FundingComment,
+    FundingQuestion,
+    Organisation,
+    OutcomeData,
+    OutputData,
+    PlaceDetail,
+    PrivateInvestment,
+    Programme,
+    ProgrammeFundingManagement,
+    ProgrammeJunction,
+    ProgrammeProgress,
+    Project,
+    ProjectFinanceChange,
+    ProjectProgress,
+    ReportingRound,
+    RiskRegister,
+    Submission,
+    SubmissionIdCounter,
+    project_geospatial_association,
+)
 from data_store.db.queries import (
     get_latest_submission_by_round_and_fund,
     get_organisation_exists,
 )
 from data_store.db.types import GUID
 from data_store.exceptions import MissingGeospatialException
+from data_store.reference_data import (
+    KNOWN_OUTPUT_OUTCOME_NAMES,
+    add_known_output_outcome_names,
+    get_geospatial_ids_by_prefix,
+)
 from data_store.util import get_postcode_prefix_set
 
+# The order in which a submission's rows are deleted when it is replaced, as (model, foreign key column, parent model).
+# Children are deleted before their parents, so the ON DELETE CASCADEs have nothing left to do. Tables that can belong
+# to either a project or the programme junction are deleted by each key separately, so each delete uses an index.
+SUBMISSION_PURGE_ORDER = (
+    (project_geospatial_association, "project_id", Project),
+    (ProjectProgress, "project_id", Project),
+    (FundingComment, "project_id", Project),
+    (PrivateInvestment, "project_id", Project),
+    (Funding, "project_id", Project),
+    (Funding, "programme_junction_id", ProgrammeJunction),
+    (OutputData, "project_id", Project),
+    (OutputData, "programme_junction_id", ProgrammeJunction),
+    (OutcomeData, "project_id", Project),
+    (OutcomeData, "programme_junction_id", ProgrammeJunction),
+    (RiskRegister, "project_id", Project),
+    (RiskRegister, "programme_junction_id", ProgrammeJunction),
+    (ProgrammeProgress, "programme_junction_id", ProgrammeJunction),
+    (PlaceDetail, "programme_junction_id", ProgrammeJunction),
+    (FundingQuestion, "programme_junction_id", ProgrammeJunction),
+    (ProjectFinanceChange, "programme_junction_id", ProgrammeJunction),
+    (ProgrammeFundingManagement, "programme_junction_id", ProgrammeJunction),
+    (Project, "programme_junction_id", ProgrammeJunction),
+    (ProgrammeJunction, "submission_id", Submission),
+    (Submission, "id", Submission),
+)
+
 
 def load_programme_ref(
     transformed_data: dict[str, pd.DataFrame],
@@ -78,8 +137,7 @@ def load_outputs_outcomes_ref(transformed_data: dict[str, pd.DataFrame], mapping
     Loads data into the 'Outputs_Ref' or 'Outcomes_Ref' tables.
 
     The function first retrieves the relevant data from the transformed data using the provided mapping.
-    It then processes the data to get outcomes and outputs to insert,
-    and finally adds all the models to the database session.
+    It then inserts any outcomes or outputs that are not already in the database in a single statement.
 
     :param transformed_data: a dictionary of DataFrames of table data to be inserted into the db.
     :param mapping: the mapping of the relevant DataFrame to its attributes as they appear in the db.
@@ -87,8 +145,7 @@ def load_outputs_outcomes_ref(transformed_data: dict[str, pd.DataFrame], mapping
     model_data = transformed_data[mapping.table]
     models = mapping.map_data_to_models(model_data)
 
-    models = get_outcomes_outputs_to_insert(mapping, models)
-    db.session.add_all(models)
+    upsert_outcomes_outputs(mapping, models)
 
 
 def load_programme_junction(
@@ -147,8 +204,8 @@ def load_submission_level_data(
     Load submission-level data.
 
     Adds 'Submission ID' to the transformed_data and map the data accordingly.
-    When used for 'Project Details' mapping, calls another function to after creating the models to
-    create the many-to-many relationship between projects and geospatial reference data.
+    When used for 'Project Details' mapping, also creates the many-to-many relationship between projects and
+    geospatial reference data with a single bulk insert into project_geospatial_association.
 
     :param transformed_data: a dictionary of DataFrames of table data to be inserted into the db.
     :param mapping: the mapping of the relevant DataFrame to its attributes as they appear in the db.
@@ -158,11 +215,17 @@ def load_submission_level_data(
     worksheet["Submission ID"] = submission_id
     models = mapping.map_data_to_models(worksheet)
 
+    geospatial_associations = []
     if mapping.table == "Project Details":
-        add_project_geospatial_relationship(models)
+        geospatial_associations = get_project_geospatial_associations(models)
 
     db.session.add_all(models)
 
+    if geospatial_associations:
+        # the projects must exist before they can be referenced by the association table
+        db.session.flush()
+        db.session.execute(project_geospatial_association.insert(), geospatial_associations)
+
 
 def generic_load(transformed_data: dict[str, pd.DataFrame], mapping: DataMapping, **kwargs):
     """
@@ -177,16 +240,50 @@ def generic_load(transformed_data: dict[str, pd.DataFrame], mapping: DataMapping
     db.session.add_all(models)
 
 
-def delete_existing_submission(submission_to_del: GUID) -> None:
+def delete_existing_submission(submission_to_del: GUID) -> dict[str, float]:
     """
     Deletes the existing submission and all its children based on the UUID of that submission.
 
+    Children are deleted explicitly, in the order of SUBMISSION_PURGE_ORDER, by the IDs of the submission's programme
+    junction and projects, rather than relying on ON DELETE CASCADE to find them row by row. Each statement filters on
+    a single foreign key, so can use that key's `ix_*_join_*` index.
+
     :param submission_to_del: string of Submission's id to be deleted.
-    :return: None
+    :return: the time in seconds spent deleting from each table.
     """
-    Submission.query.filter_by(id=submission_to_del).delete()
+    programme_junction_ids = db.session.scalars(
+        select(ProgrammeJunction.id).where(ProgrammeJunction.submission_id == submission_to_del)
+    ).all()
+    project_ids = db.session.scalars(
+        select(Project.id).where(Project.programme_junction_id.in_(programme_junction_ids))
+    ).all()
+    ids_by_parent = {Project: project_ids, ProgrammeJunction: programme_junction_ids, Submission: [submission_to_del]}
+
+    timings: dict[str, float] = defaultdict(float)
+    row_counts: dict[str, int] = defaultdict(int)
+    for model, column, parent in SUBMISSION_PURGE_ORDER:
+        parent_ids = ids_by_parent[parent]
+        if not parent_ids:
+            continue
+        table = model if isinstance(model, Table) else model.__table__
+        start = time.perf_counter()
+        result = db.session.execute(delete(model).where(table.c[column].in_(parent_ids)))
+        timings[table.name] += time.perf_counter() - start
+        row_counts[table.name] += result.rowcount
+
     db.session.flush()
 
+    current_app.logger.info(
+        "Deleted submission {submission_id} in {total_time:.3f}s",
+        extra=dict(
+            submission_id=str(submission_to_del),
+            total_time=sum(timings.values()),
+            delete_timings=dict(timings),
+            deleted_rows=dict(row_counts),
+        ),
+    )
+    return dict(timings)
+
 
 def get_submission_by_programme_and_round(
     programme_id: str,
@@ -234,11 +331,14 @@ def get_or_generate_submission_id(
 
 
 def next_submission_id(round_number: int, fund_code: str) -> str:
-    """Get the next submission ID by incrementing the last in the DB.
+    """Get the next submission ID by atomically incrementing the counter for the fund and reporting round.
 
     Converts the reporting_round from numpy type to pythonic type.
-    Then orders by a substring of the submission_id to get the latest submission.
-    If there are no submissions for the reporting_round, assumes this is the 1st.
+    Counters are keyed on the submission ID prefix (eg. "S-R03-"), as TD and HS share the same submission IDs. The
+    counter's row stays locked until the transaction ends, so concurrent ingests cannot allocate the same submission ID,
+    and the increment is undone if the transaction rolls back.
+    If there is no counter for the prefix yet, it is started from the latest submission in the DB, or 1 if there are no
+    submissions for the reporting_round.
 
     :param round_number: the reporting round number.
     :param fund_code: the two-letter code representing the fund.
@@ -246,28 +346,72 @@ def next_submission_id(round_number: int, fund_code: str) -> str:
     :return: The next submission ID.
     """
     round_number = int(round_number)
-    latest_submission = get_latest_submission_by_round_and_fund(round_number, fund_code)
-    if not latest_submission:
-        return SUBMISSION_ID_FORMAT[fund_code].format(round_number, 1)
+    submission_id_format = SUBMISSION_ID_FORMAT[fund_code]
+    submission_id_prefix = submission_id_format.format(round_number, "")
+    counter = SubmissionIdCounter.__table__
+
+    submission_number = db.session.scalar(
+        update(counter)
+        .where(counter.c.submission_id_prefix == submission_id_prefix)
+        .values(last_submission_number=counter.c.last_submission_number + 1)
+        .returning(counter.c.last_submission_number)
+    )
+    if submission_number is None:
+        latest_submission = get_latest_submission_by_round_and_fund(round_number, fund_code)
+        submission_number = db.session.scalar(
+            insert(counter)
+            .values(
+                id=uuid.uuid4(),
+                submission_id_prefix=submission_id_prefix,
+                last_submission_number=latest_submission.submission_number + 1 if latest_submission else 1,
+            )
+            # another transaction may have started the counter since the update above
+            .on_conflict_do_update(
+                index_elements=[counter.c.submission_id_prefix],
+                set_={"last_submission_number": counter.c.last_submission_number + 1},
+            )
+            .returning(counter.c.last_submission_number)
+        )
+
+    return submission_id_format.format(round_number, submission_number)
 
-    incremented_submission_num = latest_submission.submission_number + 1
-    return SUBMISSION_ID_FORMAT[fund_code].format(round_number, incremented_submission_num)
 
+def upsert_outcomes_outputs(mapping: DataMapping, models: list) -> list[str]:
+    """Inserts outcomes or outputs not present in the database.
 
-def get_outcomes_outputs_to_insert(mapping: DataMapping, models: list) -> list:
-    """Returns outcomes or outputs not present in the database.
+    Names already known to exist in this process are skipped without a round trip. Any others are inserted in a single
+    `INSERT ... ON CONFLICT DO NOTHING` statement, so concurrent ingests adding the same name do not conflict. Names
+    that conflicted already exist, but possibly only in the current transaction, so they are added to the cache of
+    known names once it commits.
 
     :param mapping: mapping of ingest to db
     :param models: list of incoming outcomes or outputs being ingested
-    :return: list of outcomes or outcomes to be inserted
+    :return: names of the outcomes or outputs inserted
     """
     db_model_field = {"Outputs_Ref": "output_name", "Outcome_Ref": "outcome_name"}[mapping.table]
+    known_names = KNOWN_OUTPUT_OUTCOME_NAMES[mapping.table]
+
+    rows_to_upsert = {}
+    for model in models:
+        name = getattr(model, db_model_field)
+        if name not in known_names and name not in rows_to_upsert:
+            rows_to_upsert[name] = {column: getattr(model, column) for column in mapping.column_mapping.values()}
+
+    if not rows_to_upsert:
+        return []
+
+    dim_table = mapping.model.__table__
+    upsert_statement = (
+        insert(dim_table)
+        .values(list(rows_to_upsert.values()))
+        .on_conflict_do_nothing(index_elements=[dim_table.c[db_model_field]])
+        .returning(dim_table.c[db_model_field])
+    )
+    inserted_names = db.session.scalars(upsert_statement).all()
 
-    query_results = db.session.query(getattr(mapping.model, db_model_field)).all()
-    existing_names = [str(row[0]) for row in query_results]
-    models = [model for model in models if getattr(model, db_model_field) not in existing_names]
+    add_known_output_outcome_names(mapping.table, rows_to_upsert.keys() - set(inserted_names))
 
-    return models
+    return list(inserted_names)
 
 
 def remove_unreferenced_organisations():
@@ -336,33 +480,39 @@ def get_table_to_load_function_mapping(fund: str) -> dict:
     return fund_to_table_mapping_dict[fund]
 
 
-def add_project_geospatial_relationship(project_models: list[db.Model]) -> list[db.Model]:
+def get_project_geospatial_associations(project_models: list[db.Model]) -> list[dict[str, uuid.UUID]]:
     """
-    Creates the many-to-many relationship between each project and the geospatial_dim
-    based on the project's postcodes by appending the relevant geospatial_dim entity
-    to the project's 'geospatial' field.
+    Builds the many-to-many relationship between each project and the geospatial_dim based on the project's
+    postcodes, as rows to be inserted into project_geospatial_association.
 
-    :param models: A list of instantiated Project model instances.
-    :return: A list of instantiated Project model instances.
-    """
-    failing_postcode_prefixes = set()
+    Postcode prefixes are looked up in the in-memory geospatial index, which is refreshed once if any prefix is missing.
+    Projects are assigned their ID here, if they do not already have one, so that the rows can reference them.
 
-    for row in project_models:
-        if row.postcodes is None:
-            continue
-
-        postcodes_prefix_set = get_postcode_prefix_set(row.postcodes)
-        filtered_geospatial_records = GeospatialDim.query.filter(
-            GeospatialDim.postcode_prefix.in_(postcodes_prefix_set)
-        ).all()
-        row.geospatial_dims = [geo_row for geo_row in filtered_geospatial_records]
+    :param project_models: A list of instantiated Project model instances.
+    :return: A list of project_geospatial_association rows.
+    :raises MissingGeospatialException: if any postcode prefix is not in the geospatial_dim table.
+    """
+    project_prefixes = [
+        (row, get_postcode_prefix_set(row.postcodes)) for row in project_models if row.postcodes is not None
+    ]
+    all_prefixes = set().union(*(postcodes_prefix_set for _, postcodes_prefix_set in project_prefixes))
 
-        failing_postcode_prefixes.update(
-            postcodes_prefix_set - {associated_row.postcode_prefix for associated_row in row.geospatial_dims}
-        )
+    geospatial_ids_by_prefix = get_geospatial_ids_by_prefix()
+    if not all_prefixes <= geospatial_ids_by_prefix.keys():
+        geospatial_ids_by_prefix = get_geospatial_ids_by_prefix(refresh=True)
 
+    failing_postcode_prefixes = all_prefixes - geospatial_ids_by_prefix.keys()
     if failing_postcode_prefixes:
         sorted_failing_postcode_prefixes = sorted(list(failing_postcode_prefixes))
         raise MissingGeospatialException(sorted_failing_postcode_prefixes)
 
-    return project_models
+    associations: list[dict[str, uuid.UUID]] = []
+    for row, postcodes_prefix_set in project_prefixes:
+        if row.id is None:
+            row.id = uuid.uuid4()
+        associations.extend(
+            {"project_id": row.id, "geospatial_id": geospatial_ids_by_prefix[postcode_prefix]}
+            for postcode_prefix in sorted(postcodes_prefix_set)
+        )
+
+    return associations
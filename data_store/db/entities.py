@@ -7,7 +7,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column, relationship
-from data_store.const import OrganisationTypeEnum
+from data_store.const import DownloadJobStatusEnum, OrganisationTypeEnum
 from data_store.db import db
 from data_store.db.types import GUID
 
@@ -18,6 +18,50 @@ class BaseModel(db.Model):
     id: Mapped[GUID] = sqla.orm.mapped_column(GUID(), default=uuid.uuid4, primary_key=True)
 
 
+class DownloadJob(BaseModel):
+    """Stores an asynchronous download, so that identical requests made while it is in flight can share its file."""
+
+    __tablename__ = "download_job"
+
+    # hash of the normalised file format and filters, see `data_store.controllers.async_download.download_filters_key`
+    filters_key: Mapped[str]
+    file_format: Mapped[str]
+    filters = sqla.Column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(default=DownloadJobStatusEnum.QUEUED)
+    file_name: Mapped[str | None]
+    created_at: Mapped[datetime]
+    updated_at: Mapped[datetime]
+
+    # progress, updated as each sheet is written and when the file is uploaded
+    sheets_total: Mapped[int] = mapped_column(default=0, server_default="0")
+    sheets_done: Mapped[int] = mapped_column(default=0, server_default="0")
+    rows_written: Mapped[int] = mapped_column(default=0, server_default="0")
+    bytes_uploaded: Mapped[int] = mapped_column(sqla.BigInteger, default=0, server_default="0")
+
+    requesters: Mapped[List["DownloadJobRequester"]] = relationship(
+        back_populates="download_job", order_by="DownloadJobRequester.requested_at"
+    )
+
+    __table_args__ = (sqla.Index("ix_download_job_filters_key", "filters_key"),)
+
+
+class DownloadJobRequester(BaseModel):
+    """Stores each user who requested a download job, who are all emailed a link to its file."""
+
+    __tablename__ = "download_job_requester"
+
+    download_job_id: Mapped[GUID] = mapped_column(sqla.ForeignKey("download_job.id", ondelete="CASCADE"))
+    email_address: Mapped[str]
+    requested_at: Mapped[datetime]
+
+    download_job: Mapped["DownloadJob"] = relationship(back_populates="requesters")
+
+    __table_args__ = (
+        sqla.Index("ix_download_job_requester_join_download_job", "download_job_id"),
+        sqla.Index("ix_download_job_requester_email_address", "email_address"),
+    )
+
+
 class Fund(BaseModel):
     """Stores Fund Entities."""
 
@@ -632,6 +676,18 @@ class Submission(BaseModel):
         return int(self.submission_id.split("-")[-1])
 
 
+class SubmissionIdCounter(BaseModel):
+    """Stores the last submission number allocated for each submission ID prefix, eg. "S-R03-" or "S-PF-R01-".
+
+    The prefix identifies a fund family (Towns Fund submission IDs are shared by TD and HS) and reporting round.
+    """
+
+    __tablename__ = "submission_id_counter"
+
+    submission_id_prefix: Mapped[str] = mapped_column(unique=True)
+    last_submission_number: Mapped[int]
+
+
 class ReportingRound(BaseModel):
     """Stores Reporting Round information specific to each fund."""
 
@@ -0,0 +1,122 @@
+"""Counts and times the SQL statements issued while handling a request or running a Celery task.
+
+Statements are recorded by SQLAlchemy `before_cursor_execute` / `after_cursor_execute` listeners into every
+`QueryProfile` that is active in the current context (see `profile_queries`). When `ENABLE_QUERY_PROFILER` is set,
+`query_profiler` profiles every Flask request, and `FSDTask` every Celery task, and logs a summary of each.
+"""
+
+import heapq
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from flask import Flask, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# statements are truncated to this many characters when logged
+MAX_STATEMENT_LENGTH = 500
+
+_active_profiles: ContextVar[tuple["QueryProfile", ...]] = ContextVar("active_query_profiles", default=())
+
+
+@dataclass
+class QueryProfile:
+    """The number of SQL statements issued, the time spent executing them and the slowest of them."""
+
+    max_slowest: int = 5
+    statement_count: int = 0
+    total_time: float = 0.0
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statement_count += 1
+        self.total_time += duration
+        if len(self.slowest) < self.max_slowest:
+            heapq.heappush(self.slowest, (duration, statement))
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (duration, statement))
+
+    def to_dict(self) -> dict:
+        return {
+            "statement_count": self.statement_count,
+            "total_time": round(self.total_time, 4),
+            "slowest": [
+                {"duration": round(duration, 4), "statement": statement[:MAX_STATEMENT_LENGTH]}
+                for duration, statement in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+@contextmanager
+def profile_queries(max_slowest: int = 5) -> Iterator[QueryProfile]:
+    """Records the SQL statements issued within the block. Profiles can be nested.
+
+    :param max_slowest: the number of slowest statements to keep
+    :return: the profile, which is updated as statements are issued
+    """
+    profile = QueryProfile(max_slowest=max_slowest)
+    token = _active_profiles.set(_active_profiles.get() + (profile,))
+    try:
+        yield profile
+    finally:
+        _active_profiles.reset(token)
+
+
+def log_query_profile(profile: QueryProfile, source: str, **extra) -> None:
+    """Logs a summary of a query profile.
+
+    :param profile: the profile to log
+    :param source: what issued the statements, eg. an endpoint or Celery task name
+    :param extra: any additional fields to include in the log line
+    """
+    current_app.logger.info(
+        "{source} issued {statement_count} SQL statements in {total_time:.3f}s",
+        extra=dict(source=source, **profile.to_dict(), **extra),
+    )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_profiles.get():
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if (profiles := _active_profiles.get()) and (start_times := conn.info.get("query_start_time")):
+        duration = time.perf_counter() - start_times.pop()
+        for profile in profiles:
+            profile.record(statement, duration)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    if exception_context.connection is not None and (
+        start_times := exception_context.connection.info.get("query_start_time")
+    ):
+        start_times.pop()
+
+
+class QueryProfiler:
+    def init_app(self, app: Flask):
+        if not app.config["ENABLE_QUERY_PROFILER"]:
+            return
+
+        @app.before_request
+        def start_query_profile() -> None:
+            g.query_profile_stack = ExitStack()
+            g.query_profile = g.query_profile_stack.enter_context(profile_queries(app.config["QUERY_PROFILER_SLOWEST"]))
+
+        @app.teardown_request
+        def log_request_query_profile(exc: BaseException | None) -> None:
+            if (profile_stack := g.pop("query_profile_stack", None)) is None:
+                return
+            profile_stack.close()
+            if g.query_profile.statement_count:
+                log_query_profile(g.query_profile, request.endpoint or request.path, method=request.method)
+
+
+query_profiler = QueryProfiler()
@@ -1,12 +1,36 @@
+import hashlib
 import time
 from functools import wraps
 from typing import Type
 
 from flask import current_app
+from sqlalchemy import func, select
 
 from data_store.db import db
 
 
+def advisory_lock_key(*key_parts: object) -> int:
+    """Derives a stable signed 64-bit Postgres advisory lock key from the given parts.
+
+    :param key_parts: values identifying the resource to lock, e.g. ("programme", "FHSF001")
+    :return: the lock key
+    """
+    key = "/".join(str(part) for part in key_parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big", signed=True)
+
+
+def acquire_advisory_xact_lock(*key_parts: object) -> None:
+    """Blocks until a transaction-scoped Postgres advisory lock on the given key is held.
+
+    The lock is released when the current transaction commits or rolls back, so concurrent transactions that need the
+    same key queue behind each other rather than conflicting. To avoid deadlocks, transactions that take more than one
+    lock must always take them in the same order.
+
+    :param key_parts: values identifying the resource to lock, e.g. ("programme", "FHSF001")
+    """
+    db.session.execute(select(func.pg_advisory_xact_lock(advisory_lock_key(*key_parts))))
+
+
 def transaction_retry_wrapper(max_retries: int, sleep_duration: float, error_type: Type[Exception]):
     """Execute a transaction with retries for a specified error type.
 
@@ -18,7 +42,7 @@ def transaction_retry_wrapper(max_retries: int, sleep_duration: float, error_typ
     :param max_retries: The maximum number of retries in case of an error.
     :param sleep_duration: The duration to sleep between retry attempts.
     :param error_type: The type of error to catch and retry.
-    :return: None
+    :return: the return value of the wrapped function
     """
 
     def decorator(func):
@@ -27,8 +51,7 @@ def transaction_retry_wrapper(max_retries: int, sleep_duration: float, error_typ
             for retry in range(1, max_retries + 1):
                 try:
                     with db.session.begin():
-                        func(*args, **kwargs)
-                    break
+                        return func(*args, **kwargs)
                 except error_type as transaction_error:
                     if retry < max_retries:
                         time.sleep(sleep_duration)
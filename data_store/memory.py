@@ -0,0 +1,69 @@
+"""Measures the memory used while running a block of code, eg. a Celery task."""
+
+import resource
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+PROC_SELF = Path("/proc/self")
+
+
+def reset_peak_rss() -> bool:
+    """Resets the process's peak RSS (high-water mark), so that it can be measured for a single task.
+
+    Only supported on Linux.
+
+    :return: whether the peak was reset
+    """
+    try:
+        (PROC_SELF / "clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def get_peak_rss() -> int:
+    """Gets the peak RSS of the process since it started or since `reset_peak_rss` was last called.
+
+    :return: the peak RSS in bytes
+    """
+    try:
+        for line in (PROC_SELF / "status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS, and is never reset
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@contextmanager
+def track_memory(top_allocations: int = 0) -> Iterator[dict]:
+    """Measures the peak RSS of the process while the block runs and, optionally, where memory was allocated.
+
+    tracemalloc slows down allocations considerably, so should only be turned on (with `top_allocations`) while
+    investigating memory use.
+
+    :param top_allocations: how many of the lines that allocated the most memory to report, or 0 to skip tracemalloc
+    :return: a dict that is populated with `peak_rss` (and `peak_rss_since_task_start`, False if the peak could not be
+        reset and so is the peak since the process started) and `top_allocations` when the block exits
+    """
+    memory: dict = {}
+    memory["peak_rss_since_task_start"] = reset_peak_rss()
+    trace = top_allocations > 0 and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    try:
+        yield memory
+    finally:
+        if trace:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            memory["top_allocations"] = [
+                {"location": str(stat.traceback), "size": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top_allocations]
+            ]
+        memory["peak_rss"] = get_peak_rss()
@@ -37,12 +37,11 @@ class Message:
         return hash(self.__key())
 
     def __lt__(self, other):
-        return (self.sheet, self.section, self.cell_indexes, self.description) < (
-            other.sheet,
-            other.section,
-            other.cell_indexes,
-            other.description,
-        )
+        return self.sort_key() < other.sort_key()
+
+    def sort_key(self) -> tuple:
+        """The key messages are ordered by, so that many messages can be sorted without comparing each pair of them"""
+        return self.sheet, self.section, self.cell_indexes, self.description
 
     def __getitem__(self, item):
         return getattr(self, item)
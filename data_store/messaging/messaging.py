@@ -4,27 +4,77 @@ from data_store.messaging.tf_messaging import TFMessenger
 from data_store.validation.towns_fund.failures.user import UserValidationFailure
 
 
+class MessageGrouper:
+    """Groups messages with the same sheet, section, description and error type into one message.
+
+    The cell indexes of each group are collected in a set as messages are added, and only sorted once, when the grouped
+    messages are built, rather than every time another message joins the group as `Message.combine` does.
+    """
+
+    def __init__(self):
+        self._groups: dict[tuple, tuple[Message, set[str] | None]] = {}
+
+    def add(self, message: Message) -> None:
+        """Adds a message to the group with its sheet, section, description and error type.
+
+        :param message: a message object
+        :raises ValueError: if the message joins a group and either it or the group doesn't reference any cells
+        """
+        key = (message.sheet, message.section, message.description, message.error_type)
+        group = self._groups.get(key)
+        if group is None:
+            cell_indexes = set(message.cell_indexes) if message.cell_indexes is not None else None
+            self._groups[key] = (message, cell_indexes)
+            return
+        _, cell_indexes = group
+        if cell_indexes is None or message.cell_indexes is None:
+            raise ValueError("Can only combine Message instances if both reference cell indexes")
+        cell_indexes.update(message.cell_indexes)
+
+    def messages(self) -> list[Message]:
+        """Builds a message for each group, in the order the groups were first added to.
+
+        :return: grouped messages, each with the sorted cell indexes of every message in its group
+        """
+        grouped_messages = []
+        for first_message, cell_indexes in self._groups.values():
+            if cell_indexes is None or (
+                first_message.cell_indexes is not None and len(cell_indexes) == len(first_message.cell_indexes)
+            ):
+                grouped_messages.append(first_message)
+            else:
+                grouped_messages.append(
+                    Message(
+                        sheet=first_message.sheet,
+                        section=first_message.section,
+                        cell_indexes=tuple(cell_indexes),
+                        description=first_message.description,
+                        error_type=first_message.error_type,
+                    )
+                )
+        return grouped_messages
+
+
 def group_validation_messages(validation_messages: list[Message]) -> list[Message]:
     """Groups validation messages by concatenating the cell indexes together on identical sheet, section description
 
     :param validation_messages: a list of message objects
     :return: grouped validation messages
     """
-    grouped_dict: dict = {}
+    grouper = MessageGrouper()
     for message in validation_messages:
-        key = (
-            message.sheet,
-            message.section,
-            message.description,
-            message.error_type,
-        )  # use sheet, section, description and error_type as the key
-        if key in grouped_dict:
-            grouped_dict[key].combine(message)  # combine cells with already existing message
-        else:
-            grouped_dict[key] = message
+        grouper.add(message)
+    return grouper.messages()
+
 
-    grouped_messages = list(grouped_dict.values())
-    return grouped_messages
+NULL_DESCRIPTIONS = frozenset(
+    {
+        msgs.BLANK,
+        msgs.BLANK_ZERO,
+        msgs.BLANK_PSI,
+        msgs.BLANK_UNIT_OF_MEASUREMENT,
+    }
+)
 
 
 def remove_errors_already_caught_by_null_failure(error_messages: list[Message]) -> list[Message]:
@@ -37,37 +87,22 @@ def remove_errors_already_caught_by_null_failure(error_messages: list[Message])
     :return: Filtered list of errors, including all null_failures and errors not present in null_failures or any part
     of the cell index is not already captured by a null failure.
     """
-
-    null_descriptions = [
-        msgs.BLANK,
-        msgs.BLANK_ZERO,
-        msgs.BLANK_PSI,
-        msgs.BLANK_UNIT_OF_MEASUREMENT,
-    ]
-
-    cells_covered_by_null_failures = []
-    for message in error_messages:
-        if message.description not in null_descriptions:
-            continue
-
-        if message.cell_indexes is None:
-            continue
-
-        for cell_index in message.cell_indexes:
-            cells_covered_by_null_failures.append((message.sheet, cell_index))
+    cells_covered_by_null_failures = {
+        (message.sheet, cell_index)
+        for message in error_messages
+        if message.description in NULL_DESCRIPTIONS and message.cell_indexes is not None
+        for cell_index in message.cell_indexes
+    }
 
     filtered_errors = []
     for message in error_messages:
         if message.cell_indexes is None:
             continue
 
-        is_covered_by_null_failure = False
-        for cell_index in message.cell_indexes:
-            if (message.sheet, cell_index) in cells_covered_by_null_failures:
-                is_covered_by_null_failure = True
-                break
-
-        if not is_covered_by_null_failure or message.description in null_descriptions:
+        is_covered_by_null_failure = any(
+            (message.sheet, cell_index) in cells_covered_by_null_failures for cell_index in message.cell_indexes
+        )
+        if not is_covered_by_null_failure or message.description in NULL_DESCRIPTIONS:
             filtered_errors.append(message)
 
     return filtered_errors
@@ -83,7 +118,7 @@ def failures_to_messages(validation_failures: list[UserValidationFailure], messe
     # filter and convert to error messages
     error_messages = [messenger.to_message(failure) for failure in validation_failures]
     # remove duplicates resulting from melted rows where we are unable to remove duplicates at time of validation
-    error_messages = sorted(list(set(error_messages)))
+    error_messages = sorted(set(error_messages), key=Message.sort_key)
     # filter out composite key errors that are already picked up by null failures
     error_messages = remove_errors_already_caught_by_null_failure(error_messages)
     # group cells by sheet, section and desc
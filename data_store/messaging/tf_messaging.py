@@ -1,4 +1,6 @@
 from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping
 
 import pandas as pd
 
@@ -34,6 +36,25 @@ class TFMessages(SharedMessages):
     )
 
 
+def _cell_index_segments(
+    table_and_column_to_column_letter: dict[str, dict[str, str]],
+) -> Mapping[tuple[str, str], tuple[str, ...]]:
+    """Splits each cell index template, such as "H{i} or K{i}", around its row number placeholder.
+
+    Joining the segments with a row number builds the same cell index as formatting the template with it.
+
+    :param table_and_column_to_column_letter: cell index templates for each column of each table
+    :return: read-only mapping of (table, column) to the template's segments
+    """
+    return MappingProxyType(
+        {
+            (table, column): tuple(template.split("{i}"))
+            for table, columns in table_and_column_to_column_letter.items()
+            for column, template in columns.items()
+        }
+    )
+
+
 class TFMessenger(MessengerBase):
     """Messaging class ABC. Classes that inherit must implement a constructor, and failures_to_message function"""
 
@@ -228,6 +249,25 @@ class TFMessenger(MessengerBase):
         3: "O{i}",
     }
 
+    # the templates above are looked up for every failure, so are precomputed once into read-only lookup tables that
+    # build a cell index by joining the column letters with the row number, without formatting a template
+    CELL_INDEX_SEGMENTS = _cell_index_segments(TABLE_AND_COLUMN_TO_ORIGINAL_COLUMN_LETTER)
+    NON_FOOTFALL_OUTCOME_COLUMN_BY_FINANCIAL_YEAR = MappingProxyType(
+        {
+            year: template.removesuffix("{i}")
+            for year, template in FINANCIAL_YEAR_TO_ORIGINAL_COLUMN_LETTER_FOR_NON_FOOTFALL_OUTCOMES.items()
+        }
+    )
+    FOOTFALL_OUTCOME_COLUMN_BY_MONTH = MappingProxyType(
+        {
+            month: template.removesuffix("{i}")
+            for month, template in MONTH_TO_ORIGINAL_COLUMN_LETTER_FOR_FOOTFALL_OUTCOMES.items()
+        }
+    )
+
+    # composite key columns that do not translate to the spreadsheet
+    COLUMNS_NOT_IN_SPREADSHEET = frozenset({"Project ID", "Programme ID", "Start_Date", "End_Date", "Actual/Forecast"})
+
     msgs = TFMessages()
 
     def to_message(self, validation_failure: UserValidationFailure) -> Message:
@@ -282,14 +322,7 @@ class TFMessenger(MessengerBase):
                 table=validation_failure.table, column=column, row_index=validation_failure.row_index
             )
             for column in validation_failure.column
-            if column
-            not in [
-                "Project ID",
-                "Programme ID",
-                "Start_Date",
-                "End_Date",
-                "Actual/Forecast",
-            ]  # these columns do not translate to the spreadsheet
+            if column not in self.COLUMNS_NOT_IN_SPREADSHEET
         )
 
         return Message(sheet, section, cell_indexes, message, validation_failure.__class__.__name__)
@@ -462,8 +495,7 @@ class TFMessenger(MessengerBase):
         :param row_index: a row index where the error occurred
         :return: indexes tuple of constructed letter and number indexes
         """
-        column_letter = self.TABLE_AND_COLUMN_TO_ORIGINAL_COLUMN_LETTER[table][column]
-        return column_letter.format(i=row_index or "")
+        return str(row_index or "").join(self.CELL_INDEX_SEGMENTS[table, column])
 
     def _get_section_for_outcomes_by_row_index(self, index: int) -> str:
         return "Outcomes Indicators (excluding footfall)" if index < 60 else "Footfall Indicator"
@@ -494,15 +526,8 @@ class TFMessenger(MessengerBase):
         # footfall outcomes starts from row 60
         if self._get_section_for_outcomes_by_row_index(index) == "Footfall Indicator":
             # row for 'Amount' column is end number of start year of financial year * 5 + 'Footfall Indicator' index
-            row_index_gap = int(str(financial_year)[-1]) * 5
-            index = int(index) + row_index_gap
-            cell_index = self.MONTH_TO_ORIGINAL_COLUMN_LETTER_FOR_FOOTFALL_OUTCOMES[start_date.month].format(i=index)
-        else:
-            cell_index = self.FINANCIAL_YEAR_TO_ORIGINAL_COLUMN_LETTER_FOR_NON_FOOTFALL_OUTCOMES[financial_year].format(
-                i=index
-            )
-
-        return cell_index
+            return f"{self.FOOTFALL_OUTCOME_COLUMN_BY_MONTH[start_date.month]}{index + financial_year % 10 * 5}"
+        return f"{self.NON_FOOTFALL_OUTCOME_COLUMN_BY_FINANCIAL_YEAR[financial_year]}{index}"
 
     @staticmethod
     def _risk_register_section(project_id: None | str, row_index: int, table: str):
@@ -1,9 +1,13 @@
+import contextlib
 import enum
 import functools
+import time
 from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator
 
 import sentry_sdk.metrics
-from flask import g
+from flask import current_app, g
 from werkzeug.datastructures import FileStorage
 
 
@@ -18,6 +22,17 @@ class FundingMetrics(enum.StrEnum):
     SUBMISSION_INGEST_RESULT = "submission-ingest-result"
     SUBMISSION_VALIDATION_ERRORS = "submission-validation-errors"
     SUBMISSION_VALIDATION_ERRORS_TOTAL = "submission-validation-errors-total"
+    SUBMISSION_INGEST_STAGE_DURATION = "submission-ingest-stage-duration"
+    SUBMISSION_INGEST_STAGE_ROWS = "submission-ingest-stage-rows"
+
+
+@dataclass
+class IngestStage:
+    """The time taken by, and number of rows handled by, one stage of an ingest."""
+
+    name: str
+    duration: float = 0.0
+    rows: int | None = None
 
 
 class MetricsReporter:
@@ -79,16 +94,48 @@ class MetricsReporter:
                 },
             )
 
+    def track_report_submission_ingest_stages(self, fund: str, reporting_round: int, stages: list[IngestStage]):
+        for stage in stages:
+            tags: dict[str, str | int | float | None] = {
+                "fund": fund,
+                "reporting_round": reporting_round,
+                "stage": stage.name,
+            }
+            sentry_sdk.metrics.distribution(
+                FundingMetrics.SUBMISSION_INGEST_STAGE_DURATION, stage.duration, unit="second", tags=tags
+            )
+            if stage.rows is not None:
+                sentry_sdk.metrics.distribution(FundingMetrics.SUBMISSION_INGEST_STAGE_ROWS, stage.rows, tags=tags)
+
 
 metrics_reporter = MetricsReporter()
 
 
+@contextlib.contextmanager
+def ingest_stage(name: str) -> Iterator[IngestStage]:
+    """Times a stage of an ingest, recording it against the current request for `capture_ingest_metrics` to report.
+
+    The number of rows the stage handled can be set on the yielded `IngestStage`. A stage is recorded even if it raises,
+    and is recorded each time it runs, eg. when `populate_db` retries a transaction.
+
+    :param name: the name of the stage, eg. "transform" or "load:Project Details"
+    :return: the stage being timed
+    """
+    stage = IngestStage(name)
+    start = time.perf_counter()
+    try:
+        yield stage
+    finally:
+        stage.duration = time.perf_counter() - start
+        g.setdefault("ingest_stages", []).append(stage)
+
+
 def capture_ingest_metrics(view_func):
     """Decorator for the `core.controllers.ingest` function below to track the outcome of a spreadsheet ingest.
 
     Reports on whether the submission succeeded, raised validation errors, or had some other kind of (probably internal)
     server error. Tracks the number of validation errors raised, if any, and splits to track each kind of validation
-    error too.
+    error too, along with the time taken and rows handled by each stage of the ingest timed with `ingest_stage`.
 
     There's a risk of this being too many dimensions for Sentry when we're mega-multi-fund and have lots of reporting
     rounds, but that'll be a nice problem to have. If it happens we'll have to deal with it.
@@ -104,11 +151,14 @@ def capture_ingest_metrics(view_func):
         submitting_account_id: str | None = None,
         submitting_user_email: str | None = None,
         auth: dict[str, tuple[str, ...]] | None = None,
+        differential_load: bool = False,
+        max_validation_errors: int | None = None,
     ):
         # `ingest` function should set correct values of these three dimensions as part of processing
         g.fund_name = "unknown"
         g.reporting_round = -1
         g.organisation_name = "unknown"
+        g.ingest_stages = []
 
         retval: tuple[dict, int] = view_func(
             excel_file=excel_file,
@@ -118,6 +168,8 @@ def capture_ingest_metrics(view_func):
             submitting_account_id=submitting_account_id,
             submitting_user_email=submitting_user_email,
             auth=auth,
+            differential_load=differential_load,
+            max_validation_errors=max_validation_errors,
         )
 
         try:
@@ -153,6 +205,22 @@ def capture_ingest_metrics(view_func):
                 organisation_name=g.organisation_name,
                 validation_error_counts=error_counts,
             )
+            metrics_reporter.track_report_submission_ingest_stages(
+                fund=g.fund_name, reporting_round=g.reporting_round, stages=g.ingest_stages
+            )
+            current_app.logger.info(
+                "Ingest stages for {fund} round {reporting_round} took {total_time:.3f}s",
+                extra=dict(
+                    fund=g.fund_name,
+                    reporting_round=g.reporting_round,
+                    organisation=g.organisation_name,
+                    total_time=sum(stage.duration for stage in g.ingest_stages),
+                    stages=[
+                        {"stage": stage.name, "duration": round(stage.duration, 4), "rows": stage.rows}
+                        for stage in g.ingest_stages
+                    ],
+                ),
+            )
         except Exception:  # noqa
             # If some error happens logging sentry metrics, let's not die - we still want to respond to the request.
             pass
@@ -0,0 +1,236 @@
+"""A low-overhead sampling profiler for a fraction of requests and Celery tasks.
+
+When `SAMPLING_PROFILER_RATE` is N (> 0), 1 in N Flask requests and `FSDTask` runs are profiled by sampling the stack of
+the thread handling them every `SAMPLING_PROFILER_INTERVAL` seconds. Each profile is saved in the collapsed-stack format
+(one `frame;frame;frame count` line per distinct stack), which can be opened in https://www.speedscope.app or turned
+into a flamegraph with `flamegraph.pl`.
+
+Profiles are written to `AWS_S3_BUCKET_PROFILES` if it is set, or to the local `SAMPLING_PROFILER_DIR` otherwise, and
+only the most recent `SAMPLING_PROFILER_RETENTION` are kept. They are listed in the admin app under "Profiles".
+"""
+
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator
+
+from flask import Flask, current_app, g, request
+
+from data_store.aws import get_s3_client
+
+S3_PROFILE_PREFIX = "profiles/"
+PROFILE_SUFFIX = ".collapsed"
+PROFILE_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+# eg. "20240101T120000000000_1234ms_find.download.collapsed"
+PROFILE_NAME_PATTERN = re.compile(r"^(?P<timestamp>\d{8}T\d{12})_(?P<duration>\d+)ms_(?P<source>.+)\.collapsed$")
+
+
+@dataclass
+class StoredProfile:
+    name: str
+    created_at: datetime
+    duration: float
+    source: str
+
+
+class StackSampler:
+    """Periodically samples the stack of one thread from a background thread, counting each distinct stack."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if (frame := sys._current_frames().get(self.thread_id)) is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+
+def to_collapsed(stacks: Counter[str]) -> bytes:
+    """Formats sampled stacks in the collapsed-stack format.
+
+    :param stacks: the number of times each stack was sampled
+    :return: the collapsed stacks, one per line
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()).encode()
+
+
+def profile_name(created_at: datetime, duration: float, source: str) -> str:
+    safe_source = re.sub(r"[^\w.-]", "-", source)
+    return f"{created_at.strftime(PROFILE_TIMESTAMP_FORMAT)}_{round(duration * 1000)}ms_{safe_source}{PROFILE_SUFFIX}"
+
+
+def parse_profile_name(name: str) -> StoredProfile | None:
+    if not (match := PROFILE_NAME_PATTERN.match(name)):
+        return None
+    return StoredProfile(
+        name=name,
+        created_at=datetime.strptime(match["timestamp"], PROFILE_TIMESTAMP_FORMAT),
+        duration=int(match["duration"]) / 1000,
+        source=match["source"],
+    )
+
+
+class ProfileStore:
+    """Saves, lists and retrieves profiles, from S3 if a bucket is configured or a local directory otherwise."""
+
+    def __init__(self, bucket: str | None, directory: str | Path, retention: int):
+        """
+        :param bucket: the S3 bucket to store profiles in, or None to store them in `directory`
+        :param directory: the local directory to store profiles in if there is no bucket
+        :param retention: the number of most recent profiles to keep
+        :raises ValueError: if retention is less than 1
+        """
+        if retention < 1:
+            raise ValueError(f"SAMPLING_PROFILER_RETENTION must be at least 1, got {retention}")
+        self.bucket = bucket
+        self.directory = Path(directory)
+        self.retention = retention
+
+    @classmethod
+    def from_config(cls, config) -> "ProfileStore":
+        return cls(
+            bucket=config.get("AWS_S3_BUCKET_PROFILES"),
+            directory=config["SAMPLING_PROFILER_DIR"],
+            retention=config["SAMPLING_PROFILER_RETENTION"],
+        )
+
+    def save(self, name: str, content: bytes) -> None:
+        """Saves a profile, then deletes the oldest profiles beyond the retention limit.
+
+        :param name: the name of the profile, from `profile_name`
+        :param content: the collapsed stacks
+        """
+        if self.bucket:
+            get_s3_client().upload_fileobj(
+                BytesIO(content), self.bucket, S3_PROFILE_PREFIX + name, ExtraArgs={"ContentType": "text/plain"}
+            )
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / name).write_bytes(content)
+
+        # profile names start with a timestamp, so sort oldest first
+        for expired in sorted(self._names())[: -self.retention]:
+            self._delete(expired)
+
+    def list_profiles(self) -> list[StoredProfile]:
+        """Lists the stored profiles, most recent first.
+
+        :return: the stored profiles
+        """
+        profiles = (parse_profile_name(name) for name in self._names())
+        return sorted((profile for profile in profiles if profile), key=lambda p: p.created_at, reverse=True)
+
+    def get_profile(self, name: str) -> bytes:
+        """Retrieves a stored profile.
+
+        :param name: the name of the profile
+        :return: the collapsed stacks
+        :raises FileNotFoundError: if there is no profile with that name
+        """
+        if parse_profile_name(name) is None or name not in self._names():
+            raise FileNotFoundError(f"Could not find profile {name}")
+        if self.bucket:
+            return get_s3_client().get_object(Bucket=self.bucket, Key=S3_PROFILE_PREFIX + name)["Body"].read()
+        return (self.directory / name).read_bytes()
+
+    def _names(self) -> list[str]:
+        if self.bucket:
+            paginator = get_s3_client().get_paginator("list_objects_v2")
+            return [
+                obj["Key"].removeprefix(S3_PROFILE_PREFIX)
+                for page in paginator.paginate(Bucket=self.bucket, Prefix=S3_PROFILE_PREFIX)
+                for obj in page.get("Contents", [])
+            ]
+        if not self.directory.is_dir():
+            return []
+        return [path.name for path in self.directory.glob(f"*{PROFILE_SUFFIX}")]
+
+    def _delete(self, name: str) -> None:
+        if self.bucket:
+            get_s3_client().delete_object(Bucket=self.bucket, Key=S3_PROFILE_PREFIX + name)
+        else:
+            (self.directory / name).unlink(missing_ok=True)
+
+
+def should_sample(rate: int) -> bool:
+    """Decides whether to profile a request or task.
+
+    :param rate: profile 1 in this many, or none if 0
+    :return: whether to profile
+    """
+    return rate > 0 and random.randrange(rate) == 0
+
+
+@contextmanager
+def sample_profile(source: str) -> Iterator[None]:
+    """Profiles the current thread for the duration of the block and saves the profile.
+
+    Failing to save the profile is logged rather than raised, so never affects the request or task being profiled.
+
+    :param source: what is being profiled, eg. an endpoint or Celery task name
+    """
+    sampler = StackSampler(threading.get_ident(), current_app.config["SAMPLING_PROFILER_INTERVAL"])
+    created_at = datetime.now()
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        yield
+    finally:
+        stacks = sampler.stop()
+        duration = time.perf_counter() - start
+        try:
+            ProfileStore.from_config(current_app.config).save(
+                profile_name(created_at, duration, source), to_collapsed(stacks)
+            )
+        except Exception as e:
+            current_app.logger.warning(
+                "Failed to save profile of {source}: {error}", extra=dict(source=source, error=e)
+            )
+
+
+class SamplingProfiler:
+    def init_app(self, app: Flask):
+        if app.config["SAMPLING_PROFILER_RATE"] <= 0:
+            return
+        # fail at startup, rather than on every save, if the store is misconfigured
+        ProfileStore.from_config(app.config)
+
+        @app.before_request
+        def start_sampling_profile() -> None:
+            if should_sample(app.config["SAMPLING_PROFILER_RATE"]):
+                g.sampling_profile_stack = ExitStack()
+                g.sampling_profile_stack.enter_context(sample_profile(request.endpoint or request.path))
+
+        @app.teardown_request
+        def save_sampling_profile(exc: BaseException | None) -> None:
+            if (profile_stack := g.pop("sampling_profile_stack", None)) is not None:
+                profile_stack.close()
+
+
+sampling_profiler = SamplingProfiler()
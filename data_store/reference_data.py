@@ -1,11 +1,75 @@
+import uuid
+from collections import defaultdict
 from pathlib import Path
+from typing import Iterable
 
 import pandas as pd
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
 
 from data_store.controllers.mappings import DataMapping
 from data_store.db import db
 from data_store.db.entities import Fund, GeospatialDim, ReportingRound
 
+# Process-local caches of reference data, used during ingest to avoid querying tables that rarely change.
+# Only values known to be committed to the database are cached, so a rolled back ingest cannot leave stale entries
+# behind. They must be cleared whenever reference data is removed, e.g. when the database is reset.
+KNOWN_OUTPUT_OUTCOME_NAMES: dict[str, set[str]] = {"Outputs_Ref": set(), "Outcome_Ref": set()}
+GEOSPATIAL_IDS_BY_PREFIX: dict[str, uuid.UUID] = {}
+
+# the session.info key of output and outcome names waiting for their transaction to commit before they are cached
+_PENDING_OUTPUT_OUTCOME_NAMES = "pending_known_output_outcome_names"
+
+
+def clear_reference_data_caches() -> None:
+    """Clears the process-local reference data caches, forcing them to be re-populated from the database."""
+    for names in KNOWN_OUTPUT_OUTCOME_NAMES.values():
+        names.clear()
+    GEOSPATIAL_IDS_BY_PREFIX.clear()
+
+
+def add_known_output_outcome_names(table: str, names: Iterable[str]) -> None:
+    """Adds output or outcome names to the cache of known names once the current transaction commits.
+
+    The names are discarded if the transaction is rolled back instead, so that names which only exist in an
+    uncommitted transaction are never cached.
+
+    :param table: the reference table the names are in, "Outputs_Ref" or "Outcome_Ref"
+    :param names: names that exist in the database as seen by the current transaction
+    """
+    db.session.info.setdefault(_PENDING_OUTPUT_OUTCOME_NAMES, defaultdict(set))[table].update(names)
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed_output_outcome_names(session: Session) -> None:
+    # releasing a savepoint doesn't commit the names, the enclosing transaction may still be rolled back
+    if session.in_nested_transaction():
+        return
+    for table, names in session.info.pop(_PENDING_OUTPUT_OUTCOME_NAMES, {}).items():
+        KNOWN_OUTPUT_OUTCOME_NAMES[table].update(names)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_uncommitted_output_outcome_names(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_OUTPUT_OUTCOME_NAMES, None)
+
+
+def get_geospatial_ids_by_prefix(refresh: bool = False) -> dict[str, uuid.UUID]:
+    """Returns an index of geospatial_dim IDs keyed by postcode prefix, loading it from the database on first use.
+
+    The geospatial_dim table is small and only changes via migrations or `seed_geospatial_dim_table`, so it is held in
+    memory for the lifetime of the process. Migrations run before new processes are started on deploy; callers that
+    find a prefix missing from the index should refresh it once before treating the prefix as unknown.
+
+    :param refresh: reload the index from the database
+    :return: a mapping of postcode prefix to geospatial_dim ID
+    """
+    if refresh or not GEOSPATIAL_IDS_BY_PREFIX:
+        rows = db.session.execute(select(GeospatialDim.postcode_prefix, GeospatialDim.id)).all()
+        GEOSPATIAL_IDS_BY_PREFIX.clear()
+        GEOSPATIAL_IDS_BY_PREFIX.update({postcode_prefix: geospatial_id for postcode_prefix, geospatial_id in rows})
+    return GEOSPATIAL_IDS_BY_PREFIX
+
 
 def seed_geospatial_dim_table():
     """
@@ -55,6 +119,7 @@ def seed_geospatial_dim_table():
                 db.session.add(geospatial_record)
 
     db.session.commit()
+    GEOSPATIAL_IDS_BY_PREFIX.clear()
 
 
 def seed_fund_table():
@@ -117,9 +117,9 @@ def serialise_download_data(
     Query and serialise data from multiple tables for download, each yielded individually.
 
     Extend base query to return relevant fields for each table, and serialise accordingly. Calls individual
-    query methods and Marshmallow schema serialisers for each table, based on method names in table_queries dict.
+    query methods and Marshmallow schema serialisers for each table, based on method names in TABLE_QUERIES.
 
-    Each extended query and its corresponding schema should be added to the table_queries object in order to be
+    Each extended query and its corresponding schema should be added to TABLE_QUERIES in order to be
     serialised. Each additional query uses the base_query parameter as a starting point.
 
     :param base_query: An SQLAlchemy Query of core tables with filters applied.
@@ -128,32 +128,11 @@ def serialise_download_data(
     :yield: A tuple containing table name and serialised data.
     """
 
-    table_queries: dict[str, Any] = {
-        "PlaceDetails": (place_detail_query, PlaceDetailSchema),
-        "ProjectDetails": (project_query, ProjectSchema),
-        "OrganisationRef": (organisation_query, OrganisationSchema),
-        "ProgrammeRef": (programme_query, ProgrammeSchema),
-        "ProgrammeProgress": (programme_progress_query, ProgrammeProgressSchema),
-        "ProjectProgress": (project_progress_query, ProjectProgressSchema),
-        "FundingQuestions": (funding_question_query, FundingQuestionSchema),
-        "Funding": (funding_query, FundingSchema),
-        "FundingComments": (funding_comment_query, FundingCommentSchema),
-        "PrivateInvestments": (private_investment_query, PrivateInvestmentSchema),
-        "OutputRef": (output_dim_query, OutputDimSchema),
-        "OutputData": (output_data_query, OutputDataSchema),
-        "OutcomeRef": (outcome_dim_query, OutcomeDimSchema),
-        "OutcomeData": (outcome_data_query, OutcomeDataSchema),
-        "RiskRegister": (risk_register_query, RiskRegisterSchema),
-        "ProjectFinanceChange": (project_finance_change_query, ProjectFinanceChangeSchema),
-        "ProgrammeManagementFunding": (programme_funding_management_query, ProgrammeFundingManagementSchema),
-        "SubmissionRef": (submission_metadata_query, SubmissionSchema),
-    }
-
-    sheets_required = sheets_required if sheets_required else list(table_queries.keys())
+    sheets_required = sheets_required if sheets_required else DOWNLOAD_SHEETS
 
     query_extender: Callable
     for sheet in sheets_required:
-        query_extender, schema = table_queries[sheet]
+        query_extender, schema = TABLE_QUERIES[sheet]
 
         # NOTE: We intentionally increase and then decrease this value on a per sheet basis
         #       rather than doing this at the beginning of the function and then RESETing at
@@ -530,3 +509,28 @@ class SubmissionSchema(SQLAlchemySchema):
     )
     reporting_round = auto_field("round_number", model=ReportingRound, data_key="ReportingRound")
     submission_date = auto_field(data_key="SubmissionDate", field_class=Raw)
+
+
+# the query and schema of each download sheet, in the order they appear in a download
+TABLE_QUERIES: dict[str, Any] = {
+    "PlaceDetails": (place_detail_query, PlaceDetailSchema),
+    "ProjectDetails": (project_query, ProjectSchema),
+    "OrganisationRef": (organisation_query, OrganisationSchema),
+    "ProgrammeRef": (programme_query, ProgrammeSchema),
+    "ProgrammeProgress": (programme_progress_query, ProgrammeProgressSchema),
+    "ProjectProgress": (project_progress_query, ProjectProgressSchema),
+    "FundingQuestions": (funding_question_query, FundingQuestionSchema),
+    "Funding": (funding_query, FundingSchema),
+    "FundingComments": (funding_comment_query, FundingCommentSchema),
+    "PrivateInvestments": (private_investment_query, PrivateInvestmentSchema),
+    "OutputRef": (output_dim_query, OutputDimSchema),
+    "OutputData": (output_data_query, OutputDataSchema),
+    "OutcomeRef": (outcome_dim_query, OutcomeDimSchema),
+    "OutcomeData": (outcome_data_query, OutcomeDataSchema),
+    "RiskRegister": (risk_register_query, RiskRegisterSchema),
+    "ProjectFinanceChange": (project_finance_change_query, ProjectFinanceChangeSchema),
+    "ProgrammeManagementFunding": (programme_funding_management_query, ProgrammeFundingManagementSchema),
+    "SubmissionRef": (submission_metadata_query, SubmissionSchema),
+}
+
+DOWNLOAD_SHEETS = list(TABLE_QUERIES)
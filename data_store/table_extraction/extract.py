@@ -8,6 +8,9 @@ from data_store.table_extraction.config.common import ExtractConfig
 from data_store.table_extraction.exceptions import TableExtractionError
 from data_store.table_extraction.table import Cell, Table
 
+# the positions of the start and end tags of each table, by worksheet name and ID tag
+TableLayout = dict[tuple[str, str], list[tuple[Cell, Cell]]]
+
 
 class TableExtractor:
     """
@@ -22,6 +25,9 @@ class TableExtractor:
         END_TAG (str): The end tag format for identifying tables.
         workbook (dict[str, pd.DataFrame]): A dictionary containing worksheet names as keys
             and corresponding pandas DataFrames as values.
+        known_layout (TableLayout): Tag positions found in another workbook made from the same template. The tags
+            are checked at these positions first, and the worksheet is only searched if they aren't there.
+        layout (TableLayout): The tag positions of every table extracted so far.
 
     Methods:
         from_csv(cls, path: Path, worksheet_name: str) -> "TableExtractor":
@@ -42,9 +48,13 @@ class TableExtractor:
     START_TAG = "{id}-START"
     END_TAG = "{id}-END"
     workbook: dict[str, pd.DataFrame]
+    known_layout: TableLayout
+    layout: TableLayout
 
-    def __init__(self, workbook: dict[str, pd.DataFrame]) -> None:
+    def __init__(self, workbook: dict[str, pd.DataFrame], known_layout: TableLayout | None = None) -> None:
         self.workbook = workbook
+        self.known_layout = known_layout or {}
+        self.layout = {}
 
     @classmethod
     def from_csv(cls, path: Path, worksheet_name: str) -> "TableExtractor":
@@ -61,8 +71,12 @@ class TableExtractor:
         :return: a set of Table objects
         """
         worksheet = self.workbook[extract_config.worksheet_name]
-        end_tags, start_tags = self._get_tags(extract_config.id_tag, worksheet)
-        paired_tags = self._pair_tags(start_tags, end_tags, file_width=len(worksheet.columns))
+        layout_key = (extract_config.worksheet_name, extract_config.id_tag)
+        paired_tags = self.known_layout.get(layout_key)
+        if paired_tags is None or not self._tags_match(extract_config.id_tag, worksheet, paired_tags):
+            end_tags, start_tags = self._get_tags(extract_config.id_tag, worksheet)
+            paired_tags = self._pair_tags(start_tags, end_tags, file_width=len(worksheet.columns))
+        self.layout[layout_key] = paired_tags
         dfs = self._extract_dfs(worksheet, paired_tags)
         tables = [
             Table(df=df, start_tag=start_tag, id_tag=extract_config.id_tag)
@@ -83,6 +97,23 @@ class TableExtractor:
             raise TableExtractionError(f"Not all {id_tag} tags have a matching start or end tag.")
         return end_tags, start_tags
 
+    def _tags_match(self, id_tag: str, worksheet: pd.DataFrame, tag_pairs: list[tuple[Cell, Cell]]) -> bool:
+        """Checks that the start and end tags of a table are in the given positions, without searching the worksheet.
+
+        :param id_tag: the table's ID tag
+        :param worksheet: worksheet the table is in
+        :param tag_pairs: the expected positions of each pair of start and end tags
+        :return: whether every tag is where it is expected to be
+        """
+        start_tag = self.START_TAG.format(id=id_tag)
+        end_tag = self.END_TAG.format(id=id_tag)
+        num_rows, num_cols = worksheet.shape
+
+        def tag_at(cell: Cell, tag: str) -> bool:
+            return cell.row < num_rows and cell.column < num_cols and worksheet.iat[cell.row, cell.column] == tag
+
+        return all(tag_at(start, start_tag) and tag_at(end, end_tag) for start, end in tag_pairs)
+
     @staticmethod
     def _pair_tags(start_tags: list[Cell], end_tags: list[Cell], file_width: int) -> list[tuple[Cell, Cell]]:
         """Pairs start and end tags together.
@@ -1,3 +1,5 @@
+from functools import cache
+
 import pandas as pd
 
 
@@ -28,6 +30,7 @@ class Cell:
         return f"{col_letters}{row_idx}"
 
     @staticmethod
+    @cache
     def _column_index_to_letters(col_idx: int) -> str:
         """Converts an integer column index (0-indexed) to Excel-like column letters.
 
@@ -77,3 +80,19 @@ class Table:
         """
         col_idx = self.col_idx_map[col_name]
         return Cell(row=row_idx, column=self.first_col_idx + col_idx)
+
+    def get_cells(self, row_idxs: pd.Series, col_names: pd.Series) -> list[Cell | None]:
+        """
+        Creates a Cell object for each pair of row index and column name, as `get_cell` does, mapping the column names
+        to column indexes for all the pairs at once.
+
+        :param row_idxs: The row indexes of the cells in the global scope.
+        :param col_names: The column names of the cells in the table scope.
+        :return: A Cell for each pair, or None where the row index or column name is missing.
+        """
+        col_idxs = col_names.map(self.col_idx_map) + self.first_col_idx
+        has_cell = row_idxs.notna().to_numpy() & col_idxs.notna().to_numpy()
+        return [
+            Cell(row=int(row_idx), column=int(col_idx)) if present else None
+            for row_idx, col_idx, present in zip(row_idxs, col_idxs, has_cell, strict=True)
+        ]
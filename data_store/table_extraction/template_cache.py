@@ -0,0 +1,133 @@
+"""Caches the parts of a Pathfinders ingest that only depend on the template, rather than on what the LA entered.
+
+Every workbook made from the same template carries the same control tables (the tables with a `PF-CONTROL_` ID tag,
+listing every programme, project, output and outcome), so processing and validating them, and building lookups from
+them, gives the same result on every ingest. These are cached in the process, keyed on a fingerprint of the control
+tables' extracted cells, so that only the tables entered by the LA are processed for each submission. The positions of
+the LA's tables are also the same in every workbook made from a template, so they are cached too and checked before
+searching the worksheets for the tables' tags. A workbook whose control tables have been altered has a different
+fingerprint, so is processed in full.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+import pandas as pd
+
+from config import Config
+from data_store.table_extraction.config.common import TableConfig
+
+CONTROL_TABLE_ID_TAG_PREFIX = "PF-CONTROL_"
+
+T = TypeVar("T")
+
+
+class LRUCache:
+    """A thread-safe cache that holds up to `maxsize` items, evicting the least recently used."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# processed and validated control tables, by template fingerprint
+control_tables_cache = LRUCache(Config.PF_TEMPLATE_CACHE_SIZE)
+# the positions of the tables that aren't control tables, by template fingerprint
+template_layouts_cache = LRUCache(Config.PF_TEMPLATE_CACHE_SIZE)
+# lookups built from control tables, by builder and control table fingerprint
+control_lookups_cache = LRUCache(Config.PF_TEMPLATE_CACHE_SIZE * 16)
+
+
+def is_control_table(config: TableConfig) -> bool:
+    return config.extract.id_tag.startswith(CONTROL_TABLE_ID_TAG_PREFIX)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hashes the contents of a DataFrame, including its index and column names.
+
+    The index is included because it holds the worksheet rows the table was extracted from, which are used to
+    reference cells in validation messages.
+
+    :param df: a DataFrame
+    :return: a hex digest that is the same for any DataFrame with the same contents
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((df.shape, list(df.columns))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def template_fingerprint(control_dfs: dict[str, pd.DataFrame], tables_config: dict[str, TableConfig]) -> str | None:
+    """Fingerprints a workbook's template from its extracted, unprocessed, control tables.
+
+    The tables' configs are included so that a change to how they are processed or validated isn't served from the
+    cache.
+
+    :param control_dfs: the extracted control tables, by table name
+    :param tables_config: the config of each table, by table name
+    :return: a hex digest, or None if there are no control tables
+    """
+    if not control_dfs:
+        return None
+    digest = hashlib.sha256()
+    for table_name in sorted(control_dfs):
+        digest.update(table_name.encode())
+        digest.update(repr(tables_config[table_name]).encode())
+        digest.update(frame_fingerprint(control_dfs[table_name]).encode())
+    return digest.hexdigest()
+
+
+def control_lookup(control_df: pd.DataFrame | dict[str, pd.DataFrame], build: Callable[..., T], *args: Hashable) -> T:
+    """Builds a lookup from a control table, or returns the one already built from a table with the same contents.
+
+    A lookup built from several control tables is passed them as a dictionary, and is only reused if every table has
+    the same contents. The same lookup is returned to every caller, so it must not be mutated.
+
+    :param control_df: the processed control table, or a dictionary of them by table name
+    :param build: a module-level function that builds the lookup from `control_df` and `args`
+    :param args: any further arguments to `build`
+    :return: the lookup
+    """
+    fingerprint: Hashable
+    if isinstance(control_df, dict):
+        fingerprint = tuple((name, frame_fingerprint(df)) for name, df in sorted(control_df.items()))
+    else:
+        fingerprint = frame_fingerprint(control_df)
+    key = (build.__module__, build.__qualname__, args, fingerprint)
+    lookup = control_lookups_cache.get(key)
+    if lookup is None:
+        lookup = build(control_df, *args)
+        control_lookups_cache.set(key, lookup)
+    return lookup
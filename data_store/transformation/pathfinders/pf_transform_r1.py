@@ -6,7 +6,13 @@ import pandas as pd
 from data_store.const import (
     FundTypeIdEnum,
 )
-from data_store.transformation.utils import create_dataframe, extract_postcodes
+from data_store.table_extraction.template_cache import control_lookup
+from data_store.transformation.utils import (
+    create_dataframe,
+    extract_postcodes,
+    map_programme_names_to_ids,
+    map_project_names_to_ids,
+)
 
 FAS_REPORTING_PERIOD_HEADERS_TO_DATES = {
     "Financial year 2023 to 2024, (Jan to Mar)": {
@@ -105,10 +111,8 @@ def transform(df_dict: dict[str, pd.DataFrame], reporting_round: int) -> dict[st
     :return: Dictionary of DataFrames representing transformed data
     """
     project_details_df = df_dict["Project details control"]
-    programme_name_to_id_mapping = {
-        row["Local Authority"]: row["Reference"][:6] for _, row in project_details_df.iterrows()
-    }
-    project_name_to_id_mapping = {row["Full name"]: row["Reference"] for _, row in project_details_df.iterrows()}
+    programme_name_to_id_mapping = control_lookup(project_details_df, map_programme_names_to_ids)
+    project_name_to_id_mapping = control_lookup(project_details_df, map_project_names_to_ids)
     transformed: dict[str, pd.DataFrame] = {}
     transformed["Submission_Ref"] = _submission_ref(df_dict)
     transformed["Place Details"] = _place_details(df_dict, programme_name_to_id_mapping)
@@ -178,3 +178,21 @@ def create_dataframe(data: dict[str, pd.Series | list | tuple]) -> pd.DataFrame:
             for column, val in data.items()
         }
     )
+
+
+def map_programme_names_to_ids(project_details_df: pd.DataFrame) -> dict[str, str]:
+    """Maps each programme (local authority) in the Pathfinders project details control table to its programme ID.
+
+    :param project_details_df: the "Project details control" table
+    :return: dictionary of programme names to programme IDs
+    """
+    return dict(zip(project_details_df["Local Authority"], project_details_df["Reference"].str[:6], strict=False))
+
+
+def map_project_names_to_ids(project_details_df: pd.DataFrame) -> dict[str, str]:
+    """Maps each project in the Pathfinders project details control table to its project ID.
+
+    :param project_details_df: the "Project details control" table
+    :return: dictionary of project names to project IDs
+    """
+    return dict(zip(project_details_df["Full name"], project_details_df["Reference"], strict=False))
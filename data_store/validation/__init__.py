@@ -3,6 +3,7 @@ from typing import Callable
 import pandas as pd
 
 from data_store.exceptions import OldValidationError
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.towns_fund.failures.user import GenericFailure
 from data_store.validation.towns_fund.schema_validation.casting import cast_to_schema
 from data_store.validation.towns_fund.schema_validation.validate import validate_data
@@ -16,6 +17,7 @@ def tf_validate(
         Callable[[dict[str, pd.DataFrame], dict[str, pd.DataFrame], int], list[GenericFailure]] | None
     ),
     reporting_round: int,
+    budget: ValidationBudget | None = None,
 ):
     """Validate a workbook against its round specific schema.
 
@@ -24,14 +26,16 @@ def tf_validate(
     :param validation_schema: A schema that defines which validations to run.
     :param fund_specific_validation: A function that takes a transformed workbook and an original workbook and runs some
         fund specific validation checks.
+    :param budget: the number of failures to find before stopping, after which the remaining checks are skipped
     :raises: ValidationError: if the workbook fails validation
     :return: any captured validation failures
     """
+    budget = budget or ValidationBudget()
     cast_to_schema(data_dict, validation_schema)
-    validation_failures = validate_data(data_dict, validation_schema)
+    validation_failures = validate_data(data_dict, validation_schema, budget)
 
-    if fund_specific_validation:
-        fund_specific_failures = fund_specific_validation(data_dict, original_workbook, reporting_round)
+    if fund_specific_validation and not budget.exhausted:
+        fund_specific_failures = budget.spend(fund_specific_validation(data_dict, original_workbook, reporting_round))
         validation_failures = [*validation_failures, *fund_specific_failures]
 
     if validation_failures:
@@ -0,0 +1,66 @@
+"""
+Module for capping how many errors validation collects before it stops.
+
+Validation normally runs every check to completion and reports every error it finds. When all that matters is whether a
+submission is valid, such as when bulk re-ingesting, or only the first few errors will be shown, validating the rest of
+a badly broken submission is wasted work. Each validation stage spends a shared `ValidationBudget` on the errors it
+finds and skips its remaining checks once the budget has run out.
+"""
+
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class ValidationBudget:
+    """The number of errors validation may collect before it stops.
+
+    A budget without a maximum never runs out, so validation runs to completion.
+    """
+
+    def __init__(self, max_errors: int | None = None):
+        """
+        :param max_errors: the number of errors to collect before stopping, or None to collect every error
+        :raises ValueError: if max_errors is less than 1
+        """
+        if max_errors is not None and max_errors < 1:
+            raise ValueError(f"max_errors must be at least 1, got {max_errors}")
+        self.max_errors = max_errors
+        self.errors = 0
+
+    @classmethod
+    def fail_fast(cls) -> "ValidationBudget":
+        """A budget that stops validation at the first error.
+
+        :return: a budget of one error
+        """
+        return cls(max_errors=1)
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the budget has been spent, after which no more validation needs to run."""
+        return self.max_errors is not None and self.errors >= self.max_errors
+
+    def spend(self, errors: list[T]) -> list[T]:
+        """Spends the budget on some errors.
+
+        :param errors: errors found by a check
+        :return: the errors that fit in what is left of the budget, in their original order
+        """
+        if self.max_errors is not None:
+            errors = errors[: max(self.max_errors - self.errors, 0)]
+        self.errors += len(errors)
+        return errors
+
+    def run(self, checks: Iterable[Callable[[], list[T]]]) -> list[T]:
+        """Runs checks in order until the budget is spent, skipping any that are left.
+
+        :param checks: functions that each run a check and return the errors it found
+        :return: the errors found, within the budget
+        """
+        errors = []
+        for check in checks:
+            if self.exhausted:
+                break
+            errors.extend(self.spend(check()))
+        return errors
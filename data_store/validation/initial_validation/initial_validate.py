@@ -11,6 +11,7 @@ file.
 import pandas as pd
 
 from data_store.exceptions import InitialValidationError
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.initial_validation.checks import (
     AuthorisationCheck,
     BasicCheck,
@@ -20,7 +21,12 @@ from data_store.validation.initial_validation.checks import (
 )
 
 
-def initial_validate(workbook: dict[str, pd.DataFrame], schema: list[Check], auth: dict | None):
+def initial_validate(
+    workbook: dict[str, pd.DataFrame],
+    schema: list[Check],
+    auth: dict | None,
+    budget: ValidationBudget | None = None,
+):
     """
     Executes initial checks based on the provided schema.
 
@@ -42,6 +48,7 @@ def initial_validate(workbook: dict[str, pd.DataFrame], schema: list[Check], aut
     :param schema: A list of checks to be run on the workbook.
     :param auth: A dictionary containing authorised places, funds or other entities that the user is authorised to
         submit for.
+    :param budget: the number of errors to collect before stopping, by default every error in a batch is collected
     :raises InitialValidationError: If any of the checks fail, an InitialValidationError is raised with a list of error
         messages. As the checks are run in batches, if any check within a batch fails, the error messages for that
         entire batch are collected and raised together, and the remaining batches of checks are not run.
@@ -52,9 +59,12 @@ def initial_validate(workbook: dict[str, pd.DataFrame], schema: list[Check], aut
         for check_type in [SheetCheck, AuthorisationCheck, BasicCheck, ConflictingCheck]
     ]
     authorisation_checks = authorisation_checks if auth else []
+    budget = budget or ValidationBudget()
     for checks in [sheet_checks, authorisation_checks, basic_checks, conflicting_checks]:
         error_messages = []
         for check in checks:
+            if budget.exhausted:
+                break
             if isinstance(check, SheetCheck):
                 passed, error_message = check.run(workbook)
                 if not passed:
@@ -64,6 +74,6 @@ def initial_validate(workbook: dict[str, pd.DataFrame], schema: list[Check], aut
             else:
                 passed, error_message = check.run(workbook)
             if not passed:
-                error_messages.append(error_message)
+                error_messages.extend(budget.spend([error_message]))
         if error_messages:
             raise InitialValidationError(error_messages)
@@ -1,6 +1,19 @@
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
 
 from data_store.messaging import Message
+from data_store.table_extraction.template_cache import control_lookup
+
+CONTROL_TABLE_NAMES = (
+    "Project details control",
+    "Outputs control",
+    "Outcomes control",
+    "Bespoke outputs control",
+    "Bespoke outcomes control",
+    "Intervention themes control",
+)
 
 
 def output_outcome_uoms(control_data_df: pd.DataFrame, column_name: str) -> dict[str, list[str]]:
@@ -10,13 +23,198 @@ def output_outcome_uoms(control_data_df: pd.DataFrame, column_name: str) -> dict
     :param column_name: String value of the column name from the relevant control table to be used for the mapping
     :return: Dictionary of output or outcome names to a list of their unit of measurement
     """
+    uoms = {name: list(name_uoms) for name, name_uoms in control_data_df.groupby(column_name, sort=False)["UoM"]}
+    names_with_uoms = control_data_df.loc[control_data_df["UoM"].notna(), column_name].unique()
+    return {name: uoms.get(name, []) for name in names_with_uoms}
+
+
+def values_by_key(control_data_df: pd.DataFrame, key_column: str, value_column: str) -> dict[str, list[str]]:
+    """Creates a mapping from each value in one column of a control table to the values in another column of the rows
+    it appears in, eg. from each local authority to its projects.
+
+    :param control_data_df: Dataframe of the extracted control data table
+    :param key_column: String value of the column name to map from
+    :param value_column: String value of the column name to map to
+    :return: Dictionary of each value of key_column to a list of the corresponding values of value_column
+    """
+    return control_data_df.groupby(key_column, sort=False)[value_column].agg(list).to_dict()
+
+
+def intervention_theme_to_values(control_data_df: pd.DataFrame, value_column: str) -> dict[str, list[str]]:
+    """Creates a mapping from each intervention theme to its standard outputs or outcomes.
+
+    The spelling of the "Enhancing subregional and regional connectivity" theme differs between the control tables and
+    the intervention theme dropdowns, so it is mapped using the dropdown's spelling.
+
+    :param control_data_df: Dataframe of the extracted outputs or outcomes control table
+    :param value_column: String value of the column name of the standard outputs or outcomes
+    :return: Dictionary of intervention themes to a list of their standard outputs or outcomes
+    """
+    theme_to_values = values_by_key(control_data_df, "Intervention theme", value_column)
+    theme_to_values["Enhancing subregional and regional connectivity"] = theme_to_values.pop(
+        "Enhancing sub-regional and regional connectivity"
+    )
+    return theme_to_values
+
+
+def lowercase_values_by_key(control_data_df: pd.DataFrame, key_column: str, value_column: str) -> dict[str, frozenset]:
+    """Creates a mapping from each value in one column of a control table to the lowercased values in another column of
+    the rows it appears in, for case-insensitive membership checks.
+
+    :param control_data_df: Dataframe of the extracted control data table
+    :param key_column: String value of the column name to map from
+    :param value_column: String value of the column name to map to
+    :return: Dictionary of each value of key_column to a set of the lowercased values of value_column
+    """
     return {
-        row[column_name]: control_data_df.loc[control_data_df[column_name] == row[column_name], "UoM"].tolist()
-        for _, row in control_data_df.iterrows()
-        if not pd.isna(row["UoM"])
+        key: frozenset(value.lower() for value in values)
+        for key, values in values_by_key(control_data_df, key_column, value_column).items()
     }
 
 
+@dataclass(frozen=True)
+class AllowedPairs:
+    """The lowercased (key, value) pairs allowed by a mapping of keys to their allowed values.
+
+    Keys and values are numbered by their position in `keys` and `values`, and each allowed pair is encoded as a single
+    integer, so that a whole column of pairs can be checked with an index lookup for each half and one `isin`.
+    """
+
+    keys: pd.Index
+    values: pd.Index
+    pair_codes: np.ndarray
+
+    def isin(self, keys: pd.Series, values: pd.Series) -> np.ndarray:
+        """Returns whether each (key, value) pair is allowed.
+
+        :param keys: lowercased keys
+        :param values: lowercased values, aligned with `keys`
+        :return: boolean array, True where the pair is allowed
+        """
+        key_codes = self.keys.get_indexer(keys)
+        value_codes = self.values.get_indexer(values)
+        pair_codes = key_codes * len(self.values) + value_codes
+        return (key_codes >= 0) & (value_codes >= 0) & np.isin(pair_codes, self.pair_codes)
+
+
+def lowercase_pairs(allowed_values_map: dict[str, list[str]]) -> AllowedPairs:
+    """Flattens a mapping of keys to their allowed values into the lowercased (key, value) pairs it allows.
+
+    Keys that only differ by case are merged as `check_values_against_mapped_allowed` has always done, with the last
+    one's values taking precedence.
+
+    :param allowed_values_map: Dictionary mapping keys to their respective lists of allowed values
+    :return: the lowercased (key, allowed value) pairs
+    """
+    allowed_values_map_lowercased = {k.lower(): [s.lower() for s in v] for k, v in allowed_values_map.items()}
+    keys = pd.Index(list(allowed_values_map_lowercased), dtype=object)
+    values = pd.Index(
+        list(dict.fromkeys(value for values in allowed_values_map_lowercased.values() for value in values)),
+        dtype=object,
+    )
+    pair_codes = [
+        keys.get_loc(key) * len(values) + values.get_loc(value)
+        for key, key_values in allowed_values_map_lowercased.items()
+        for value in key_values
+    ]
+    return AllowedPairs(keys=keys, values=values, pair_codes=np.unique(np.array(pair_codes, dtype=np.int64)))
+
+
+def intervention_theme_pairs(control_data_df: pd.DataFrame, value_column: str) -> AllowedPairs:
+    """Creates the lowercased (intervention theme, standard output or outcome) pairs allowed by a control table.
+
+    :param control_data_df: Dataframe of the extracted outputs or outcomes control table
+    :param value_column: String value of the column name of the standard outputs or outcomes
+    :return: the lowercased (intervention theme, output or outcome) pairs
+    """
+    return lowercase_pairs(intervention_theme_to_values(control_data_df, value_column))
+
+
+def output_outcome_uom_pairs(control_data_df: pd.DataFrame, column_name: str) -> AllowedPairs:
+    """Creates the lowercased (output or outcome, unit of measurement) pairs allowed by a control table.
+
+    :param control_data_df: Dataframe of the extracted control data table
+    :param column_name: String value of the column name of the outputs or outcomes
+    :return: the lowercased (output or outcome, unit of measurement) pairs
+    """
+    return lowercase_pairs(output_outcome_uoms(control_data_df, column_name))
+
+
+def lowercase_values(control_data_df: pd.DataFrame, column_name: str) -> frozenset:
+    """Creates the set of lowercased values in a column of a control table.
+
+    :param control_data_df: Dataframe of the extracted control data table
+    :param column_name: String value of the column name
+    :return: Set of the lowercased values
+    """
+    return frozenset(value.lower() for value in control_data_df[column_name])
+
+
+@dataclass(frozen=True)
+class ControlIndex:
+    """The lookups from the control tables that the cross-table checks validate against.
+
+    It is built once per ingest and shared by every check, and cached with `control_lookup`, so is only built once for
+    each template. Values are lowercased, as the checks are case-insensitive.
+    """
+
+    projects_by_programme: dict[str, frozenset]
+    bespoke_outputs_by_programme: dict[str, frozenset]
+    bespoke_outcomes_by_programme: dict[str, frozenset]
+    standard_outputs_by_theme: AllowedPairs
+    standard_outcomes_by_theme: AllowedPairs
+    standard_output_uoms: AllowedPairs
+    standard_outcome_uoms: AllowedPairs
+    bespoke_output_uoms: AllowedPairs
+    bespoke_outcome_uoms: AllowedPairs
+    intervention_themes: frozenset
+
+    @classmethod
+    def from_tables(
+        cls, extracted_table_dfs: dict[str, pd.DataFrame], bespoke_output_corrections: dict[str, str] | None = None
+    ) -> "ControlIndex":
+        """Returns the lookups from the control tables extracted from a submission.
+
+        :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+        :param bespoke_output_corrections: Corrected spellings of bespoke outputs in the bespoke outputs control table
+        :return: the lookups
+        """
+        control_dfs = {table_name: extracted_table_dfs[table_name] for table_name in CONTROL_TABLE_NAMES}
+        if bespoke_output_corrections:
+            control_dfs["Bespoke outputs control"] = control_dfs["Bespoke outputs control"].replace(
+                {"Output": bespoke_output_corrections}
+            )
+        return control_lookup(control_dfs, cls.from_control_tables)
+
+    @classmethod
+    def from_control_tables(cls, control_dfs: dict[str, pd.DataFrame]) -> "ControlIndex":
+        """Builds the lookups from the control tables.
+
+        :param control_dfs: Dictionary of the control tables, by table name
+        :return: the lookups
+        """
+        outputs_control = control_dfs["Outputs control"]
+        outcomes_control = control_dfs["Outcomes control"]
+        bespoke_outputs_control = control_dfs["Bespoke outputs control"]
+        bespoke_outcomes_control = control_dfs["Bespoke outcomes control"]
+        return cls(
+            projects_by_programme=lowercase_values_by_key(
+                control_dfs["Project details control"], "Local Authority", "Full name"
+            ),
+            bespoke_outputs_by_programme=lowercase_values_by_key(bespoke_outputs_control, "Local Authority", "Output"),
+            bespoke_outcomes_by_programme=lowercase_values_by_key(
+                bespoke_outcomes_control, "Local Authority", "Outcome"
+            ),
+            standard_outputs_by_theme=intervention_theme_pairs(outputs_control, "Standard output"),
+            standard_outcomes_by_theme=intervention_theme_pairs(outcomes_control, "Standard outcome"),
+            standard_output_uoms=output_outcome_uom_pairs(outputs_control, "Standard output"),
+            standard_outcome_uoms=output_outcome_uom_pairs(outcomes_control, "Standard outcome"),
+            bespoke_output_uoms=output_outcome_uom_pairs(bespoke_outputs_control, "Output"),
+            bespoke_outcome_uoms=output_outcome_uom_pairs(bespoke_outcomes_control, "Outcome"),
+            intervention_themes=lowercase_values(control_dfs["Intervention themes control"], "Intervention theme"),
+        )
+
+
 def error_message(sheet: str, section: str, description: str, cell_index: str | None = None) -> Message:
     """
     Create an error message object.
@@ -41,65 +239,46 @@ def error_message(sheet: str, section: str, description: str, cell_index: str |
 def check_values_against_allowed(
     df: pd.DataFrame,
     value_column: str,
-    allowed_values: list[str],
+    allowed_values: frozenset,
 ) -> list:
     """
-    Check that the values in the specified column of the DataFrame are within the list of allowed values.
+    Check that the values in the specified column of the DataFrame are within the set of allowed values.
 
     :param df: DataFrame to check
     :param value_column: Name of the column containing the values to check
-    :param allowed_values: List of allowed values
+    :param allowed_values: Set of lowercased allowed values
 
     :return: List of row indices with breaching values
     """
-
-    allowed_values_lowercased = [s.lower() for s in allowed_values]
-    breaching_row_indices = []
-    for index, row in df.iterrows():
-        value: str = str(row[value_column])
-        value_lowercased = value.lower()
-
-        if value_lowercased not in allowed_values_lowercased:
-            breaching_row_indices.append(index)
-
-    return breaching_row_indices
+    values_lowercased = df[value_column].astype(str).str.lower()
+    return df.index[~values_lowercased.isin(allowed_values).to_numpy()].tolist()
 
 
 def check_values_against_mapped_allowed(
     df: pd.DataFrame,
     value_column: str,
     allowed_values_key_column: str,
-    allowed_values_map: dict[str, list[str]],
+    allowed_pairs: AllowedPairs,
 ) -> list:
     """
-    Check that the values in the specified column of the DataFrame are within the list of allowed values determined by
-    another column.
+    Check that the values in the specified column of the DataFrame are within the values allowed for the value in
+    another column, as an anti-join of the DataFrame's (key, value) pairs against those allowed.
 
     :param df: DataFrame to check
     :param value_column: Name of the column containing the values to check
-    :param allowed_values_key_column: Name of the column used to determine the list of allowed values
-    :param allowed_values_map: Dictionary mapping themes to their respective lists of allowed values
+    :param allowed_values_key_column: Name of the column used to determine the allowed values
+    :param allowed_pairs: the lowercased (key, allowed value) pairs, as made by `lowercase_pairs`
 
     :return: List of row indices with breaching values
     """
-
-    allowed_values_map_lowercased = {k.lower(): [s.lower() for s in v] for k, v in allowed_values_map.items()}
-    breaching_row_indices = []
-    for index, row in df.iterrows():
-        value: str = str(row[value_column])
-        value_lowercased = value.lower()
-
-        allowed_values_key: str = str(row[allowed_values_key_column])
-        allowed_values_key_lowercased = allowed_values_key.lower()
-        allowed_values_lowercased = allowed_values_map_lowercased.get(allowed_values_key_lowercased, [])
-
-        if value_lowercased not in allowed_values_lowercased:
-            breaching_row_indices.append(index)
-
-    return breaching_row_indices
+    is_allowed = allowed_pairs.isin(
+        df[allowed_values_key_column].astype(str).str.lower(), df[value_column].astype(str).str.lower()
+    )
+    return df.index[~is_allowed].tolist()
 
 
 __all__ = [
+    "ControlIndex",
     "output_outcome_uoms",
     "error_message",
     "check_values_against_allowed",
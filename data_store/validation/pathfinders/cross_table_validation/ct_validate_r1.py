@@ -10,49 +10,65 @@ the breaching cell. This is because DataFrames are 0-indexed and Excel is not.
 import typing
 from collections import namedtuple
 from copy import deepcopy
+from functools import partial
 
 import pandas as pd
 
 from data_store.messaging import Message
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.pathfinders.consts import PFErrors
 from data_store.validation.pathfinders.cross_table_validation import common
 from data_store.validation.pathfinders.cross_table_validation.consts import PFC_REPORTING_PERIOD_LABELS_TO_DATES
 
 
-def cross_table_validate(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+def cross_table_validate(
+    extracted_table_dfs: dict[str, pd.DataFrame], budget: ValidationBudget | None = None
+) -> list[Message]:
     """
     Perform cross-table validation checks on the input DataFrames extracted from the original Excel file. These are
     checks that require data from multiple tables to be compared against each other.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param budget: Number of errors to collect before skipping the remaining checks, by default every check is run
     :return: List of error messages
     """
-    error_messages = []
-    error_messages.extend(_check_projects(extracted_table_dfs))
-    error_messages.extend(_check_standard_outputs(extracted_table_dfs))
-    error_messages.extend(_check_standard_outcomes(extracted_table_dfs))
-    error_messages.extend(_check_bespoke_outputs(extracted_table_dfs))
-    error_messages.extend(_check_bespoke_outcomes(extracted_table_dfs))
-    error_messages.extend(_check_credible_plan_fields(extracted_table_dfs))
-    error_messages.extend(_check_current_underspend(extracted_table_dfs))
-    error_messages.extend(_check_intervention_themes_in_pfcs(extracted_table_dfs))
-    error_messages.extend(_check_actual_forecast_reporting_period(extracted_table_dfs))
-    return error_messages
+    budget = budget or ValidationBudget()
+    if budget.exhausted:
+        return []
+    control_index = _control_index(extracted_table_dfs)
+    checks = (
+        partial(_check_projects, extracted_table_dfs, control_index),
+        partial(_check_standard_outputs, extracted_table_dfs, control_index),
+        partial(_check_standard_outcomes, extracted_table_dfs, control_index),
+        partial(_check_bespoke_outputs, extracted_table_dfs, control_index),
+        partial(_check_bespoke_outcomes, extracted_table_dfs, control_index),
+        partial(_check_credible_plan_fields, extracted_table_dfs),
+        partial(_check_current_underspend, extracted_table_dfs),
+        partial(_check_intervention_themes_in_pfcs, extracted_table_dfs, control_index),
+        partial(_check_actual_forecast_reporting_period, extracted_table_dfs),
+    )
+    return budget.run(checks)
+
+
+def _control_index(extracted_table_dfs: dict[str, pd.DataFrame]) -> common.ControlIndex:
+    """
+    Build the lookups from the control tables that the checks validate against.
 
+    :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :return: Lookups from the control tables
+    """
+    return common.ControlIndex.from_tables(extracted_table_dfs)
 
-def _check_projects(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+
+def _check_projects(extracted_table_dfs: dict[str, pd.DataFrame], control_index: common.ControlIndex) -> list[Message]:
     """
     Check that the project names in the "Project progress", "Project location" and "Project finance changes" tables
     match those allowed for the organisation.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param control_index: Lookups from the control tables
     :return: List of error messages
     """
-    project_details_df = extracted_table_dfs["Project details control"]
-    programme_to_projects = {
-        programme: project_details_df.loc[project_details_df["Local Authority"] == programme, "Full name"].tolist()
-        for programme in project_details_df["Local Authority"].unique()
-    }
     column_name_to_cell_indexes_letter = {
         "Project name": "B",
         "Project funding moved from": "C",
@@ -74,7 +90,7 @@ def _check_projects(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Messag
     ]
     for check_config in check_configs:
         organisation_name = extracted_table_dfs["Organisation name"].iloc[0, 0]
-        allowed_project_names = programme_to_projects[organisation_name]
+        allowed_project_names = control_index.projects_by_programme[organisation_name]
         extracted_table_df = extracted_table_dfs[check_config.table_name]
         breaching_row_indices = common.check_values_against_allowed(
             df=extracted_table_df,
@@ -99,7 +115,9 @@ def _check_projects(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Messag
     return error_messages
 
 
-def _check_standard_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+def _check_standard_outputs(
+    extracted_table_dfs: dict[str, pd.DataFrame], control_index: common.ControlIndex
+) -> list[Message]:
     """
     Check that the standard outputs in the "Outputs" table belong to the list of standard outputs for the respective
     intervention theme.
@@ -108,24 +126,14 @@ def _check_standard_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> lis
     measurement is allowed for that standard ouput.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param control_index: Lookups from the control tables
     :return: List of error messages
     """
-    outputs_control = extracted_table_dfs["Outputs control"]
-    intervention_theme_to_standard_outputs = {
-        row["Intervention theme"]: outputs_control.loc[
-            outputs_control["Intervention theme"] == row["Intervention theme"], "Standard output"
-        ].tolist()
-        for _, row in outputs_control.iterrows()
-        if not pd.isna(row["Intervention theme"])
-    }
-    intervention_theme_to_standard_outputs["Enhancing subregional and regional connectivity"] = (
-        intervention_theme_to_standard_outputs.pop("Enhancing sub-regional and regional connectivity")
-    )
     breaching_row_indices_outputs = common.check_values_against_mapped_allowed(
         df=extracted_table_dfs["Outputs"],
         value_column="Output",
         allowed_values_key_column="Intervention theme",
-        allowed_values_map=intervention_theme_to_standard_outputs,
+        allowed_pairs=control_index.standard_outputs_by_theme,
     )
     breaching_outputs = (
         extracted_table_dfs["Outputs"]
@@ -145,12 +153,11 @@ def _check_standard_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> lis
         for output, intervention_theme in breaching_outputs
     ]
     non_breaching_row_indices = extracted_table_dfs["Outputs"].index.difference(breaching_indices_copy)
-    standard_output_uoms = common.output_outcome_uoms(outputs_control, "Standard output")
     breaching_row_indices_uom = common.check_values_against_mapped_allowed(
         df=extracted_table_dfs["Outputs"].loc[non_breaching_row_indices],
         value_column="Unit of measurement",
         allowed_values_key_column="Output",
-        allowed_values_map=standard_output_uoms,
+        allowed_pairs=control_index.standard_output_uoms,
     )
     breaching_uoms = extracted_table_dfs["Outputs"].loc[breaching_row_indices_uom, "Unit of measurement"].tolist()
     uom_errors = [
@@ -165,7 +172,9 @@ def _check_standard_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> lis
     return output_errors + uom_errors
 
 
-def _check_standard_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+def _check_standard_outcomes(
+    extracted_table_dfs: dict[str, pd.DataFrame], control_index: common.ControlIndex
+) -> list[Message]:
     """
     Check that the standard outcomes in the "Outcomes" table belong to the list of standard outcomes for the respective
     intervention theme.
@@ -174,24 +183,14 @@ def _check_standard_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> li
     measurement is allowed for that standard outcome.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param control_index: Lookups from the control tables
     :return: List of error messages
     """
-    outcomes_control = extracted_table_dfs["Outcomes control"]
-    intervention_theme_to_standard_outcomes = {
-        row["Intervention theme"]: outcomes_control.loc[
-            outcomes_control["Intervention theme"] == row["Intervention theme"], "Standard outcome"
-        ].tolist()
-        for _, row in outcomes_control.iterrows()
-        if not pd.isna(row["Intervention theme"])
-    }
-    intervention_theme_to_standard_outcomes["Enhancing subregional and regional connectivity"] = (
-        intervention_theme_to_standard_outcomes.pop("Enhancing sub-regional and regional connectivity")
-    )
     breaching_row_indices_outcomes = common.check_values_against_mapped_allowed(
         df=extracted_table_dfs["Outcomes"],
         value_column="Outcome",
         allowed_values_key_column="Intervention theme",
-        allowed_values_map=intervention_theme_to_standard_outcomes,
+        allowed_pairs=control_index.standard_outcomes_by_theme,
     )
     breaching_outcomes = (
         extracted_table_dfs["Outcomes"]
@@ -211,12 +210,11 @@ def _check_standard_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> li
         for outcome, intervention_theme in breaching_outcomes
     ]
     non_breaching_row_indices = extracted_table_dfs["Outcomes"].index.difference(breaching_indices_copy)
-    standard_outcome_uoms = common.output_outcome_uoms(outcomes_control, "Standard outcome")
     breaching_row_indices_uom = common.check_values_against_mapped_allowed(
         df=extracted_table_dfs["Outcomes"].loc[non_breaching_row_indices],
         value_column="Unit of measurement",
         allowed_values_key_column="Outcome",
-        allowed_values_map=standard_outcome_uoms,
+        allowed_pairs=control_index.standard_outcome_uoms,
     )
     breaching_uoms = extracted_table_dfs["Outcomes"].loc[breaching_row_indices_uom, "Unit of measurement"].tolist()
     uom_errors = [
@@ -231,7 +229,9 @@ def _check_standard_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> li
     return outcome_errors + uom_errors
 
 
-def _check_bespoke_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+def _check_bespoke_outputs(
+    extracted_table_dfs: dict[str, pd.DataFrame], control_index: common.ControlIndex
+) -> list[Message]:
     """
     Check that the bespoke outputs in the "Bespoke outputs" table belong to the list of allowed bespoke outputs for the
     organisation.
@@ -240,17 +240,11 @@ def _check_bespoke_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> list
     measurement is allowed for that bespoke ouput.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param control_index: Lookups from the control tables
     :return: List of error messages
     """
-    bespoke_outputs_control = extracted_table_dfs["Bespoke outputs control"]
-    programme_to_allowed_bespoke_outputs = {
-        programme: bespoke_outputs_control.loc[
-            bespoke_outputs_control["Local Authority"] == programme, "Output"
-        ].tolist()
-        for programme in bespoke_outputs_control["Local Authority"].unique()
-    }
     organisation_name = extracted_table_dfs["Organisation name"].iloc[0, 0]
-    allowed_outputs = programme_to_allowed_bespoke_outputs[organisation_name]
+    allowed_outputs = control_index.bespoke_outputs_by_programme[organisation_name]
     breaching_row_indices_bespoke_outputs = common.check_values_against_allowed(
         df=extracted_table_dfs["Bespoke outputs"],
         value_column="Output",
@@ -274,12 +268,11 @@ def _check_bespoke_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> list
         for output, intervention_theme in breaching_outputs
     ]
     non_breaching_row_indices = extracted_table_dfs["Bespoke outputs"].index.difference(breaching_indices_copy)
-    bespoke_output_uoms = common.output_outcome_uoms(bespoke_outputs_control, "Output")
     breaching_row_indices_uom = common.check_values_against_mapped_allowed(
         df=extracted_table_dfs["Bespoke outputs"].loc[non_breaching_row_indices],
         value_column="Unit of measurement",
         allowed_values_key_column="Output",
-        allowed_values_map=bespoke_output_uoms,
+        allowed_pairs=control_index.bespoke_output_uoms,
     )
     breaching_uoms = (
         extracted_table_dfs["Bespoke outputs"].loc[breaching_row_indices_uom, "Unit of measurement"].tolist()
@@ -296,7 +289,9 @@ def _check_bespoke_outputs(extracted_table_dfs: dict[str, pd.DataFrame]) -> list
     return bespoke_output_errors + uom_errors
 
 
-def _check_bespoke_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+def _check_bespoke_outcomes(
+    extracted_table_dfs: dict[str, pd.DataFrame], control_index: common.ControlIndex
+) -> list[Message]:
     """
     Check that the bespoke outcomes in the "Bespoke outcomes" table belong to the list of allowed bespoke outcomes for
     the organisation.
@@ -305,17 +300,11 @@ def _check_bespoke_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> lis
     measurement is allowed for that bespoke outcome.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param control_index: Lookups from the control tables
     :return: List of error messages
     """
-    bespoke_outcomes_control = extracted_table_dfs["Bespoke outcomes control"]
-    programme_to_allowed_bespoke_outcomes = {
-        programme: bespoke_outcomes_control.loc[
-            bespoke_outcomes_control["Local Authority"] == programme, "Outcome"
-        ].tolist()
-        for programme in bespoke_outcomes_control["Local Authority"].unique()
-    }
     organisation_name = extracted_table_dfs["Organisation name"].iloc[0, 0]
-    allowed_outcomes = programme_to_allowed_bespoke_outcomes[organisation_name]
+    allowed_outcomes = control_index.bespoke_outcomes_by_programme[organisation_name]
     breaching_row_indices_bespoke_outcomes = common.check_values_against_allowed(
         df=extracted_table_dfs["Bespoke outcomes"],
         value_column="Outcome",
@@ -339,12 +328,11 @@ def _check_bespoke_outcomes(extracted_table_dfs: dict[str, pd.DataFrame]) -> lis
         for outcome, intervention_theme in breaching_outcomes
     ]
     non_breaching_row_indices = extracted_table_dfs["Bespoke outcomes"].index.difference(breaching_indices_copy)
-    bespoke_outcome_uoms = common.output_outcome_uoms(bespoke_outcomes_control, "Outcome")
     breaching_row_indices_uom = common.check_values_against_mapped_allowed(
         df=extracted_table_dfs["Bespoke outcomes"].loc[non_breaching_row_indices],
         value_column="Unit of measurement",
         allowed_values_key_column="Outcome",
-        allowed_values_map=bespoke_outcome_uoms,
+        allowed_pairs=control_index.bespoke_outcome_uoms,
     )
     breaching_uoms = (
         extracted_table_dfs["Bespoke outcomes"].loc[breaching_row_indices_uom, "Unit of measurement"].tolist()
@@ -371,36 +359,29 @@ def _check_credible_plan_fields(extracted_table_dfs: dict[str, pd.DataFrame]) ->
     :return: List of error messages
     """
     credible_plan = extracted_table_dfs["Credible plan"].iloc[0, 0]
-    error_messages = []
-    worksheet = "Finances"
-    table_names = ["Total underspend", "Proposed underspend use", "Credible plan summary"]
     if credible_plan == "Yes":
-        for table_name in table_names:
-            extracted_table_df = extracted_table_dfs[table_name]
-            for idx, row in extracted_table_df.iterrows():
-                # Column names are identical to table names and so can be used interchangeably
-                if pd.isna(row[table_name]):
-                    error_messages.append(
-                        common.error_message(
-                            sheet=worksheet,
-                            section=table_name,
-                            description=PFErrors.CREDIBLE_PLAN_YES,
-                            cell_index=f"B{typing.cast(int, idx) + 1}",  # safe to assume idx is an int
-                        )
-                    )
+        description, must_be_blank = PFErrors.CREDIBLE_PLAN_YES, False
     elif credible_plan == "No":
-        for table_name in table_names:
-            extracted_table_df = extracted_table_dfs[table_name]
-            for idx, row in extracted_table_df.iterrows():
-                if not pd.isna(row[table_name]):
-                    error_messages.append(
-                        common.error_message(
-                            sheet=worksheet,
-                            section=table_name,
-                            description=PFErrors.CREDIBLE_PLAN_NO,
-                            cell_index=f"B{typing.cast(int, idx) + 1}",  # safe to assume idx is an int
-                        )
-                    )
+        description, must_be_blank = PFErrors.CREDIBLE_PLAN_NO, True
+    else:
+        return []
+    error_messages: list[Message] = []
+    worksheet = "Finances"
+    table_names = ["Total underspend", "Proposed underspend use", "Credible plan summary"]
+    for table_name in table_names:
+        extracted_table_df = extracted_table_dfs[table_name]
+        # Column names are identical to table names and so can be used interchangeably
+        is_blank = extracted_table_df[table_name].isna().to_numpy()
+        breaching_indices = extracted_table_df.index[~is_blank if must_be_blank else is_blank]
+        error_messages.extend(
+            common.error_message(
+                sheet=worksheet,
+                section=table_name,
+                description=description,
+                cell_index=f"B{typing.cast(int, idx) + 1}",  # safe to assume idx is an int
+            )
+            for idx in breaching_indices
+        )
     return error_messages
 
 
@@ -430,15 +411,18 @@ def _check_current_underspend(extracted_table_dfs: dict[str, pd.DataFrame]) -> l
     return []
 
 
-def _check_intervention_themes_in_pfcs(extracted_table_dfs: dict[str, pd.DataFrame]) -> list[Message]:
+def _check_intervention_themes_in_pfcs(
+    extracted_table_dfs: dict[str, pd.DataFrame], control_index: common.ControlIndex
+) -> list[Message]:
     """
     Check that the “Intervention theme moved from” and “Intervention theme moved to” in the table "Project finance
     changes" belong to the list of available intervention themes.
 
     :param extracted_table_dfs: Dictionary of DataFrames representing tables extracted from the original Excel file
+    :param control_index: Lookups from the control tables
     :return: List of error messages
     """
-    allowed_themes = extracted_table_dfs["Intervention themes control"]["Intervention theme"].tolist()
+    allowed_themes = control_index.intervention_themes
     columns = [
         ("E", "Intervention theme moved from"),
         ("I", "Intervention theme moved to"),
@@ -472,30 +456,27 @@ def _check_actual_forecast_reporting_period(extracted_table_dfs: dict[str, pd.Da
     reporting_period = extracted_table_dfs["Reporting period"].iloc[0, 0]
     submission_reporting_period_start_date = PFC_REPORTING_PERIOD_LABELS_TO_DATES[reporting_period]["start"]
     pfcs_df = extracted_table_dfs["Project finance changes"]
-    error_messages = []
-    for idx, row in pfcs_df.iterrows():
-        change_reporting_period_start_date = PFC_REPORTING_PERIOD_LABELS_TO_DATES[
-            row["Reporting period change takes place"]
-        ]["start"]
-        actual_forecast_cancelled = row["Actual, forecast or cancelled"]
-        if actual_forecast_cancelled == "Actual":
-            if change_reporting_period_start_date > submission_reporting_period_start_date:
-                error_messages.append(
-                    common.error_message(
-                        sheet="Finances",
-                        section="Project finance changes",
-                        description=PFErrors.ACTUAL_REPORTING_PERIOD,
-                        cell_index=f"P{typing.cast(int, idx) + 1}",  # safe to assume idx is an int
-                    )
-                )
-        elif actual_forecast_cancelled == "Forecast":
-            if change_reporting_period_start_date <= submission_reporting_period_start_date:
-                error_messages.append(
-                    common.error_message(
-                        sheet="Finances",
-                        section="Project finance changes",
-                        description=PFErrors.FORECAST_REPORTING_PERIOD,
-                        cell_index=f"P{typing.cast(int, idx) + 1}",  # safe to assume idx is an int
-                    )
-                )
-    return error_messages
+    # an unknown reporting period raises a KeyError, as the schema validation only allows those in the dropdown
+    change_reporting_period_start_dates = pd.DatetimeIndex(
+        [
+            PFC_REPORTING_PERIOD_LABELS_TO_DATES[reporting_period]["start"]
+            for reporting_period in pfcs_df["Reporting period change takes place"]
+        ]
+    )
+    actual_forecast_cancelled = pfcs_df["Actual, forecast or cancelled"]
+    breaching_actuals = actual_forecast_cancelled.eq("Actual").to_numpy() & (
+        change_reporting_period_start_dates > submission_reporting_period_start_date
+    )
+    breaching_forecasts = actual_forecast_cancelled.eq("Forecast").to_numpy() & (
+        change_reporting_period_start_dates <= submission_reporting_period_start_date
+    )
+    breaching = breaching_actuals | breaching_forecasts
+    return [
+        common.error_message(
+            sheet="Finances",
+            section="Project finance changes",
+            description=PFErrors.ACTUAL_REPORTING_PERIOD if is_actual else PFErrors.FORECAST_REPORTING_PERIOD,
+            cell_index=f"P{typing.cast(int, idx) + 1}",  # safe to assume idx is an int
+        )
+        for idx, is_actual in zip(pfcs_df.index[breaching], breaching_actuals[breaching], strict=True)
+    ]
@@ -17,63 +17,81 @@ However, there are two main disadvantages of schemas with inline custom checks:
     2. you can’t use them to synthesize data because the checks are not associated with a hypothesis strategy.
 """
 
-import math
-import re
-from datetime import datetime
-from typing import Literal
+from datetime import date, datetime
 
+import numpy as np
 import pandas as pd
 import pandera as pa
+from pandas.api.types import is_datetime64_any_dtype, is_float_dtype
 
 from data_store.transformation.utils import POSTCODE_REGEX
 from data_store.validation.pathfinders.consts import PFErrors, PFRegex
 
 
-def _should_fail_check_because_element_is_nan(element) -> Literal[True] | None:
+def _is_nan(values: pd.Series) -> pd.Series:
     """Detect nan values in pandera checks which should return false to bypass type errors.
 
-    When writing element-wise pandera checks, pandera will pass through any null/nan values rather than skipping over
-    them. These are represented as `float('nan')` values. Many of our checks validate the type of the element,
-    expecting a specific thing - eg a datetime or string. The null/na values will fail those checks. We raise TypeErrors
-    if the data type doesn't match what we expect, but explicitly ignore TypeErrors raised from these checks because we
-    expect a later part of our pipeline to catch and report data coercion errors (coerce.controllers.ingest:coerce_data)
+    Pandera passes null/nan values through to our checks rather than skipping over them. These are represented as
+    `float('nan')` values. Many of our checks validate the type of the values, expecting a specific thing - eg a
+    datetime or string. The null/na values will fail those checks. We raise TypeErrors if the data type doesn't match
+    what we expect, but explicitly ignore TypeErrors raised from these checks because we expect a later part of our
+    pipeline to catch and report data coercion errors (coerce.controllers.ingest:coerce_data)
 
     If we instead mark null/na values as failing these checks, panderas has logic to automatically disregard the rows
     failing for this reason from the specific check taking place. So if, for example, a null value is passed into a
     postcode validation function, we can safely fail that check without worrying about the cell being reported for an
     invalid formatted postcode. It will only be reported as an empty cell missing data error instead.
+
+    Only float nans are matched, so other nulls (eg None) are still treated as being of the wrong type.
     """
-    if isinstance(element, float) and math.isnan(element):
-        return True
+    is_nan = values.isna()
+    if is_float_dtype(values) or not is_nan.any():
+        return is_nan
+    return is_nan & _is_instance(values, float)
+
 
-    return None
+def _is_instance(values: pd.Series, types: type | tuple[type, ...]) -> pd.Series:
+    return pd.Series([isinstance(value, types) for value in values], index=values.index, dtype=bool)
 
 
 def is_datetime():
-    def _is_datetime(element):
+    def _parses_as_datetime(element) -> bool:
         try:
             pd.to_datetime(element)
             return True
         except ValueError:
             return False
 
-    return pa.Check(_is_datetime, element_wise=True, error=PFErrors.IS_DATETIME)
+    def _is_datetime(values: pd.Series) -> pd.Series:
+        if is_datetime64_any_dtype(values):
+            return pd.Series(True, index=values.index)
+        # dates and nulls always parse, so only other values (usually text) need to be parsed one by one
+        passes = values.isna() | _is_instance(values, (date, np.datetime64))
+        passes[~passes] = values[~passes].map(_parses_as_datetime)
+        return passes
+
+    return pa.Check(_is_datetime, error=PFErrors.IS_DATETIME)
+
+
+def _is_numeric(values: pd.Series) -> pd.Series:
+    if is_datetime64_any_dtype(values):
+        return pd.Series(False, index=values.index)
+    return pd.to_numeric(values, errors="coerce").notna()
 
 
 def is_int():
-    def _is_int(element):
-        coerced = pd.to_numeric(element, errors="coerce")
-        return pd.notnull(coerced) and (isinstance(coerced, float) or coerced.astype(float).is_integer())
+    def _is_int(values: pd.Series) -> pd.Series:
+        # any number passes, including non-integer floats, which are caught when the data is coerced
+        return _is_numeric(values)
 
-    return pa.Check(_is_int, element_wise=True, error=PFErrors.IS_INT)
+    return pa.Check(_is_int, error=PFErrors.IS_INT)
 
 
 def is_float():
-    def _is_float(element):
-        coerced = pd.to_numeric(element, errors="coerce")
-        return pd.notnull(coerced)
+    def _is_float(values: pd.Series) -> pd.Series:
+        return _is_numeric(values)
 
-    return pa.Check(_is_float, element_wise=True, error=PFErrors.IS_FLOAT)
+    return pa.Check(_is_float, error=PFErrors.IS_FLOAT)
 
 
 def not_in_future():
@@ -81,18 +99,22 @@ def not_in_future():
     Checks that a datetime is not in the future.
     """
 
-    def _not_in_future(element):
-        if _should_fail_check_because_element_is_nan(element):
-            return False
+    def _not_in_future(values: pd.Series) -> pd.Series:
+        if is_datetime64_any_dtype(values):
+            return values <= pd.Timestamp(datetime.now().date())
 
-        # If it's not come through here as a datetime, it's probably some other native data type like an int or string,
-        # which will fail datetime coercion later in the pipeline. We throw a TypeError here as these are ignored by
-        # some custom logic we have, see tables.validate:TableValidator.IGNORED_FAILURES)
-        if not isinstance(element, datetime):
+        is_nan = _is_nan(values)
+        # If any value hasn't come through here as a datetime, it's probably some other native data type like an int or
+        # string, which will fail datetime coercion later in the pipeline. We throw a TypeError here as these are
+        # ignored by some custom logic we have, see tables.validate:TableValidator.IGNORED_FAILURES)
+        if not _is_instance(values[~is_nan], datetime).all():
             raise TypeError("Value must be a datetime")
-        return element <= datetime.now().date()
+        passes = pd.Series(False, index=values.index)
+        # only Timestamps can be compared with a date, so a TypeError is raised (and ignored) for python datetimes
+        passes[~is_nan] = values[~is_nan] <= datetime.now().date()
+        return passes
 
-    return pa.Check(_not_in_future, element_wise=True, error=PFErrors.FUTURE_DATE)
+    return pa.Check(_not_in_future, error=PFErrors.FUTURE_DATE)
 
 
 def max_word_count(max_words: int):
@@ -100,43 +122,40 @@ def max_word_count(max_words: int):
     Checks that a string split up by whitespace characters is less than or equal to "max_words" elements long.
     """
 
-    def _max_word_count(element):
-        if _should_fail_check_because_element_is_nan(element):
-            return False
-
-        # If it's not come through here as a string, it's probably some other native data type like an int, float, or
-        # datetime. Which won't be more than 100 words.
-        if not isinstance(element, str):
+    def _max_word_count(values: pd.Series) -> pd.Series:
+        is_nan = _is_nan(values)
+        # If any value hasn't come through here as a string, it's probably some other native data type like an int,
+        # float, or datetime. Which won't be more than 100 words.
+        if not _is_instance(values[~is_nan], str).all():
             raise TypeError("Value must be a string")
-        return len(element.split()) <= max_words
+        # counted without building a Series of the words, which is several times slower
+        word_counts = [len(value.split()) for value in values[~is_nan]]
+        passes = pd.Series(False, index=values.index)
+        passes[~is_nan] = np.array(word_counts, dtype=int) <= max_words
+        return passes
 
-    return pa.Check(_max_word_count, element_wise=True, error=PFErrors.LTE_X_WORDS.format(x=max_words))
+    return pa.Check(_max_word_count, error=PFErrors.LTE_X_WORDS.format(x=max_words))
 
 
 def postcode_list():
     """
     Checks that a string can be split on commas and each element matches a basic UK postcode regex.
     """
+    # each comma-separated postcode, ignoring surrounding whitespace, must start with a postcode
+    postcode_list_regex = rf"\s*(?:{POSTCODE_REGEX})[^,]*(?:,\s*(?:{POSTCODE_REGEX})[^,]*)*"
 
-    def _postcode_list(element):
-        if _should_fail_check_because_element_is_nan(element):
-            return False
-
+    def _postcode_list(values: pd.Series) -> pd.Series:
         # If we've been passed anything that's not a string (eg an int or datetime), we already know it's not going to
         # have a postcode format, so we can fail. We don't raise a TypeError here, because our table validation ignores
         # TypeErrors raised from these pandera checks, which would lead to not reporting the cell as an invalid
         # postcode.
-        if not isinstance(element, str):
-            return False
-
-        postcodes = element.split(",")
-        for postcode in postcodes:
-            postcode = postcode.strip()
-            if not re.match(POSTCODE_REGEX, postcode):
-                return False
-        return True
+        is_str = _is_instance(values, str)
+        passes = pd.Series(False, index=values.index)
+        if is_str.any():
+            passes[is_str] = values[is_str].str.fullmatch(postcode_list_regex).astype(bool)
+        return passes
 
-    return pa.Check(_postcode_list, element_wise=True, error=PFErrors.INVALID_POSTCODE_LIST)
+    return pa.Check(_postcode_list, error=PFErrors.INVALID_POSTCODE_LIST)
 
 
 def exactly_x_rows(x: int):
@@ -171,7 +190,9 @@ def less_than(x: int):
 
 
 def is_in(allowed_values: list):
-    def _is_in(element):
-        return element in allowed_values
+    allowed = frozenset(allowed_values)
+
+    def _is_in(values: pd.Series) -> pd.Series:
+        return values.isin(allowed)
 
-    return pa.Check(_is_in, element_wise=True, error=PFErrors.ISIN)
+    return pa.Check(_is_in, error=PFErrors.ISIN)
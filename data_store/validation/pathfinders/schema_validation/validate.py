@@ -1,7 +1,3 @@
-import re
-from dataclasses import dataclass
-
-import numpy as np
 import pandas as pd
 import pandera as pa
 
@@ -10,18 +6,6 @@ from data_store.table_extraction.table import Table
 from data_store.validation.pathfinders.schema_validation.exceptions import TableValidationError, TableValidationErrors
 
 
-@dataclass
-class Failure:
-    """Validation failure information returned by Pandera."""
-
-    schema_context: str
-    column: str
-    check: str
-    check_number: int
-    failure_case: str
-    index: int
-
-
 class TableValidator:
     """
     Validates a table against a specified schema.
@@ -30,7 +14,7 @@ class TableValidator:
         schema (pa.DataFrameSchema): The schema to validate against.
         MESSAGE_OVERRIDE (dict[str, str]): A dictionary mapping validation failure messages
             to custom override messages.
-        IGNORED_FAILURES (dict[str, str]): A dictionary mapping Failure attributes to regular expressions
+        IGNORED_FAILURES (dict[str, str]): A dictionary mapping failure case columns to regular expressions
             for ignored validation failures. These regex patterns can be used to exclude
             certain types of validation checks.
 
@@ -90,11 +74,11 @@ class TableValidator:
         try:
             self.schema.validate(table.df, lazy=True)
         except pa.errors.SchemaErrors as schema_errors:
-            standardise_indexes(schema_errors.failure_cases)
-            failures = self._get_failures(schema_errors)
-            failures = self._filter_ignored(failures)
-            if failures:
-                validation_errors = [self._parse_failure(failure, table) for failure in failures]
+            failure_cases = schema_errors.failure_cases
+            standardise_indexes(failure_cases)
+            failure_cases = failure_cases[~self._is_ignored(failure_cases)]
+            if not failure_cases.empty:
+                validation_errors = self._parse_failures(failure_cases, table)
                 raise TableValidationErrors(validation_errors=validation_errors) from schema_errors
 
     def _check_columns(self, table: Table):
@@ -103,24 +87,17 @@ class TableValidator:
         if cols_in_schema_not_in_df := set(self.schema.columns.keys()).difference(set(table.df.columns)):
             raise ValueError(f"Schema columns {cols_in_schema_not_in_df} are not in the table.")
 
-    @staticmethod
-    def _get_failures(schema_errors: pa.errors.SchemaErrors) -> list[Failure]:
-        return [Failure(**failure._asdict()) for failure in schema_errors.failure_cases.itertuples(index=False)]
-
-    def _parse_failure(self, failure: Failure, table: Table) -> TableValidationError:
-        cell = (
-            table.get_cell(failure.index, failure.column)
-            if pd.notnull(failure.index) and pd.notnull(failure.column)
-            else None
-        )
-        message = self.MESSAGE_OVERRIDE.get(failure.check, failure.check)
-        return TableValidationError(message=message, cell=cell)
-
-    def _filter_ignored(self, failures: list[Failure]) -> list[Failure]:
-        return [failure for failure in failures if not self._is_ignored(failure)]
+    def _parse_failures(self, failure_cases: pd.DataFrame, table: Table) -> list[TableValidationError]:
+        checks = failure_cases["check"]
+        messages = checks.map(self.MESSAGE_OVERRIDE).fillna(checks)
+        cells = table.get_cells(failure_cases["index"], failure_cases["column"])
+        return [TableValidationError(message=message, cell=cell) for message, cell in zip(messages, cells, strict=True)]
 
-    def _is_ignored(self, failure: Failure) -> bool:
-        return any(re.match(value, str(getattr(failure, attr))) for attr, value in self.IGNORED_FAILURES.items())
+    def _is_ignored(self, failure_cases: pd.DataFrame) -> pd.Series:
+        is_ignored = pd.Series(False, index=failure_cases.index)
+        for column, pattern in self.IGNORED_FAILURES.items():
+            is_ignored |= failure_cases[column].astype(str).str.match(pattern)
+        return is_ignored
 
 
 def standardise_indexes(failure_cases: pd.DataFrame):
@@ -130,13 +107,5 @@ def standardise_indexes(failure_cases: pd.DataFrame):
 
     :param failure_cases: a DataFrame containing the failure cases from the SchemaErrors object
     """
-    column_to_index = set()
-    for _, row in failure_cases.iterrows():
-        if pd.notnull(row["index"]):
-            column_to_index.add((row["column"], row["index"]))
-
-    failure_cases["index"] = np.where(
-        (failure_cases["index"].isna()) & (failure_cases["column"].isin([col for col, idx in column_to_index])),
-        failure_cases["column"].map(dict(column_to_index)),
-        failure_cases["index"],
-    )
+    first_index = failure_cases.dropna(subset=["index"]).groupby("column", sort=False)["index"].first()
+    failure_cases["index"] = failure_cases["index"].fillna(failure_cases["column"].map(first_index))
@@ -18,10 +18,9 @@ from data_store.transformation.utils import POSTCODE_REGEX
 from data_store.util import get_project_number_by_id, get_project_number_by_position
 from data_store.validation.towns_fund.failures.user import GenericFailure
 from data_store.validation.utils import (
-    find_null_values,
-    is_blank,
-    is_from_dropdown,
+    blank_values_mask,
     is_numeric,
+    null_values_mask,
     remove_duplicate_indexes,
 )
 
@@ -162,26 +161,22 @@ def validate_funding_profiles_funding_source_enum(workbook: dict[str, pd.DataFra
     """
     funding_df = workbook["Funding"]
 
-    # filters out pre-defined funding sources
-    other_funding_sources_mask = ~funding_df["Funding Source Type"].isin(PRE_DEFINED_FUNDING_SOURCES)
     # filters out valid Funding Sources
     invalid_source_mask = ~funding_df["Funding Source Type"].isin(set(FundingSourceCategoryEnum))
 
-    invalid_rows = funding_df[other_funding_sources_mask & invalid_source_mask]
+    invalid_rows = funding_df[is_other_funding_source(funding_df) & invalid_source_mask]
+    invalid_indexes = remove_duplicate_indexes(invalid_rows).index
 
-    # handle melted rows
-    invalid_rows = remove_duplicate_indexes(invalid_rows)
-
-    if len(invalid_rows) > 0:
+    if len(invalid_indexes) > 0:
         return [
             GenericFailure(
                 table="Funding",
-                section=f"Project Funding Profiles - Project {get_project_number_by_position(row.name, 'Funding')}",
+                section=f"Project Funding Profiles - Project {get_project_number_by_position(index, 'Funding')}",
                 column="Funding Source Type",
                 message=msgs.DROPDOWN,
-                row_index=row.name,
+                row_index=index,
             )
-            for _, row in invalid_rows.iterrows()
+            for index in invalid_indexes
         ]
     return None
 
@@ -198,17 +193,7 @@ def validate_funding_profiles_at_least_one_other_funding_source_fhsf(
     if workbook["Programme_Ref"].iloc[0]["FundType_ID"] != "HS":
         return None  # skip validation if not FHSF
 
-    funding_df = workbook["Funding"]
-
-    # filters out pre-defined funding sources
-    other_funding_sources_mask = ~funding_df["Funding Source Type"].isin(PRE_DEFINED_FUNDING_SOURCES)
-
-    other_funding_sources = funding_df[other_funding_sources_mask]
-
-    # handle melted rows
-    other_funding_sources = remove_duplicate_indexes(other_funding_sources)
-
-    if len(other_funding_sources) == 0:
+    if not is_other_funding_source(workbook["Funding"]).any():
         return [
             GenericFailure(
                 table="Funding",
@@ -235,28 +220,36 @@ def validate_funding_profiles_funding_secured_not_null(
     """
     funding_df = workbook["Funding"]
 
-    # filters out pre-defined funding sources
-    other_funding_sources_mask = ~funding_df["Funding Source Type"].isin(PRE_DEFINED_FUNDING_SOURCES)
     # filters out Secured if not null
     invalid_source_mask = funding_df["Secured"].isna()
 
-    invalid_rows = funding_df[other_funding_sources_mask & invalid_source_mask]
-    invalid_rows = remove_duplicate_indexes(invalid_rows)
+    invalid_rows = funding_df[is_other_funding_source(funding_df) & invalid_source_mask]
+    invalid_indexes = remove_duplicate_indexes(invalid_rows).index
 
-    if len(invalid_rows) > 0:
+    if len(invalid_indexes) > 0:
         return [
             GenericFailure(
                 table="Funding",
-                section=f"Project Funding Profiles - Project {get_project_number_by_position(row.name, 'Funding')}",
+                section=f"Project Funding Profiles - Project {get_project_number_by_position(index, 'Funding')}",
                 column="Secured",
                 message=msgs.BLANK,
-                row_index=row.name,
+                row_index=index,
             )
-            for _, row in invalid_rows.iterrows()
+            for index in invalid_indexes
         ]
     return None
 
 
+def is_other_funding_source(funding_df: pd.DataFrame) -> pd.Series:
+    """Returns a boolean mask of the Funding rows from the "Other Funding Sources" section, rather than the pre-defined
+    funding sources above it.
+
+    :param funding_df: A dataframe of the funding table from a submission
+    :return: True for each row from an other funding source
+    """
+    return ~funding_df["Funding Source Type"].isin(PRE_DEFINED_FUNDING_SOURCES)
+
+
 def validate_locations(workbook: dict[str, pd.DataFrame]) -> list["GenericFailure"]:
     """Validates the location columns on the Project Admin sheet.
 
@@ -292,39 +285,35 @@ def validate_locations(workbook: dict[str, pd.DataFrame]) -> list["GenericFailur
         ),
     )
 
-    failures = []
+    failures: list[GenericFailure] = []
 
     # empty cell validation
     for table_column, _, column_data in empty_cell_validation:
-        for idx, value in column_data.items():
-            if is_blank(value):
-                failures.append(
-                    GenericFailure(
-                        table="Project Details",
-                        section="Project Details",
-                        column=table_column,
-                        message=msgs.BLANK,
-                        row_index=idx,
-                    )
-                )
+        failures.extend(
+            GenericFailure(
+                table="Project Details",
+                section="Project Details",
+                column=table_column,
+                message=msgs.BLANK,
+                row_index=idx,
+            )
+            for idx in column_data.index[blank_values_mask(column_data)]
+        )
 
     # enum validation
-    valid_enum_values = set(YesNoEnum)
-    valid_enum_values.add("")  # allow empty string here to avoid duplicate errors for empty cells
-    row_is_valid = multiple_rows["GIS Provided"].isin(valid_enum_values)
-    invalid_rows = multiple_rows[~row_is_valid]  # noqa: E712 pandas notation
-    for _, row in invalid_rows.iterrows():
-        invalid_value = row["GIS Provided"]
-        if not pd.isna(invalid_value):
-            failures.append(
-                GenericFailure(
-                    table="Project Details",
-                    section="Project Details",
-                    column="GIS Provided",
-                    message=msgs.DROPDOWN,
-                    row_index=row.name,
-                )
-            )
+    gis_provided = multiple_rows["GIS Provided"]
+    # allow empty string here to avoid duplicate errors for empty cells
+    invalid_mask = ~gis_provided.isin({*YesNoEnum, ""}) & gis_provided.notna()
+    failures.extend(
+        GenericFailure(
+            table="Project Details",
+            section="Project Details",
+            column="GIS Provided",
+            message=msgs.DROPDOWN,
+            row_index=idx,
+        )
+        for idx in gis_provided.index[invalid_mask]
+    )
 
     return failures
 
@@ -342,8 +331,8 @@ def validate_psi_funding_gap(workbook: dict[str, pd.DataFrame]) -> list["Generic
         psi_df["Additional Comments"].isna()
     )
 
-    invalid_psi_rows = psi_df.loc[invalid_mask]
-    if len(invalid_psi_rows) > 0:
+    invalid_indexes = psi_df.index[invalid_mask.to_numpy()]
+    if len(invalid_indexes) > 0:
         return [
             GenericFailure(
                 table="Private Investments",
@@ -352,7 +341,7 @@ def validate_psi_funding_gap(workbook: dict[str, pd.DataFrame]) -> list["Generic
                 message=msgs.BLANK_PSI,
                 row_index=idx,
             )
-            for idx, _ in invalid_psi_rows.iterrows()
+            for idx in invalid_indexes
         ]
     return None
 
@@ -375,14 +364,11 @@ def validate_funding_spent(workbook: dict[str, pd.DataFrame]) -> list["GenericFa
     funding_df = workbook["Funding"]
 
     try:
-        funding_spent = [spend_per_project(funding_df, project) for project in project_ids]
+        funding_spent_df = funding_spent_by_project(funding_df).reindex(project_ids, fill_value=0)
     except TypeError:
         # data contains non-numeric values so cannot validate funding
         return None
 
-    # pull funding spent for individual projects into a DataFrame
-    funding_spent_df = pd.DataFrame(funding_spent).set_index("index")
-
     # TODO: create a single Failure instance for a single overspend error with a set of "locations" rather
     #   than a Failure for each cell
     if fund_type == "HS":
@@ -405,48 +391,51 @@ def validate_funding_spent(workbook: dict[str, pd.DataFrame]) -> list["GenericFa
         # check funding against individual project funding allocated for Towns Deal submissions
         funding_spent_failures = []
         for expense_type in ["CDEL", "RDEL"]:
-            for project_id in project_ids:
+            allocated = FUNDING_ALLOCATION.loc[project_ids, expense_type].astype(int).to_numpy()
+            overspent_mask = funding_spent_df[expense_type].round().to_numpy() > allocated
+            for project_id in funding_spent_df.index[overspent_mask]:
                 project_number = get_project_number_by_id(project_id, project_ids)
-                if round(funding_spent_df[expense_type][project_id]) > get_allocated_funding(project_id, expense_type):
-                    funding_spent_failures.append(
-                        GenericFailure(
-                            table="Funding",
-                            section=f"Project Funding Profiles - Project {project_number}",
-                            column="Grand Total",
-                            message=msgs.OVERSPEND.format(expense_type=expense_type),
-                            row_index=13 + 28 * project_number if expense_type == "CDEL" else 16 + 28 * project_number,
-                        )
+                funding_spent_failures.append(
+                    GenericFailure(
+                        table="Funding",
+                        section=f"Project Funding Profiles - Project {project_number}",
+                        column="Grand Total",
+                        message=msgs.OVERSPEND.format(expense_type=expense_type),
+                        row_index=13 + 28 * project_number if expense_type == "CDEL" else 16 + 28 * project_number,
                     )
+                )
         return funding_spent_failures
 
 
-def spend_per_project(funding_df: pd.DataFrame, project_id: str) -> dict[str, int]:
-    """return the total funding spent per an individual project
+def funding_spent_by_project(funding_df: pd.DataFrame) -> pd.DataFrame:
+    """return the total Towns Fund funding spent per project, from a single groupby over the funding table
 
-    :param funding_df: A dataframe of the funding table from a submission
-    :param: project_id: ID of project in question
+    Business logic here is taken from spreadsheet 4a - Funding Profile Z45 for grand total expenditure.
 
-    :return: Total funding spent per project
+    :param funding_df: A dataframe of the funding table from a submission
+    :raises TypeError: if a funding source type isn't text, or a Towns Fund spend isn't a number
+    :return: CDEL, RDEL and Total funding spent, indexed by project ID, for each project with Towns Fund funding
     """
-    funding_df = funding_df.loc[
-        (funding_df["Project ID"] == project_id)
-        & (funding_df["Funding Source Name"] == "Towns Fund")
-        & ~(funding_df["Funding Source Type"].str.contains("contractually committed"))
-    ]
-
-    funding_spent = {
-        "index": project_id,
-        "CDEL": (
-            funding_df["Spend for Reporting Period"].loc[(funding_df["Funding Source Type"].str.contains("CDEL"))].sum()
-        ),
-        "RDEL": (
-            funding_df["Spend for Reporting Period"].loc[(funding_df["Funding Source Type"].str.contains("RDEL"))].sum()
-        ),
-        "Total": (funding_df["Spend for Reporting Period"].sum()),
-    }
-
-    # Business logic here is taken from spreadsheet 4a - Funding Profile Z45 for grand total expenditure
-    return funding_spent
+    funding_source_type = funding_df["Funding Source Type"]
+    is_committed = funding_source_type.str.contains("contractually committed")
+    if is_committed.isna().any():
+        raise TypeError("Funding Source Type must be text")
+
+    towns_fund_mask = ((funding_df["Funding Source Name"] == "Towns Fund") & ~is_committed.astype(bool)).to_numpy()
+    spend = funding_df["Spend for Reporting Period"][towns_fund_mask]
+    numeric_spend = pd.to_numeric(spend, errors="coerce")
+    if (numeric_spend.isna() & spend.notna()).any():
+        raise TypeError("Spend for Reporting Period must be a number")
+
+    towns_fund_source_type = funding_source_type[towns_fund_mask]
+    funding_spent = pd.DataFrame(
+        {
+            "CDEL": numeric_spend.where(towns_fund_source_type.str.contains("CDEL"), 0),
+            "RDEL": numeric_spend.where(towns_fund_source_type.str.contains("RDEL"), 0),
+            "Total": numeric_spend,
+        }
+    )
+    return funding_spent.groupby(funding_df["Project ID"][towns_fund_mask].to_numpy()).sum()
 
 
 def get_allocated_funding(idx: str, expense_type: str) -> int:
@@ -478,8 +467,7 @@ def validate_psi_funding_not_negative(workbook: dict[str, pd.DataFrame]) -> list
     errors = [
         (col, index)
         for col in cols_to_check
-        for index, val in pd.to_numeric(psi_df[col], errors="coerce").items()
-        if val < 0
+        for index in psi_df.index[(pd.to_numeric(psi_df[col], errors="coerce") < 0).to_numpy()]
     ]
 
     if len(errors) > 0:
@@ -509,6 +497,10 @@ def validate_postcodes(workbook: dict[str, pd.DataFrame]) -> list["GenericFailur
     """
     project_details_df = workbook["Project Details"]
 
+    postcode_regex = re.compile(POSTCODE_REGEX)
+    has_postcode = [bool(postcode_regex.search(postcodes)) for postcodes in project_details_df["Postcodes"].astype(str)]
+    invalid_mask = project_details_df["Locations"].notna().to_numpy() & ~np.array(has_postcode, dtype=bool)
+
     return [
         GenericFailure(
             table="Project Details",
@@ -517,8 +509,7 @@ def validate_postcodes(workbook: dict[str, pd.DataFrame]) -> list["GenericFailur
             message=msgs.POSTCODE,
             row_index=index,
         )
-        for index, row in project_details_df.iterrows()
-        if pd.notna(row["Locations"]) and not re.search(POSTCODE_REGEX, str(row["Postcodes"]))
+        for index in project_details_df.index[invalid_mask]
     ]
 
 
@@ -532,6 +523,9 @@ def validate_funding_questions(workbook: dict[str, pd.DataFrame]) -> list["Gener
     :return: ValidationErrors
     """
     funding_questions = workbook["Funding Questions"]
+    if funding_questions.empty:
+        return []
+
     check_dropdown = {
         "Beyond these three funding types, have you received any payments for specific projects?": YesNoEnum,
         "Please confirm whether the amount utilised represents your entire allocation": YesNoEnum,
@@ -539,53 +533,41 @@ def validate_funding_questions(workbook: dict[str, pd.DataFrame]) -> list["Gener
     }
     check_numeric = ("Please indicate how much of your allocation has been utilised (in £s)",)
 
-    failures = []
-    for index, row in funding_questions.iterrows():
-        column = row["Indicator"] if pd.notna(row["Indicator"]) else "All Columns"
-        question = row["Question"]
-        response = row["Response"]
+    questions = funding_questions["Question"]
+    responses = funding_questions["Response"]
+    columns = funding_questions["Indicator"].where(funding_questions["Indicator"].notna(), "All Columns")
 
-        # do blank check
-        if is_blank(response):
-            failures.append(
-                GenericFailure(
-                    table="Funding Questions",
-                    section='Towns Deal Only - "Other/Early" TD Funding',
-                    column=column,
-                    message=msgs.BLANK,
-                    row_index=index,
-                )
-            )
-            continue
+    # do blank check
+    blank_mask = blank_values_mask(responses)
 
-        # do dropdown check
-        if enum := check_dropdown.get(question):
-            if not is_from_dropdown(response, enum):
-                failures.append(
-                    GenericFailure(
-                        table="Funding Questions",
-                        section='Towns Deal Only - "Other/Early" TD Funding',
-                        column=column,
-                        message=msgs.DROPDOWN,
-                        row_index=index,
-                    )
-                )
-                continue
+    # do dropdown check
+    not_from_dropdown_mask = np.zeros(len(funding_questions), dtype=bool)
+    for question, enum in check_dropdown.items():
+        not_from_dropdown_mask |= ((questions == question) & ~responses.isin(set(enum))).to_numpy()
+    dropdown_mask = ~blank_mask & not_from_dropdown_mask
 
-        # is numeric check
-        if question in check_numeric:
-            if not is_numeric(response):
-                failures.append(
-                    GenericFailure(
-                        table="Funding Questions",
-                        section='Towns Deal Only - "Other/Early" TD Funding',
-                        column=column,
-                        message=msgs.WRONG_TYPE_NUMERICAL,
-                        row_index=index,
-                    )
-                )
+    # is numeric check
+    numeric_mask = ~blank_mask & ~dropdown_mask & questions.isin(check_numeric).to_numpy()
+    numeric_mask[numeric_mask] = ~responses[numeric_mask].map(is_numeric).to_numpy(dtype=bool)
 
-    return failures
+    # each row fails the first check it doesn't pass
+    messages = np.select(
+        [blank_mask, dropdown_mask, numeric_mask], [msgs.BLANK, msgs.DROPDOWN, msgs.WRONG_TYPE_NUMERICAL], ""
+    )
+    invalid_mask = blank_mask | dropdown_mask | numeric_mask
+
+    return [
+        GenericFailure(
+            table="Funding Questions",
+            section='Towns Deal Only - "Other/Early" TD Funding',
+            column=column,
+            message=message,
+            row_index=index,
+        )
+        for index, column, message in zip(
+            funding_questions.index[invalid_mask], columns[invalid_mask], messages[invalid_mask], strict=True
+        )
+    ]
 
 
 def validate_project_progress(workbook: dict[str, pd.DataFrame]) -> list["GenericFailure"]:
@@ -613,28 +595,25 @@ def validate_project_progress(workbook: dict[str, pd.DataFrame]) -> list["Generi
     )
     complete_mask = project_progress_df["Project Delivery Status"].isin({StatusEnum.COMPLETED})
 
-    project_delayed_rows = project_progress_df[delayed_mask]
-    project_incomplete_rows = project_progress_df[~complete_mask]
-
     # the column to check alongside the rows it should be checked in and the failure message
     columns_to_check = [
-        ("Leading Factor of Delay", project_delayed_rows, msgs.BLANK),
-        ("Current Project Delivery Stage", project_incomplete_rows, msgs.BLANK_IF_PROJECT_INCOMPLETE),
+        ("Leading Factor of Delay", delayed_mask, msgs.BLANK),
+        ("Current Project Delivery Stage", ~complete_mask, msgs.BLANK_IF_PROJECT_INCOMPLETE),
     ]
 
-    failures = []
-    for column, invalid_rows, message in columns_to_check:
-        invalid_rows = find_null_values(invalid_rows, column)
-        for _, row in invalid_rows.iterrows():
-            failures.append(
-                GenericFailure(
-                    table="Project Progress",
-                    section="Projects Progress Summary",
-                    column=column,
-                    message=message,
-                    row_index=row.name,
-                )
+    failures: list[GenericFailure] = []
+    for column, rows_mask, message in columns_to_check:
+        invalid_mask = rows_mask.to_numpy() & null_values_mask(project_progress_df[column])
+        failures.extend(
+            GenericFailure(
+                table="Project Progress",
+                section="Projects Progress Summary",
+                column=column,
+                message=message,
+                row_index=index,
             )
+            for index in project_progress_df.index[invalid_mask]
+        )
 
     return failures
 
@@ -6,19 +6,24 @@ cause the validation to fail. Details of these failures are captured and returne
 
 import numbers
 import typing
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Union
+from typing import Any, Callable, Hashable, Union
 
+import numpy as np
 import pandas as pd
 from numpy.typing import NDArray
 from pandas.api.extensions import ExtensionArray
 
 from data_store.messaging.tf_messaging import TFMessages as msgs
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.towns_fund.failures import ValidationFailureBase, internal, user
-from data_store.validation.utils import is_blank, remove_duplicate_indexes
+from data_store.validation.utils import remove_duplicate_indexes
 
 
-def validate_data(data_dict: dict[str, pd.DataFrame], schema: dict) -> list[ValidationFailureBase]:
+def validate_data(
+    data_dict: dict[str, pd.DataFrame], schema: dict, budget: ValidationBudget | None = None
+) -> list[ValidationFailureBase]:
     """Validate a set of data against a schema.
 
     This is the top-level validate function. It:
@@ -32,11 +37,13 @@ def validate_data(data_dict: dict[str, pd.DataFrame], schema: dict) -> list[Vali
     :param schema: A dictionary defining the schema of the data, with table names as
                    keys and values that are dictionaries mapping column names to
                    expected data types and any additional validation criteria.
+    :param budget: the number of failures to find before stopping, by default every table is validated
     :return: A list of ValidationFailure objects representing any validation errors
              found.
     """
-    extra_tables = remove_undefined_tables(data_dict, schema)
-    validation_failures = validations(data_dict, schema)
+    budget = budget or ValidationBudget()
+    extra_tables = budget.spend(remove_undefined_tables(data_dict, schema))
+    validation_failures = validations(data_dict, schema, budget)
     return [*extra_tables, *validation_failures]
 
 
@@ -60,16 +67,153 @@ def remove_undefined_tables(data_dict: dict[str, pd.DataFrame], schema: dict) ->
     return extra_table_failures
 
 
-def validations(data_dict: dict[str, pd.DataFrame], schema: dict) -> list[ValidationFailureBase]:
+def validations(
+    data_dict: dict[str, pd.DataFrame], schema: dict, budget: ValidationBudget | None = None
+) -> list[ValidationFailureBase]:
     """
     Validate the given data against a provided schema by checking each table's
     columns, data types, unique values, composite keys, and foreign keys.
 
+    Each table's schema is compiled into a TablePlan, which checks all of its constraints in a single pass over the
+    table.
+
     :param data_dict: A dictionary where keys are table names and values are pandas DataFrames.
     :param schema: A dictionary containing the validation schema for each table of the data.
+    :param budget: The number of failures to find before the remaining tables are skipped, by default all are validated.
     :return: A list of validation failures encountered during validation, if any.
     """
+    budget = budget or ValidationBudget()
+    validation_failures: list[ValidationFailureBase] = []
+    for table in data_dict.keys():
+        if budget.exhausted:
+            break
+        plan = compile_table_plan(schema[table])
+
+        # if the table is empty and not defined as nullable, then raise an Empty Table Failure
+        if data_dict[table].empty and not plan.table_nullable:
+            validation_failures.extend(budget.spend([internal.EmptyTableFailure(table)]))
+            continue
+
+        validation_failures.extend(budget.spend(plan.validate(data_dict, table)))
+
+    return validation_failures
+
+
+class TableValues:
+    """
+    A table's values as `DataFrame.iterrows` would return them, shared by the constraints that check each row.
+
+    The table is converted to a NumPy array once, and each column's values and nulls are worked out the first time a
+    constraint needs them, so that constraints check whole columns at once rather than building a Series for each row.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._values = df.values
+        self._columns: dict[str, np.ndarray] = {}
+        self._nulls: dict[str, np.ndarray] = {}
+        self._rows: dict[int, pd.Series] = {}
+        self._labels: list[Hashable] | None = None
+
+    def column(self, column: str) -> np.ndarray | None:
+        """Returns a column's values, or None if the table doesn't have the column.
+
+        :param column: the name of a column in the table
+        :return: the column's values
+        """
+        if column not in self._columns:
+            if column not in self.df.columns:
+                return None
+            self._columns[column] = self._values[:, self.df.columns.get_loc(column)]
+        return self._columns[column]
+
+    def _present_column(self, column: str) -> np.ndarray:
+        values = self.column(column)
+        if values is None:
+            raise KeyError(column)
+        return values
+
+    def is_null(self, column: str) -> np.ndarray:
+        """Returns a boolean mask of the column's null values.
+
+        :param column: the name of a column in the table
+        :return: True where the value is null
+        :raises KeyError: if the table doesn't have the column
+        """
+        if column not in self._nulls:
+            self._nulls[column] = pd.isna(self._present_column(column))
+        return self._nulls[column]
+
+    def is_blank(self, column: str) -> np.ndarray:
+        """Returns a boolean mask of the column's null and empty string values, as `utils.is_blank` checks.
+
+        :param column: the name of a column in the table
+        :return: True where the value is blank
+        :raises KeyError: if the table doesn't have the column
+        """
+        values = self._present_column(column)
+        if values.dtype != object:
+            return self.is_null(column)
+        return self.is_null(column) | pd.Series(values, dtype=object, copy=False).eq("").to_numpy()
+
+    def row(self, position: int) -> pd.Series:
+        """Returns the row at a position, as `DataFrame.iterrows` would.
+
+        The same Series is returned to every failure on the row, so it must not be modified.
+
+        :param position: the row's position in the table
+        :return: the row
+        """
+        if position not in self._rows:
+            self._rows[position] = pd.Series(self._values[position], index=self.df.columns, name=self.label(position))
+        return self._rows[position]
+
+    def label(self, position: int) -> Hashable:
+        """Returns the index label of the row at a position, as a Python scalar as `DataFrame.iterrows` would give it.
+
+        :param position: the row's position in the table
+        :return: the row's index label
+        """
+        if self._labels is None:
+            self._labels = self.df.index.tolist()
+        return self._labels[position]
+
+
+@dataclass
+class TablePlan:
+    """The constraints in a table's schema, in the order they are checked.
+
+    Attributes:
+        table_nullable (bool): whether the table may be empty
+        constraints (list[tuple[Callable, Any]]): each constraint function and the schema section it checks
+    """
+
+    table_nullable: bool
+    constraints: list[tuple[Callable, Any]]
+
+    def validate(self, data_dict: dict[str, pd.DataFrame], table: str) -> list[ValidationFailureBase]:
+        """Checks every constraint on a table, sharing its values between the constraints that check each row.
 
+        :param data_dict: A dictionary where keys are table names and values are pandas DataFrames.
+        :param table: The name of the table to validate.
+        :return: A list of validation failures, if any.
+        """
+        table_values = TableValues(data_dict[table])
+        validation_failures: list[ValidationFailureBase] = []
+        for validation_func, schema_section in self.constraints:
+            if validation_func in ROW_CONSTRAINTS:
+                validation_failures.extend(validation_func(data_dict, table, schema_section, table_values=table_values))
+            else:
+                validation_failures.extend(validation_func(data_dict, table, schema_section))
+        return validation_failures
+
+
+def compile_table_plan(table_schema: dict) -> TablePlan:
+    """Compiles a table's schema into the constraints to check against it.
+
+    :param table_schema: the table's schema
+    :return: the table's plan
+    """
     constraints = (
         # internal constraints
         (validate_columns, "columns"),
@@ -82,22 +226,68 @@ def validations(data_dict: dict[str, pd.DataFrame], schema: dict) -> list[Valida
         (validate_nullable, "non-nullable"),
         (validate_project_dates, "project_date_validation"),
     )
+    return TablePlan(
+        table_nullable=bool(table_schema.get("table_nullable")),
+        constraints=[
+            (validation_func, table_schema[schema_section])
+            for validation_func, schema_section in constraints
+            if schema_section in table_schema
+        ],
+    )
 
-    validation_failures: list[ValidationFailureBase] = []
-    for table in data_dict.keys():
-        # if the table is empty and not defined as nullable, then raise an Empty Table Failure
-        if data_dict[table].empty and not schema[table].get("table_nullable"):
-            validation_failures.append(internal.EmptyTableFailure(table))
-            continue
 
-        table_schema = schema[table]
+def _scalar_type(values: np.ndarray) -> type:
+    """Returns the type of the values in a typed array, as a row of the table would hold them.
 
-        for validation_func, schema_section in constraints:
-            if schema_section in table_schema:
-                validation_failure = validation_func(data_dict, table, table_schema[schema_section])
-                validation_failures.extend(validation_failure)
+    :param values: an array that isn't of object dtype
+    :return: the type of its values
+    """
+    if values.dtype.kind == "M":
+        return pd.Timestamp
+    if values.dtype.kind == "m":
+        return pd.Timedelta
+    return values.dtype.type
 
-    return validation_failures
+
+def _as_objects(values: np.ndarray) -> np.ndarray:
+    """Returns the values as an object array, with dates as Timestamps, as a row of the table would hold them.
+
+    :param values: an array
+    :return: the values as an object array
+    """
+    if values.dtype.kind in "mM":
+        return pd.Series(values, copy=False).to_numpy(dtype=object)
+    return values.astype(object, copy=False)
+
+
+def _value_types(values: np.ndarray, mask: np.ndarray) -> list[type]:
+    """Returns the types of the values selected by a mask.
+
+    :param values: an array of values
+    :param mask: True for each value to return the type of
+    :return: the types of the selected values
+    """
+    if values.dtype != object:
+        return [_scalar_type(values)] * int(mask.sum())
+    return [type(value) for value in values[mask]]
+
+
+def _matches_type(values: np.ndarray, predicate: Callable[[type], bool]) -> np.ndarray:
+    """Returns a boolean mask of the values whose type satisfies the predicate.
+
+    The predicate is called once for each distinct type, rather than for each value.
+
+    :param values: an array of values
+    :param predicate: a function that takes a type and returns True or False
+    :return: the predicate's result for each value's type
+    """
+    if values.dtype != object:
+        return np.full(len(values), predicate(_scalar_type(values)))
+    value_types = list(map(type, values))
+    matches = {value_type: predicate(value_type) for value_type in set(value_types)}
+    if all(matches.values()):
+        return np.ones(len(value_types), dtype=bool)
+    return np.fromiter(map(matches.__getitem__, value_types), dtype=bool, count=len(value_types))
 
 
 def validate_columns(
@@ -132,6 +322,7 @@ def validate_types(
     data_dict: dict[str, pd.DataFrame],
     table: str,
     column_to_type: dict,
+    table_values: TableValues | None = None,
 ) -> list[user.WrongTypeFailure]:
     """
     Validate that the data types of columns in a given table align with the
@@ -142,38 +333,46 @@ def validate_types(
     :param data_dict: A dictionary where keys are table names and values are pandas DataFrames.
     :param table: The name of the table to validate.
     :param column_to_type: A dictionary where keys are column names and values are expected data types.
+    :param table_values: The table's values, if they have already been worked out for another constraint.
     :return: A list of wrong type failures, if any.
     """
+    table_values = table_values or TableValues(data_dict[table])
 
-    wrong_type_failures = []
-    for index, row in data_dict[table].iterrows():
-        for column, exp_type in column_to_type.items():
-            got_value = row.get(column)
-
-            if not isinstance(got_value, list) and (got_value is None or pd.isna(got_value)):  # type: ignore[arg-type]
-                continue
-
-            got_type = type(got_value)
+    wrong_types: list[tuple[int, int, str, type, type]] = []
+    for column_order, (column, exp_type) in enumerate(column_to_type.items()):
+        values = table_values.column(column)
+        if values is None:
+            continue
 
-            # do not raise an exception for pandas Timestamp, datetime or number values
-            if (isinstance(got_value, numbers.Number) and exp_type in [int, float]) or (
-                isinstance(got_value, (datetime, pd.Timestamp)) and issubclass(exp_type, datetime)
-            ):
-                continue
+        # do not raise an exception for pandas Timestamp, datetime or number values
+        def is_expected_type(got_type: type, exp_type=exp_type) -> bool:
+            return (
+                got_type == exp_type
+                or (issubclass(got_type, numbers.Number) and exp_type in [int, float])
+                or (issubclass(got_type, (datetime, pd.Timestamp)) and issubclass(exp_type, datetime))
+            )
 
-            if got_value is not None and got_type != exp_type:
-                wrong_type_failures.append(
-                    user.WrongTypeFailure(
-                        table=table,
-                        column=column,
-                        expected_type=exp_type,
-                        actual_type=got_type,
-                        row_index=typing.cast(int, index),  # safe assumption that index is int
-                        failed_row=row,
-                    )
-                )
+        is_wrong_type = ~table_values.is_null(column) & ~_matches_type(values, is_expected_type)
+        wrong_types.extend(
+            (position, column_order, column, exp_type, got_type)
+            for position, got_type in zip(
+                np.flatnonzero(is_wrong_type), _value_types(values, is_wrong_type), strict=True
+            )
+        )
 
-    return wrong_type_failures
+    # report failures row by row, as they appear in the table
+    wrong_types.sort(key=lambda wrong_type: wrong_type[:2])
+    return [
+        user.WrongTypeFailure(
+            table=table,
+            column=column,
+            expected_type=exp_type,
+            actual_type=got_type,
+            row_index=typing.cast(int, table_values.label(position)),  # safe assumption that index is int
+            failed_row=table_values.row(position),
+        )
+        for position, _, column, exp_type, got_type in wrong_types
+    ]
 
 
 def validate_uniques(
@@ -235,7 +434,9 @@ def validate_unique_composite_key(
                 row=list(duplicate),
                 row_index=typing.cast(int, idx),  # safe assumption that it's an int
             )
-            for idx, duplicate in duplicated_rows.iterrows()
+            for idx, duplicate in zip(
+                duplicated_rows.index, duplicated_rows.itertuples(index=False, name=None), strict=True
+            )
         ]
         non_unique_composite_key_failures.extend(failures)
 
@@ -300,6 +501,7 @@ def validate_enums(
     data_dict: dict[str, pd.DataFrame],
     table: str,
     enums: dict[str, set[str]],
+    table_values: TableValues | None = None,
 ) -> list[user.InvalidEnumValueFailure]:
     """
     Validate that all values in specified columns belong to a given set of valid values.
@@ -309,33 +511,33 @@ def validate_enums(
     :param table: The name of the table to validate.
     :param enums: A dictionary where the keys are column names, and the values are sets
                   of valid values for that column.
+    :param table_values: The table's values, if they have already been worked out for another constraint.
     :return: A list of InvalidEnumValueFailure objects for any rows with values outside
              the set of valid enum values.
     """
     data_df = data_dict[table]
-    invalid_enum_values = []
+    table_values = table_values or TableValues(data_df)
+    invalid_enum_values: list[user.InvalidEnumValueFailure] = []
 
     for column, valid_enum_values in enums.items():
-        valid_enum_values.add("")  # allow empty string here, picked up later
-        row_is_valid = data_df[column].isin(valid_enum_values)
-        invalid_rows = data_df[~row_is_valid]
+        # allow empty string here, picked up later
+        invalid_positions = np.flatnonzero(~data_df[column].isin({*valid_enum_values, ""}).to_numpy())
 
         # handle melted rows
-        invalid_rows = remove_duplicate_indexes(invalid_rows)
-
-        for _, row in invalid_rows.iterrows():
-            invalid_value = row.get(column)
-            if pd.isna(invalid_value):  # type: ignore[arg-type]
-                continue  # allow na values here
-
-            invalid_enum_values.append(
-                user.InvalidEnumValueFailure(
-                    table=table,
-                    column=column,
-                    row_index=typing.cast(int, row.name),  # safe assumption that it's an int
-                    row_values=tuple(row),
-                )
+        invalid_positions = invalid_positions[~data_df.index[invalid_positions].duplicated(keep="first")]
+
+        # allow na values here
+        invalid_positions = invalid_positions[~table_values.is_null(column)[invalid_positions]]
+
+        invalid_enum_values.extend(
+            user.InvalidEnumValueFailure(
+                table=table,
+                column=column,
+                row_index=typing.cast(int, table_values.label(position)),  # safe assumption that it's an int
+                row_values=tuple(table_values.row(position)),
             )
+            for position in invalid_positions
+        )
 
     return invalid_enum_values
 
@@ -344,6 +546,7 @@ def validate_nullable(
     data_dict: dict[str, pd.DataFrame],
     table: str,
     non_nullable: list[str],
+    table_values: TableValues | None = None,
 ) -> list[user.NonNullableConstraintFailure]:
     """Validate that specified columns do not contain null or empty values.
 
@@ -354,31 +557,39 @@ def validate_nullable(
     :param data_dict: A dictionary of pandas DataFrames, where the keys are the table names.
     :param table: The name of the table to validate.
     :param non_nullable: A list of column names that should not contain null or empty values.
+    :param table_values: The table's values, if they have already been worked out for another constraint.
     :return: A list of NonNullableConstraintFailure objects for any rows violating the non-nullable constraint.
     """
     if not non_nullable:
         return []
 
-    data_df = data_dict[table]
-    non_nullable_constraint_failure = []
+    table_values = table_values or TableValues(data_dict[table])
+
+    # missing columns are picked up by validate_columns
+    columns = [column for column in non_nullable if table_values.column(column) is not None]
+    if not columns:
+        return []
 
-    for idx, row in data_df.iterrows():
-        for column in non_nullable:
-            if is_blank(row[column]):
-                non_nullable_constraint_failure.append(
-                    user.NonNullableConstraintFailure(
-                        table=table,
-                        column=column,
-                        row_index=typing.cast(int, idx),  # safe assumption that it's an int
-                        failed_row=row,
-                    )
-                )
+    # report failures row by row, as they appear in the table
+    is_blank = np.column_stack([table_values.is_blank(column) for column in columns])
+    positions, column_orders = np.nonzero(is_blank)
 
-    return non_nullable_constraint_failure
+    return [
+        user.NonNullableConstraintFailure(
+            table=table,
+            column=columns[column_order],
+            row_index=typing.cast(int, table_values.label(position)),  # safe assumption that it's an int
+            failed_row=table_values.row(position),
+        )
+        for position, column_order in zip(positions, column_orders, strict=True)
+    ]
 
 
 def validate_project_dates(
-    data_dict: dict[str, pd.DataFrame], table: str, project_date_cols: list[str]
+    data_dict: dict[str, pd.DataFrame],
+    table: str,
+    project_date_cols: list[str],
+    table_values: TableValues | None = None,
 ) -> list[user.GenericFailure]:
     """
     Validate that the project start date does not come after the project completion date.
@@ -386,24 +597,37 @@ def validate_project_dates(
     :param data_dict: A dictionary of pandas DataFrames, where the keys are the table names.
     :param table: The name of the table to validate.
     :param project_dates: A list of column names that contain project start and completion dates.
+    :param table_values: The table's values, if they have already been worked out for another constraint.
     :return: A list of GenericFailure objects for any rows with invalid project dates.
     """
-    data_df = data_dict[table]
-    invalid_project_dates: list[user.GenericFailure] = []
-
-    for idx, row in data_df.iterrows():
-        start_date = row.get(project_date_cols[0])
-        completion_date = row.get(project_date_cols[1])
-        if isinstance(start_date, datetime) and isinstance(completion_date, datetime):
-            if start_date > completion_date:
-                invalid_project_dates.append(
-                    user.GenericFailure(
-                        table=table,
-                        section="Projects Progress Summary",
-                        column="Start Date",
-                        row_index=typing.cast(int, idx),  # safe assumption that it's an int
-                        message=msgs.INVALID_PROJECT_DATES,
-                    )
-                )
-
-    return invalid_project_dates
+    table_values = table_values or TableValues(data_dict[table])
+    start_dates = table_values.column(project_date_cols[0])
+    completion_dates = table_values.column(project_date_cols[1])
+    if start_dates is None or completion_dates is None:
+        return []
+
+    def is_datetime(value_type: type) -> bool:
+        return issubclass(value_type, datetime)
+
+    are_dates = _matches_type(start_dates, is_datetime) & _matches_type(completion_dates, is_datetime)
+    starts_after_completion = np.zeros(len(are_dates), dtype=bool)
+    if start_dates.dtype.kind == completion_dates.dtype.kind == "M":
+        starts_after_completion[are_dates] = start_dates[are_dates] > completion_dates[are_dates]
+    else:
+        starts_after_completion[are_dates] = _as_objects(start_dates[are_dates]) > _as_objects(
+            completion_dates[are_dates]
+        )
+
+    return [
+        user.GenericFailure(
+            table=table,
+            section="Projects Progress Summary",
+            column="Start Date",
+            row_index=typing.cast(int, table_values.label(position)),  # safe assumption that it's an int
+            message=msgs.INVALID_PROJECT_DATES,
+        )
+        for position in np.flatnonzero(starts_after_completion)
+    ]
+
+
+ROW_CONSTRAINTS = (validate_types, validate_enums, validate_nullable, validate_project_dates)
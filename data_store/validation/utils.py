@@ -1,5 +1,4 @@
-from enum import StrEnum
-from typing import Any, Type
+from typing import Any
 
 import numpy as np
 import pandas as pd
@@ -55,23 +54,21 @@ def is_blank(value: Any):
     return pd.isna(value) or str(value) == ""
 
 
-def is_from_dropdown(value: Any, dropdown_enum: Type[StrEnum]) -> bool:
-    """Returns True if the value is from the dropdown, otherwise False.
+def blank_values_mask(values: pd.Series) -> np.ndarray:
+    """Returns a boolean mask of the blank values in a Series, as `is_blank` would for each value.
 
-    :param value: value to check is blank
-    :param dropdown_enum: enum representing the dropdown options
-    :return: True if blank, else False
+    :param values: Series to check for blank values
+    :return: True for each blank value, else False
     """
-    return value in {dropdown_value for dropdown_value in dropdown_enum}
+    return (values.isna() | values.astype(object).eq("")).to_numpy()
 
 
-def find_null_values(df: pd.DataFrame, column: str) -> pd.DataFrame:
+def null_values_mask(values: pd.Series) -> np.ndarray:
     """
-    Helper function to find rows with null values in a specified column.
+    Helper function to find the null values in a Series: empty strings and any of pandas' missing value markers.
 
-    :param df: DataFrame to search for invalid rows.
-    :param column: Column name to check for null values.
-    :return: DataFrame containing rows with null values in the specified column.
+    :param values: Series to check for null values.
+    :return: True for each null value, else False.
     """
     na_values = {"", np.nan, None, pd.NA, pd.NaT}
-    return df[df[column].isin(na_values)]
+    return values.isin(na_values).to_numpy()
@@ -7,6 +7,8 @@ from alembic.script import ScriptDirectory
 from alembic.script.base import _slug_re  # sorry to future whoever if they move/change this internal implementation =]
 from flask import current_app
 
+from data_store.reference_data import clear_reference_data_caches
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -128,6 +130,9 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+    # migrations may change reference data, so drop anything this process has cached from before they ran
+    clear_reference_data_caches()
+
     # if we're running on the main db (as opposed to the test db)
     if connectable.url.database == "data_store":
         with open(Path(__file__).parent / ".current-alembic-head", "w") as f:
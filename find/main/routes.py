@@ -1,6 +1,9 @@
 # isort: off
 
+import uuid
+
 from flask import (
+    jsonify,
     redirect,
     render_template,
     request,
@@ -19,7 +22,12 @@ from data_store.controllers.retrieve_submission_file import get_custom_file_name
 from fsd_utils.authentication.config import SupportedApp
 from fsd_utils.authentication.decorators import check_internal_user, login_requested, login_required
 
-from data_store.controllers.async_download import trigger_async_download
+from data_store.controllers.async_download import (
+    get_user_download_job,
+    get_user_download_jobs,
+    serialise_download_job,
+    trigger_async_download,
+)
 from find.main import bp
 from find.main.download_data import (
     FormNames,
@@ -147,6 +155,28 @@ def request_received():
     return render_template("find/main/request-received.html", user_email=g.user.email)
 
 
+@bp.route("/downloads", methods=["GET"])
+@login_required(return_app=SupportedApp.POST_AWARD_FRONTEND)
+@check_internal_user
+def downloads():
+    download_jobs = get_user_download_jobs(g.user.email, limit=Config.DOWNLOAD_JOB_HISTORY_LIMIT)
+    return render_template("find/main/downloads.html", download_jobs=download_jobs)
+
+
+@bp.route("/downloads/<uuid:download_job_id>", methods=["GET"])
+@login_required(return_app=SupportedApp.POST_AWARD_FRONTEND)
+@check_internal_user
+def download_status(download_job_id: uuid.UUID):
+    download_job = get_user_download_job(download_job_id, g.user.email)
+    if download_job is None:
+        return abort(404)
+
+    status = serialise_download_job(download_job)
+    if download_job.file_name:
+        status["download_url"] = url_for(".retrieve_download", filename=download_job.file_name)
+    return jsonify(status)
+
+
 @bp.route("/retrieve-download/<filename>", methods=["GET", "POST"])
 @login_required(return_app=SupportedApp.POST_AWARD_FRONTEND)
 @check_internal_user
@@ -0,0 +1,121 @@
+"""
+Fires a number of ingests in parallel at the configured database and reports throughput, latency and retry counts.
+
+Each ingest runs `ingest` with `do_load=True` in a separate worker process, as it would in a deployed web or Celery
+worker, so ingests of the same programme or for the same fund and reporting round contend for the same rows and locks.
+Retries are counted from the warnings logged by `transaction_retry_wrapper`, which should stay at zero now that
+conflicting ingests are serialised by advisory locks.
+
+The files are successfully ingested (and uploaded to the configured S3 bucket), so only run this against a local
+database and localstack, e.g. from the docker runner.
+
+Usage:
+    python scripts/ingest_concurrency_benchmark.py FILE [FILE ...] --fund NAME --round N [--workers N] [--ingests N]
+
+Examples:
+    FLASK_ENV=development python scripts/ingest_concurrency_benchmark.py \\
+        tests/integration_tests/mock_pf_returns/PF_Round_1_Success.xlsx \\
+        --fund Pathfinders --round 1 --workers 8 --ingests 32
+"""
+
+import argparse
+import logging
+import multiprocessing
+import statistics
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from itertools import cycle, islice
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+_app = None
+
+
+class _RetryCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.retries = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if getattr(record, "retry", None) is not None:
+            self.retries += 1
+
+
+@dataclass
+class IngestRun:
+    file: str
+    status_code: int
+    duration: float
+    retries: int
+
+
+def _init_worker() -> None:
+    global _app
+    from app import app
+
+    _app = app
+
+
+def run_ingest(args: tuple[str, str, int]) -> IngestRun:
+    """Ingests a single file, counting the retries logged while it runs.
+
+    :param args: the path to the file, the fund name and the reporting round
+    :return: the outcome of the ingest
+    """
+    from werkzeug.datastructures import FileStorage
+
+    from data_store.const import EXCEL_MIMETYPE
+    from data_store.controllers.ingest import ingest
+
+    if _app is None:
+        raise RuntimeError("The worker's Flask app was not created")
+
+    file_path, fund_name, reporting_round = args
+    retry_counter = _RetryCounter()
+    with _app.app_context(), open(file_path, "rb") as file:
+        _app.logger.addHandler(retry_counter)
+        start = time.perf_counter()
+        try:
+            _, status_code = ingest(
+                excel_file=FileStorage(file, filename=Path(file_path).name, content_type=EXCEL_MIMETYPE),
+                fund_name=fund_name,
+                reporting_round=reporting_round,
+                do_load=True,
+                auth=None,
+            )
+        except Exception:
+            status_code = 500
+        finally:
+            _app.logger.removeHandler(retry_counter)
+        return IngestRun(file_path, status_code, time.perf_counter() - start, retry_counter.retries)
+
+
+def report(runs: list[IngestRun], wall_time: float, workers: int) -> None:
+    durations = sorted(run.duration for run in runs)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+
+    print(f"\n{len(runs)} ingests with {workers} workers in {wall_time:.2f}s")
+    print(f"throughput: {len(runs) / wall_time:.2f} ingests/s")
+    print(f"latency: median {statistics.median(durations):.2f}s, p95 {p95:.2f}s, max {durations[-1]:.2f}s")
+    print(f"status codes: {dict(Counter(run.status_code for run in runs))}")
+    print(f"retries: {sum(run.retries for run in runs)} across {sum(1 for run in runs if run.retries)} ingests")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent ingests against the configured database.")
+    parser.add_argument("files", nargs="+", help="Spreadsheet(s) to ingest, used in turn")
+    parser.add_argument("--fund", required=True, choices=["Towns Fund", "Pathfinders"], help="Fund of the files")
+    parser.add_argument("--round", type=int, required=True, help="Reporting round of the files")
+    parser.add_argument("--workers", type=int, default=4, help="Number of ingests to run at once")
+    parser.add_argument("--ingests", type=int, default=16, help="Total number of ingests")
+    args = parser.parse_args()
+
+    jobs = [(file, args.fund, args.round) for file in islice(cycle(args.files), args.ingests)]
+    start = time.perf_counter()
+    # spawn, so that each worker has its own database connections and module state
+    with multiprocessing.get_context("spawn").Pool(args.workers, initializer=_init_worker) as pool:
+        runs = pool.map(run_ingest, jobs)
+    report(runs, time.perf_counter() - start, args.workers)
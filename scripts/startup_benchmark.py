@@ -0,0 +1,137 @@
+"""
+Measures the cold-start cost of the application's entry points using `python -X importtime`.
+
+Each entry point is imported in a fresh interpreter so that nothing is shared between runs. The importtime output is
+parsed to report the total wall-clock import time, the peak resident memory (RSS) of the interpreter and the modules
+with the largest self and cumulative import times, which makes it easy to spot when something expensive (e.g. creating
+a boto3 client or importing every fund's ingest machinery) starts happening at import.
+
+Usage:
+    python scripts/startup_benchmark.py [--entry-point NAME ...] [--repeat N] [--top N]
+
+Examples:
+    FLASK_ENV=development python scripts/startup_benchmark.py
+    FLASK_ENV=development python scripts/startup_benchmark.py --entry-point wsgi --repeat 5 --top 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+ENTRY_POINTS: dict[str, list[str]] = {
+    "wsgi": ["-c", "import wsgi"],
+    # mirrors `celery -A app.celery_app worker`, without starting the consumer
+    "celery-worker": [
+        "-c",
+        "import celery.apps.worker; from app import celery_app; celery_app.loader.import_default_modules()",
+    ],
+    "flask-cli": ["-m", "flask", "--help"],
+}
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Parses the stderr output of `python -X importtime` into a list of per-module timings.
+
+    :param stderr: the stderr output of the interpreter
+    :return: a list of ImportTiming, one per imported module
+    """
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            # header line
+            continue
+        timings.append(ImportTiming(module.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+@dataclass
+class StartupRun:
+    wall_time: float
+    max_rss_mb: float
+    timings: list[ImportTiming]
+
+
+def run_entry_point(args: list[str]) -> StartupRun:
+    """Runs an entry point in a fresh interpreter with import timing enabled.
+
+    The child is reaped with `os.wait4` so that its own resource usage, rather than the cumulative usage of every child
+    this process has waited on, is reported.
+
+    :param args: interpreter arguments for the entry point
+    :return: the wall-clock time, peak RSS and parsed import timings of the run
+    """
+    env = {"FLASK_APP": "app.py", **os.environ}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stderr is not None
+    stderr = process.stderr.read()
+    _, status, rusage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, process.args, stderr=stderr)
+
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    max_rss_mb = rusage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return StartupRun(elapsed, max_rss_mb, parse_importtime(stderr))
+
+
+def report(name: str, runs: list[StartupRun], top: int) -> None:
+    wall_times = [run.wall_time for run in runs]
+    max_rss = [run.max_rss_mb for run in runs]
+    timings = runs[-1].timings
+
+    print(f"\n=== {name} ===")
+    print(f"wall time: median {statistics.median(wall_times):.3f}s, min {min(wall_times):.3f}s ({len(runs)} runs)")
+    print(f"peak RSS: median {statistics.median(max_rss):.1f}MB, max {max(max_rss):.1f}MB")
+
+    print(f"\ntop {top} modules by self time:")
+    for timing in sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]:
+        print(f"  {timing.self_us / 1000:9.1f}ms  {timing.module}")
+
+    print(f"\ntop {top} first-party modules by cumulative time:")
+    first_party = ("app", "wsgi", "config", "data_store", "find", "submit", "admin", "common")
+    first_party_timings = [t for t in timings if t.module.split(".")[0] in first_party]
+    for timing in sorted(first_party_timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        print(f"  {timing.cumulative_us / 1000:9.1f}ms  {timing.module}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the application's entry points.")
+    parser.add_argument(
+        "--entry-point",
+        action="append",
+        choices=list(ENTRY_POINTS),
+        help="Entry point(s) to benchmark (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Number of cold starts per entry point")
+    parser.add_argument("--top", type=int, default=10, help="Number of modules to list")
+    args = parser.parse_args()
+
+    for name in args.entry_point or list(ENTRY_POINTS):
+        runs = [run_entry_point(ENTRY_POINTS[name]) for _ in range(args.repeat)]
+        report(name, runs, args.top)
@@ -0,0 +1,117 @@
+"""
+Times the Towns Fund schema validation against transformed Towns Fund returns.
+
+Each file is read, transformed and cast to the round's schema as it would be on ingest, then `validations` is run on
+the result, and each of its constraints is timed on its own. Tables can be repeated `--scale` times to see how
+validation grows with the number of rows (repeated rows fail the uniqueness constraints, so expect failures). Run it
+before and after changing `data_store.validation.towns_fund.schema_validation.validate` to compare.
+
+Usage:
+    python scripts/tf_validation_benchmark.py FILE ROUND [FILE ROUND ...] [--scale N] [--repeat N]
+
+Examples:
+    FLASK_ENV=development python scripts/tf_validation_benchmark.py \\
+        tests/integration_tests/mock_tf_returns/TF_Round_3_Success.xlsx 3 \\
+        tests/integration_tests/mock_tf_returns/TF_Round_4_Success.xlsx 4 --scale 20
+"""
+
+import argparse
+import copy
+import statistics
+import sys
+import time
+import typing
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data_store.controllers.ingest_dependencies import TFIngestDependencies, ingest_dependencies_factory  # noqa: E402
+from data_store.validation.towns_fund.schema_validation.casting import cast_to_schema  # noqa: E402
+from data_store.validation.towns_fund.schema_validation.validate import (  # noqa: E402
+    compile_table_plan,
+    validations,
+)
+
+
+def transformed_return(path: str, reporting_round: int, scale: int) -> tuple[dict[str, pd.DataFrame], dict]:
+    """Reads, transforms and casts a Towns Fund return, as ingest does before validating it.
+
+    :param path: path to the Excel file
+    :param reporting_round: the round the return is for
+    :param scale: number of times to repeat each table's rows
+    :return: the transformed tables and the round's validation schema
+    """
+    ingest_dependencies = ingest_dependencies_factory("Towns Fund", reporting_round)
+    if not isinstance(ingest_dependencies, TFIngestDependencies):
+        raise ValueError(f"No Towns Fund ingest dependencies for round {reporting_round}")
+    workbook = typing.cast(
+        dict[str, pd.DataFrame],
+        pd.read_excel(
+            path, sheet_name=None, header=None, index_col=None, engine="openpyxl", na_values=[""], keep_default_na=False
+        ),
+    )
+    data_dict = ingest_dependencies.transform(workbook, reporting_round)
+    cast_to_schema(data_dict, ingest_dependencies.validation_schema)
+    if scale > 1:
+        data_dict = {
+            table: pd.concat([df] * scale).set_axis(range(len(df) * scale), axis=0) if len(df) else df
+            for table, df in data_dict.items()
+        }
+    return data_dict, ingest_dependencies.validation_schema
+
+
+def time_run(run: Callable[[dict[str, pd.DataFrame], dict], list], data_dict: dict, schema: dict, repeat: int):
+    timings = []
+    failures = 0
+    for _ in range(repeat):
+        # constraints may modify the tables and schema, so each run gets its own copies
+        tables = {table: df.copy() for table, df in data_dict.items()}
+        table_schemas = copy.deepcopy(schema)
+        start = time.perf_counter()
+        failures = len(run(tables, table_schemas))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), failures
+
+
+def constraint_runner(constraint: Callable) -> Callable[[dict[str, pd.DataFrame], dict], list]:
+    def run(data_dict: dict[str, pd.DataFrame], schema: dict) -> list:
+        failures = []
+        for table, df in data_dict.items():
+            if df.empty:
+                continue
+            for validation_func, schema_section in compile_table_plan(schema[table]).constraints:
+                if validation_func is constraint:
+                    failures.extend(validation_func(data_dict, table, schema_section))
+        return failures
+
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Towns Fund schema validation.")
+    parser.add_argument("returns", nargs="+", help="Pairs of an Excel file and the round it is for")
+    parser.add_argument("--scale", type=int, default=1, help="Number of times to repeat each table's rows")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times to run each validation")
+    args = parser.parse_args()
+    if len(args.returns) % 2:
+        parser.error("each file must be followed by its round")
+
+    for path, reporting_round in zip(args.returns[::2], map(int, args.returns[1::2]), strict=True):
+        data_dict, schema = transformed_return(path, reporting_round, args.scale)
+        print(f"{Path(path).name}, round {reporting_round}, {sum(len(df) for df in data_dict.values())} rows")
+
+        duration, failures = time_run(validations, data_dict, schema, args.repeat)
+        print(f"  {'validations':<32} {duration * 1000:9.1f}ms  {failures} failures")
+
+        constraints = {
+            validation_func
+            for table_schema in schema.values()
+            for validation_func, _ in compile_table_plan(table_schema).constraints
+        }
+        for constraint in sorted(constraints, key=lambda func: func.__name__):
+            duration, failures = time_run(constraint_runner(constraint), data_dict, schema, args.repeat)
+            print(f"    {constraint.__name__:<30} {duration * 1000:9.1f}ms  {failures} failures")
+        print()
@@ -0,0 +1,109 @@
+"""
+Times the custom Pathfinders pandera checks against a large synthetic table.
+
+Each check validates a column of values like those read from a Pathfinders return (mostly valid, with a few invalid,
+blank and wrongly typed cells), on its own and then together in a single schema, as `TableValidator` would run them.
+Run it before and after changing `data_store.validation.pathfinders.schema_validation.checks` to compare.
+
+Usage:
+    python scripts/validation_checks_benchmark.py [--rows N] [--repeat N] [--invalid FRACTION]
+
+Examples:
+    python scripts/validation_checks_benchmark.py --rows 100000 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pandera as pa
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from data_store.validation.pathfinders.schema_validation import checks  # noqa: E402
+
+RAGS = ["1 - Red", "2 - Amber/Red", "3 - Amber", "4 - Amber/Green", "5 - Green"]
+POSTCODES = ["SW1A 1AA", "M1 1AE", "CR2 6XH", "DN55 1PT", "EC1A 1BB"]
+WORDS = "the project has been delivered on time and within the allocated budget for this quarter".split()
+
+
+def synthetic_table(rows: int, invalid: float, seed: int = 0) -> pd.DataFrame:
+    """Creates a table with a column for each check, as object columns like those extracted from a workbook.
+
+    :param rows: number of rows
+    :param invalid: fraction of cells that are invalid or blank
+    :param seed: random seed, so that runs are comparable
+    :return: the table
+    """
+    rnd = random.Random(seed)
+    start = datetime(2020, 1, 1)
+
+    def cell(valid, bad):
+        roll = rnd.random()
+        if roll < invalid / 2:
+            return bad()
+        if roll < invalid:
+            return float("nan")
+        return valid()
+
+    columns = {
+        "Date": (lambda: start + timedelta(days=rnd.randrange(1500)), lambda: "not a date"),
+        "Whole number": (lambda: float(rnd.randrange(100)), lambda: "several"),
+        "Amount": (lambda: rnd.uniform(0, 1e6), lambda: "£1m"),
+        "Commentary": (lambda: " ".join(rnd.choices(WORDS, k=rnd.randrange(5, 100))), lambda: " ".join(WORDS * 10)),
+        "Postcodes": (lambda: ", ".join(rnd.sample(POSTCODES, rnd.randrange(1, 3))), lambda: "Town Hall"),
+        "RAG rating": (lambda: rnd.choice(RAGS), lambda: "Green"),
+    }
+    data = {name: [cell(valid, bad) for _ in range(rows)] for name, (valid, bad) in columns.items()}
+    return pd.DataFrame(data, dtype=object)
+
+
+CHECKS = {
+    "Date": checks.is_datetime(),
+    "Whole number": checks.is_int(),
+    "Amount": checks.is_float(),
+    "Commentary": checks.max_word_count(100),
+    "Postcodes": checks.postcode_list(),
+    "RAG rating": checks.is_in(RAGS),
+}
+
+
+def time_validation(schema: pa.DataFrameSchema, df: pd.DataFrame, repeat: int) -> tuple[float, int]:
+    timings = []
+    failures = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            schema.validate(df, lazy=True)
+        except pa.errors.SchemaErrors as errors:
+            failures = len(errors.failure_cases)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the custom Pathfinders pandera checks.")
+    parser.add_argument("--rows", type=int, default=50_000, help="Number of rows in the synthetic table")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to run each validation")
+    parser.add_argument("--invalid", type=float, default=0.01, help="Fraction of invalid or blank cells")
+    args = parser.parse_args()
+
+    table = synthetic_table(args.rows, args.invalid)
+    print(f"{args.rows} rows, median of {args.repeat} runs\n")
+    for column, check in CHECKS.items():
+        duration, failures = time_validation(
+            pa.DataFrameSchema({column: pa.Column(checks=[check], nullable=True)}), table[[column]], args.repeat
+        )
+        print(f"  {check.name:<16} {duration * 1000:9.1f}ms  {failures} failures")
+
+    duration, failures = time_validation(
+        pa.DataFrameSchema({column: pa.Column(checks=[check], nullable=True) for column, check in CHECKS.items()}),
+        table,
+        args.repeat,
+    )
+    print(f"\n  {'all checks':<16} {duration * 1000:9.1f}ms  {failures} failures")
@@ -0,0 +1,124 @@
+"""
+Times turning validation failures into grouped validation messages as the number of failures grows.
+
+A badly broken submission can produce tens of thousands of failures. Each is converted to a message, and then
+`failures_to_messages` de-duplicates them, removes the errors already caught by a null failure and groups the rest. This
+generates that many messages, spread over a workbook's sheets and sections with a share of null failures, duplicates
+and errors on cells that a null failure already covers, and times each step. The time per failure should stay flat as
+the number of failures grows. Run it before and after changing `data_store.messaging.messaging` to compare.
+
+Usage:
+    python scripts/validation_messages_benchmark.py [--failures N [N ...]] [--repeat N]
+
+Examples:
+    FLASK_ENV=development python scripts/validation_messages_benchmark.py --failures 1000 10000 50000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+# the validation modules have to be imported before messaging, which depends on them
+import data_store.validation  # noqa: E402, F401
+from data_store.messaging import Message, MessengerBase  # noqa: E402
+from data_store.messaging.messaging import (  # noqa: E402
+    failures_to_messages,
+    group_validation_messages,
+    remove_errors_already_caught_by_null_failure,
+)
+from data_store.messaging.tf_messaging import SharedMessages as msgs  # noqa: E402
+from data_store.validation.towns_fund.failures.user import GenericFailure  # noqa: E402
+
+SHEETS = ("Project Admin", "Funding Profiles", "Project Outputs", "Outcomes", "Risk Register", "Review & Sign-Off")
+SECTIONS = ("Project 1", "Project 2", "Project 3", "Programme")
+DESCRIPTIONS = (msgs.DROPDOWN, msgs.WRONG_TYPE_NUMERICAL, msgs.DUPLICATION, msgs.NEGATIVE_NUMBER, msgs.POSTCODE)
+NULL_DESCRIPTIONS = (msgs.BLANK, msgs.BLANK_ZERO)
+
+
+class PrebuiltMessenger(MessengerBase):
+    """Returns prebuilt messages, one per failure, so that only the messaging itself is timed."""
+
+    def __init__(self, messages: list[Message]):
+        self.messages = iter(messages)
+
+    def to_message(self, validation_failure) -> Message:
+        return next(self.messages)
+
+
+def generate_messages(count: int, seed: int = 0) -> list[Message]:
+    """Generates messages like those made from the failures of a badly broken submission.
+
+    About a fifth are null failures, a tenth repeat an earlier message and some of the rest are on cells that a null
+    failure already covers.
+
+    :param count: number of messages to generate
+    :param seed: seed for the random choices
+    :return: the messages
+    """
+    rng = random.Random(seed)
+    rows = max(count // 10, 10)
+    columns = [chr(ord("A") + i) for i in range(26)]
+    messages: list[Message] = []
+    for _ in range(count):
+        if messages and rng.random() < 0.1:
+            previous = rng.choice(messages)
+            messages.append(
+                Message(
+                    previous.sheet, previous.section, previous.cell_indexes, previous.description, previous.error_type
+                )
+            )
+            continue
+        is_null_failure = rng.random() < 0.2
+        cell_indexes = tuple(f"{rng.choice(columns)}{rng.randint(1, rows)}" for _ in range(rng.choice((1, 1, 1, 2, 5))))
+        messages.append(
+            Message(
+                sheet=rng.choice(SHEETS),
+                section=rng.choice(SECTIONS),
+                cell_indexes=cell_indexes,
+                description=rng.choice(NULL_DESCRIPTIONS if is_null_failure else DESCRIPTIONS),
+                error_type="NonNullableConstraintFailure" if is_null_failure else "GenericFailure",
+            )
+        )
+    return messages
+
+
+def time_step(step: Callable[[list[Message]], list[Message]], count: int, repeat: int) -> tuple[float, int]:
+    timings = []
+    output = []
+    for _ in range(repeat):
+        # steps may change the messages they are given, so each run gets its own
+        messages = generate_messages(count)
+        start = time.perf_counter()
+        output = step(messages)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(output)
+
+
+def end_to_end(messages: list[Message]) -> list[Message]:
+    return failures_to_messages([GenericFailure("_", "_", "_", "_")] * len(messages), PrebuiltMessenger(messages))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark turning validation failures into grouped messages.")
+    parser.add_argument(
+        "--failures", nargs="+", type=int, default=[1000, 5000, 10000, 25000, 50000], help="Numbers of failures"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to run each step")
+    args = parser.parse_args()
+
+    steps = {
+        "failures_to_messages": end_to_end,
+        "remove_errors_already_caught": remove_errors_already_caught_by_null_failure,
+        "group_validation_messages": group_validation_messages,
+    }
+    print(f"{'failures':>9}  {'step':<30} {'total':>10}  {'per failure':>12}  messages")
+    for count in args.failures:
+        for name, step in steps.items():
+            duration, messages = time_step(step, count, args.repeat)
+            print(f"{count:>9}  {name:<30} {duration * 1000:8.1f}ms  {duration / count * 1e6:10.2f}us  {messages}")
@@ -1,7 +1,9 @@
 import logging
+from datetime import datetime
 from enum import Enum
 
 import pytest
+from bs4 import BeautifulSoup
 from sqlalchemy import desc
 from werkzeug.datastructures import FileStorage, MultiDict
 
@@ -10,6 +12,7 @@ from data_store.const import EXCEL_MIMETYPE, OrganisationTypeEnum
 from data_store.controllers.ingest import ingest
 from data_store.db import db
 from data_store.db.entities import Organisation, Submission
+from data_store.profiling import ProfileStore, profile_name
 
 
 class TestReingestS3AdminView:
@@ -46,6 +49,7 @@ class TestReingestFileAdminView:
             .order_by(desc(Submission.submission_date))
             .first()
         )
+        caplog.clear()
 
         with open(towns_fund_round_3_success_file_path, "rb") as tf_r3:
             with caplog.at_level(logging.WARNING):
@@ -185,3 +189,41 @@ def test_organisationadmin_on_model_change(test_client_reset, admin_test_client,
     assert instance_attempted_to_edit.organisation_name == "Original Name"
     assert instance_attempted_to_edit.external_reference_code == "Original Code"
     assert instance_attempted_to_edit.organisation_type == OrganisationTypeEnum.LOCAL_AUTHORITY
+
+
+class TestProfilesAdminView:
+    @pytest.fixture
+    def profiles(self, admin_test_client, tmp_path, monkeypatch):
+        monkeypatch.setitem(admin_test_client.application.config, "SAMPLING_PROFILER_DIR", str(tmp_path))
+        store = ProfileStore(bucket=None, directory=tmp_path, retention=10)
+        names = [
+            profile_name(datetime(2024, 1, 1), 2.5, "submit.upload"),
+            profile_name(datetime(2024, 1, 2), 0.5, "find.download"),
+        ]
+        for name in names:
+            store.save(name, b"a;b 1\n")
+        return names
+
+    def test_list(self, admin_test_client, profiles):
+        response = admin_test_client.get("/admin/profiles/")
+        assert response.status_code == 200
+        page = BeautifulSoup(response.text, "html.parser")
+        assert [row.select("td")[1].text for row in page.select("tbody tr")] == ["find.download", "submit.upload"]
+
+        response = admin_test_client.get("/admin/profiles/?sort=duration")
+        page = BeautifulSoup(response.text, "html.parser")
+        assert [row.select("td")[1].text for row in page.select("tbody tr")] == ["submit.upload", "find.download"]
+
+        response = admin_test_client.get("/admin/profiles/?source=find.download")
+        page = BeautifulSoup(response.text, "html.parser")
+        assert [row.select("td")[1].text for row in page.select("tbody tr")] == ["find.download"]
+
+    def test_download(self, admin_test_client, profiles):
+        response = admin_test_client.get(f"/admin/profiles/{profiles[0]}")
+        assert response.status_code == 200
+        assert response.data == b"a;b 1\n"
+        assert response.headers["Content-Disposition"] == f'attachment; filename="{profiles[0]}"'
+
+        response = admin_test_client.get("/admin/profiles/20240101T000000000000_1ms_missing.collapsed")
+        assert response.status_code == 302
+        assert response.location == "/admin/profiles/"
@@ -140,12 +140,13 @@ class TestAdminModelsAuthorization:
 
 
 class TestAdminActionsAuthorization:
-    actions = (
+    form_actions = (
         "reingest_s3",
         "reingest_file",
         "retrieve_submission",
         "retrieve_failed_submission",
     )
+    actions = form_actions + ("profiles",)
 
     def test_all_actions_captured(self, find_test_client):
         from admin import actions
@@ -176,7 +177,7 @@ class TestAdminActionsAuthorization:
                 assert response.location.startswith("http://authenticator.communities.gov.localhost:4004/")
 
     @pytest.mark.parametrize("has_admin_role", [True, False])
-    @pytest.mark.parametrize("admin_view_name", actions)
+    @pytest.mark.parametrize("admin_view_name", form_actions)
     def test_post_authorization(self, request, has_admin_role, seeded_test_client, admin_view_name):
         client = request.getfixturevalue("admin_test_client" if has_admin_role else "find_test_client")
 
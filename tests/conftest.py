@@ -12,6 +12,7 @@ since these reset the DB at a function scope, they have the biggest impact on pe
 """
 
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any, BinaryIO, Generator
@@ -28,7 +29,7 @@ import config
 from app import create_app
 from config import Config
 from config.envs.unit_test import UnitTestConfig
-from data_store.aws import _S3_CLIENT
+from data_store.aws import get_s3_client
 from data_store.const import GeographyIndicatorEnum, OrganisationTypeEnum
 from data_store.db import db
 from data_store.db.entities import (
@@ -48,7 +49,13 @@ from data_store.db.entities import (
     RiskRegister,
     Submission,
 )
-from data_store.reference_data import seed_fund_table, seed_geospatial_dim_table, seed_reporting_round_table
+from data_store.db.query_profiler import QueryProfile, profile_queries
+from data_store.reference_data import (
+    clear_reference_data_caches,
+    seed_fund_table,
+    seed_geospatial_dim_table,
+    seed_reporting_round_table,
+)
 from data_store.util import load_example_data
 from submit.main.fund import TOWNS_FUND_APP_CONFIG
 from tests.resources.pathfinders.pf_r1_extracted_data import get_pf_r1_extracted_data
@@ -126,6 +133,7 @@ def test_session() -> Generator[FlaskClient, None, None]:
             yield test_client
             db.session.remove()
             db.drop_all()
+            clear_reference_data_caches()
 
 
 @pytest.fixture(scope="module")
@@ -157,6 +165,7 @@ def test_client(test_session: FlaskClient) -> Generator[FlaskClient, None, None]
     db.session.execute(text("SET session_replication_role = DEFAULT"))
     db.session.commit()
     db.session.remove()
+    clear_reference_data_caches()
 
 
 @pytest.fixture(scope="function")
@@ -262,6 +271,7 @@ def test_client_reset(test_client: FlaskClient) -> Generator[FlaskClient, None,
     db.session.execute(text("SET session_replication_role = DEFAULT"))
     db.session.commit()
     db.session.remove()
+    clear_reference_data_caches()
 
 
 @pytest.fixture(scope="module")
@@ -786,17 +796,17 @@ def non_internal_user_find_test_client(mocked_pf_auth) -> Generator[FlaskClient,
 
 def create_bucket(bucket: str):
     """Helper function that creates a specified bucket if it doesn't already exist."""
-    if bucket not in {bucket_obj["Name"] for bucket_obj in _S3_CLIENT.list_buckets()["Buckets"]}:
-        _S3_CLIENT.create_bucket(Bucket=bucket, CreateBucketConfiguration={"LocationConstraint": "eu-central-1"})
+    if bucket not in {bucket_obj["Name"] for bucket_obj in get_s3_client().list_buckets()["Buckets"]}:
+        get_s3_client().create_bucket(Bucket=bucket, CreateBucketConfiguration={"LocationConstraint": "eu-central-1"})
 
 
 def delete_bucket(bucket: str):
     """Helper function that deletes all objects in a specified bucket and then deletes the bucket."""
-    s3_objects_response = _S3_CLIENT.list_objects_v2(Bucket=bucket)
+    s3_objects_response = get_s3_client().list_objects_v2(Bucket=bucket)
     if "Contents" in s3_objects_response:
         s3_objects: list[ObjectIdentifierTypeDef] = [{"Key": obj["Key"]} for obj in s3_objects_response["Contents"]]
-        _S3_CLIENT.delete_objects(Bucket=bucket, Delete={"Objects": s3_objects})
-    _S3_CLIENT.delete_bucket(Bucket=bucket)
+        get_s3_client().delete_objects(Bucket=bucket, Delete={"Objects": s3_objects})
+    get_s3_client().delete_bucket(Bucket=bucket)
 
 
 @pytest.fixture(scope="module")
@@ -907,3 +917,28 @@ def test_organisation(test_session):
     db.session.commit()
 
     return org
+
+
+@pytest.fixture(scope="function")
+def query_budget():
+    """
+    Asserts that no more than a given number of SQL statements are issued within a block, eg.
+
+        with query_budget(50):
+            ingest(...)
+
+    so that changes that add per-row queries (eg. FK lookups) fail loudly instead of slowing things down unnoticed.
+
+    :return: a context manager taking the maximum number of statements, and yielding the query profile.
+    """
+
+    @contextmanager
+    def _query_budget(max_statements: int) -> Generator[QueryProfile, None, None]:
+        with profile_queries(max_slowest=10) as profile:
+            yield profile
+        assert profile.statement_count <= max_statements, (
+            f"{profile.statement_count} SQL statements issued, over the budget of {max_statements}. "
+            f"Slowest: {profile.to_dict()['slowest']}"
+        )
+
+    return _query_budget
@@ -6,7 +6,7 @@ from pandas.testing import assert_frame_equal
 from werkzeug.datastructures import FileStorage
 
 from config import Config
-from data_store.aws import _S3_CLIENT
+from data_store.aws import get_s3_client
 from data_store.const import EXCEL_MIMETYPE
 from data_store.controllers.admin_tasks import reingest_file, reingest_files
 from data_store.controllers.ingest import ingest
@@ -40,6 +40,27 @@ def test_reingest_file(
     assert out.strip() == ("Successfully re-ingested submission S-R03-1")
 
 
+def test_reingest_file_differential(
+    test_client_reset, test_buckets, towns_fund_round_3_file_success, towns_fund_round_3_success_file_path, capfd
+):
+    """
+    Tests that a differential reingestion of an unchanged file only updates the submission date.
+    """
+    ingest(
+        fund_name="Towns Fund",
+        reporting_round=3,
+        do_load=True,
+        excel_file=FileStorage(towns_fund_round_3_file_success, content_type=EXCEL_MIMETYPE),
+    )
+    db.session.close()  # Close the existing db session before re-ingesting the file
+
+    reingest_file(towns_fund_round_3_success_file_path, "S-R03-1", differential_load=True)
+    out, error = capfd.readouterr()
+    assert out.splitlines()[0] == "Successfully re-ingested submission S-R03-1"
+    # the submission date is set at ingest, so is the only row that changes
+    assert out.splitlines()[1].startswith("Rows touched: 1 {'Submission_Ref': {'inserted': 0, 'updated': 1,")
+
+
 def test_reingest_files(
     test_client_reset,
     test_buckets,
@@ -77,7 +98,7 @@ def test_reingest_files(
         .distinct()
         .one()[0]
     )
-    _S3_CLIENT.delete_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=f"PF/{pf_submission_uuid}")
+    get_s3_client().delete_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=f"PF/{pf_submission_uuid}")
 
     db.session.close()  # Close the existing db session before re-ingesting the file
 
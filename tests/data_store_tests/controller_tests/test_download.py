@@ -4,7 +4,13 @@ import pandas as pd
 import pytest
 
 from data_store.const import EXCEL_MIMETYPE
-from data_store.controllers.download import download, sort_output_dataframes
+from data_store.controllers.download import (
+    assemble_download_parts,
+    download,
+    download_sheet_part,
+    sort_output_dataframes,
+)
+from data_store.serialisation.data_serialiser import DOWNLOAD_SHEETS
 
 
 def test_invalid_file_format(test_session):
@@ -39,6 +45,37 @@ def test_download_excel_format_empty_db(test_session):
     assert response_file.content_type == EXCEL_MIMETYPE
 
 
+@pytest.mark.parametrize("filters", [{}, {"funds": ["HS"], "outcome_categories": ["Place"]}])
+def test_assembled_json_parts_match_download(seeded_test_client, filters):
+    parts = [(sheet, download_sheet_part("json", sheet, **filters)[0]) for sheet in DOWNLOAD_SHEETS]
+
+    assembled = assemble_download_parts("json", parts)
+
+    assert assembled.content_type == "application/json"
+    assert assembled.stream.read() == download(file_format="json", **filters).stream.read()
+
+
+def test_assembled_excel_parts_match_download(seeded_test_client):
+    parts = [(sheet, download_sheet_part("xlsx", sheet)[0]) for sheet in DOWNLOAD_SHEETS]
+
+    assembled = assemble_download_parts("xlsx", parts)
+
+    assert assembled.content_type == EXCEL_MIMETYPE
+    assembled_sheets = pd.read_excel(assembled.stream, sheet_name=None)
+    downloaded_sheets = pd.read_excel(download(file_format="xlsx").stream, sheet_name=None)
+    assert list(assembled_sheets) == list(downloaded_sheets) == DOWNLOAD_SHEETS
+    for sheet in DOWNLOAD_SHEETS:
+        pd.testing.assert_frame_equal(assembled_sheets[sheet], downloaded_sheets[sheet])
+
+
+def test_download_sheet_part_counts_rows(seeded_test_client):
+    _, rows = download_sheet_part("json", "ProjectDetails")
+    _, no_rows = download_sheet_part("json", "ProjectDetails", funds=["PF"])
+
+    assert rows > 0
+    assert no_rows == 0
+
+
 def test_sort_columns_function(test_session):
     """Test dataframe sorted according to primary and secondary columns defined in constants dict."""
 
@@ -3,6 +3,7 @@ from urllib.parse import parse_qs, unquote, urlparse
 
 import pytest
 
+from data_store.aws import get_s3_client
 from data_store.controllers.failed_submission import get_failed_submission
 
 
@@ -28,8 +29,9 @@ def test_get_failed_submission_failure_file_not_found(test_session, mocker):
     valid_uuid = uuid.uuid4()
     different_uuid = uuid.uuid4()
     mock_response = {"Contents": [{"Key": f"{different_uuid}_2024-07-09T10:47:2.xlsx"}]}
-    mocker.patch(
-        "data_store.aws._S3_CLIENT.list_objects_v2",
+    mocker.patch.object(
+        get_s3_client(),
+        "list_objects_v2",
         return_value=mock_response,
     )
     with pytest.raises(FileNotFoundError) as e:
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+from data_store.controllers.ingest_dependencies import (
+    PFIngestDependencies,
+    TFIngestDependencies,
+    ingest_dependencies_factory,
+)
+
+
+@pytest.mark.parametrize(
+    "fund, reporting_round, expected_type",
+    [
+        ("Towns Fund", 3, TFIngestDependencies),
+        ("Towns Fund", 4, TFIngestDependencies),
+        ("Towns Fund", 5, TFIngestDependencies),
+        ("Towns Fund", 6, TFIngestDependencies),
+        ("Towns Fund", 7, TFIngestDependencies),
+        ("Pathfinders", 1, PFIngestDependencies),
+        ("Pathfinders", 2, PFIngestDependencies),
+        ("Pathfinders", 3, PFIngestDependencies),
+    ],
+)
+def test_ingest_dependencies_factory(fund, reporting_round, expected_type):
+    assert isinstance(ingest_dependencies_factory(fund, reporting_round), expected_type)
+
+
+@pytest.mark.parametrize("fund, reporting_round", [("Towns Fund", 1), ("Pathfinders", 99), ("Unknown Fund", 1)])
+def test_ingest_dependencies_factory_unsupported(fund, reporting_round):
+    assert ingest_dependencies_factory(fund, reporting_round) is None
+
+
+def test_ingest_dependencies_factory_imports_round_modules_on_first_use():
+    """Runs in a fresh interpreter, as other tests will already have imported the round-specific modules."""
+    round_modules = [
+        "data_store.table_extraction.config.pf_r3_config",
+        "data_store.transformation.pathfinders.pf_transform_r3",
+        "data_store.transformation.towns_fund.tf_transform_r3",
+        "data_store.validation.towns_fund.fund_specific_validation.fs_validate_r4",
+    ]
+    code = f"""
+import sys
+from data_store.controllers.ingest_dependencies import ingest_dependencies_factory
+round_modules = {round_modules!r}
+assert not any(module in sys.modules for module in round_modules)
+ingest_dependencies_factory("Pathfinders", 3)
+assert "data_store.transformation.pathfinders.pf_transform_r3" in sys.modules
+assert "data_store.transformation.towns_fund.tf_transform_r3" not in sys.modules
+"""
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,52 @@
+from sqlalchemy import select, text
+
+import config
+from app import create_app
+from data_store.db import db
+from data_store.db.entities import Fund
+from data_store.db.query_profiler import profile_queries
+
+
+def test_profile_queries_counts_statements_in_nested_profiles(test_session):
+    with profile_queries() as outer:
+        db.session.execute(text("SELECT 1"))
+        with profile_queries(max_slowest=1) as inner:
+            db.session.execute(select(Fund))
+            db.session.execute(text("SELECT 2"))
+
+    db.session.execute(text("SELECT 3"))
+
+    assert outer.statement_count == 3
+    assert inner.statement_count == 2
+    assert outer.total_time >= inner.total_time > 0
+    assert len(inner.slowest) == 1
+    assert inner.to_dict()["slowest"][0]["duration"] == round(max(inner.slowest)[0], 4)
+
+
+def test_profile_queries_ignores_failed_statements(test_client_rollback):
+    with profile_queries() as profile:
+        try:
+            db.session.execute(text("SELECT * FROM table_that_does_not_exist"))
+        except Exception:
+            db.session.rollback()
+        db.session.execute(text("SELECT 1"))
+
+    assert profile.statement_count == 1
+
+
+def test_query_profiler_logs_request_summary(seeded_test_client, mocked_find_auth, mocker):
+    log_query_profile = mocker.patch("data_store.db.query_profiler.log_query_profile")
+
+    class QueryProfilerConfig(config.Config):
+        ENABLE_QUERY_PROFILER = True
+
+    app = create_app(QueryProfilerConfig)
+    with app.test_client() as test_client:
+        response = test_client.get("/download", headers={"Host": config.Config.FIND_HOST})
+
+    assert response.status_code == 200
+    [(profile, source), kwargs] = log_query_profile.call_args
+    assert source == "find.download"
+    assert kwargs == {"method": "GET"}
+    assert profile.statement_count > 0
+    assert profile.slowest
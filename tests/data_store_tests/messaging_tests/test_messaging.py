@@ -3,6 +3,7 @@ import pytest
 from data_store.messaging import MessengerBase
 from data_store.messaging.messaging import (
     Message,
+    MessageGrouper,
     failures_to_messages,
     group_validation_messages,
     messaging_class_factory,
@@ -80,6 +81,40 @@ def test_group_validation_messages():
     ]
 
 
+def test_group_validation_messages_does_not_change_the_messages_given():
+    first = Message("Outcomes", "Programme-level Outcomes", ("E7",), "You left cells blank.", "GenericFailure")
+    second = Message("Outcomes", "Programme-level Outcomes", ("E5", "E7"), "You left cells blank.", "GenericFailure")
+
+    grouped = group_validation_messages([first, second])
+
+    assert grouped == [
+        Message("Outcomes", "Programme-level Outcomes", ("E5", "E7"), "You left cells blank.", "GenericFailure")
+    ]
+    assert first.cell_indexes == ("E7",)
+
+
+def test_message_grouper_sorts_cells_from_many_messages():
+    grouper = MessageGrouper()
+    for row in reversed(range(1, 1001)):
+        grouper.add(Message("Tab A", "Section A", (f"B{row}", f"A{row}"), "grouped message", "SomeInputFailure"))
+    grouper.add(Message("Tab A", "Section A", ("A1",), "grouped message", "SomeInputFailure"))
+
+    (message,) = grouper.messages()
+
+    assert message.cell_indexes == tuple(f"A{row}" for row in range(1, 1001)) + tuple(
+        f"B{row}" for row in range(1, 1001)
+    )
+
+
+def test_message_grouper_errors_if_grouping_messages_without_cells():
+    grouper = MessageGrouper()
+    grouper.add(Message("Tab A", "Section A", None, "grouped message", "SomeInputFailure"))
+    grouper.add(Message("Tab A", "Section B", None, "grouped message", "SomeInputFailure"))
+
+    with pytest.raises(ValueError):
+        grouper.add(Message("Tab A", "Section A", ("A1",), "grouped message", "SomeInputFailure"))
+
+
 def test_remove_errors_already_caught_by_null_failure():
     errors = [
         Message("Tab 1", "Sheet 1", ("C7",), "The cell is blank but is required.", "NonNullableConstraintFailure"),
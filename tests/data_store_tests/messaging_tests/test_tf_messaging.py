@@ -516,6 +516,7 @@ def test_failures_to_messages():
         (("Funding Questions", "All Columns", 5), "E5"),
         (("Funding Comments", "Comment", 6), "C6 to E6"),
         (("Project Details", "Primary Intervention Theme", 27), "F27"),
+        (("Funding Comments", "Comment", None), "C to E"),
     ],
 )
 def test_construct_cell_index(index_input, expected):
@@ -523,6 +524,21 @@ def test_construct_cell_index(index_input, expected):
     assert test_messeger._construct_cell_index(*index_input) == expected
 
 
+@pytest.mark.parametrize("row_index", [None, 0, 7, 123])
+def test_cell_index_segments_match_templates(row_index):
+    test_messenger = TFMessenger()
+    for table, columns in TFMessenger.TABLE_AND_COLUMN_TO_ORIGINAL_COLUMN_LETTER.items():
+        for column, template in columns.items():
+            assert test_messenger._construct_cell_index(table, column, row_index) == template.format(i=row_index or "")
+
+
+def test_cell_index_lookup_tables_are_read_only():
+    with pytest.raises(TypeError):
+        TFMessenger.CELL_INDEX_SEGMENTS["Place Details", "Question"] = ("Z", "")
+    with pytest.raises(TypeError):
+        TFMessenger.FOOTFALL_OUTCOME_COLUMN_BY_MONTH[4] = "Z"
+
+
 def test_failures_to_message_with_outcomes_column_amount():
     test_messger = TFMessenger()
 
@@ -237,6 +237,46 @@ def test_table_extract_and_process_when_no_tables_exist(basic_table_config: Tabl
         extractor.extract(basic_table_config.extract)
 
 
+def test_table_extract_uses_known_layout(table_extractor: TableExtractor, basic_table_config: TableConfig, mocker):
+    """
+    GIVEN the tag positions of a table found when extracting it from another workbook
+    WHEN the table is extracted from a workbook with the tags in the same positions
+    THEN the tags are only checked at those positions, rather than searched for
+    """
+    expected_tables = table_extractor.extract(basic_table_config.extract)
+    extractor = TableExtractor(workbook=table_extractor.workbook, known_layout=table_extractor.layout)
+    get_tags = mocker.spy(extractor, "_get_tags")
+
+    tables = extractor.extract(basic_table_config.extract)
+
+    assert not get_tags.called
+    assert len(tables) == len(expected_tables) == 1
+    assert_frame_equal(tables[0].df, expected_tables[0].df)
+    assert tables[0].start_tag == expected_tables[0].start_tag
+
+
+def test_table_extract_falls_back_to_search_when_known_layout_does_not_match(
+    table_extractor: TableExtractor, basic_table_config: TableConfig, mocker
+):
+    """
+    GIVEN tag positions for a table that don't match the worksheet
+    WHEN the table is extracted
+    THEN the worksheet is searched for the tags
+    """
+    expected_tables = table_extractor.extract(basic_table_config.extract)
+    layout_key = ("test_worksheet_1", "TESTID1")
+    extractor = TableExtractor(
+        workbook=table_extractor.workbook, known_layout={layout_key: [(Cell(0, 1), Cell(1000, 1000))]}
+    )
+    get_tags = mocker.spy(extractor, "_get_tags")
+
+    tables = extractor.extract(basic_table_config.extract)
+
+    assert get_tags.called
+    assert_frame_equal(tables[0].df, expected_tables[0].df)
+    assert extractor.layout[layout_key] == table_extractor.layout[layout_key]
+
+
 def test_table_extract_and_process_with_ignored_non_header_rows(
     table_extractor: TableExtractor, basic_table_config: TableConfig
 ) -> None:
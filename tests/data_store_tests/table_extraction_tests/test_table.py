@@ -1,6 +1,7 @@
+import pandas as pd
 import pytest
 
-from data_store.table_extraction.table import Cell
+from data_store.table_extraction.table import Cell, Table
 
 
 def test_column_index_to_excel_letters():
@@ -16,3 +17,14 @@ def test_column_index_to_excel_letters():
 
     with pytest.raises(ValueError, match="maximum allowed column index"):
         Cell._column_index_to_letters(16384)
+
+
+def test_get_cells():
+    table = Table(pd.DataFrame(columns=["A", "B"]), start_tag=Cell(row=3, column=26), id_tag="example-tag")
+
+    cells = table.get_cells(pd.Series([4, 5, None, 6]), pd.Series(["B", "A", "A", None]))
+
+    assert cells == [Cell(row=4, column=27), Cell(row=5, column=26), None, None]
+    first, second = cells[:2]
+    assert first is not None and second is not None
+    assert [first.str_ref, second.str_ref] == ["AB5", "AA6"]
@@ -0,0 +1,131 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from werkzeug.datastructures import FileStorage
+
+from data_store.const import EXCEL_MIMETYPE
+from data_store.controllers.ingest import extract_data, extract_process_validate_tables
+from data_store.table_extraction import TableExtractor, TableProcessor
+from data_store.table_extraction.template_cache import (
+    LRUCache,
+    control_lookup,
+    control_lookups_cache,
+    control_tables_cache,
+    frame_fingerprint,
+    template_layouts_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_template_caches():
+    caches = (control_tables_cache, template_layouts_cache, control_lookups_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture
+def pf_r1_workbook(pathfinders_round_1_file_success) -> dict[str, pd.DataFrame]:
+    return extract_data(FileStorage(pathfinders_round_1_file_success, content_type=EXCEL_MIMETYPE))
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_frame_fingerprint_changes_with_contents_and_index():
+    df = pd.DataFrame({"Local Authority": ["Bolton", "Wigan"], "Reference": ["PF-BOL-001", "PF-WIG-001"]})
+
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+    assert frame_fingerprint(df) != frame_fingerprint(df.replace("Wigan", "Bury"))
+    assert frame_fingerprint(df) != frame_fingerprint(df.set_axis([5, 6], axis=0))
+    assert frame_fingerprint(df) != frame_fingerprint(df.rename(columns={"Reference": "Ref"}))
+
+
+def test_control_lookup_is_built_once_per_table_contents(mocker):
+    df = pd.DataFrame({"Local Authority": ["Bolton", "Wigan"], "Reference": ["PF-BOL-001", "PF-WIG-001"]})
+    build = mocker.Mock(return_value={"Bolton": "PF-BOL"})
+    build.__qualname__ = "build"
+
+    assert control_lookup(df, build) == {"Bolton": "PF-BOL"}
+    assert control_lookup(df.copy(), build) == {"Bolton": "PF-BOL"}
+    control_lookup(df.replace("Wigan", "Bury"), build)
+
+    assert build.call_count == 2
+
+
+def test_control_lookup_from_several_tables_is_rebuilt_if_any_table_changes(mocker):
+    projects = pd.DataFrame({"Local Authority": ["Bolton"], "Full name": ["PF-BOL-001: Wellsprings"]})
+    themes = pd.DataFrame({"Intervention theme": ["Improving the local economy"]})
+    build = mocker.Mock(return_value={"Bolton": ["PF-BOL-001: Wellsprings"]})
+    build.__qualname__ = "build"
+
+    control_lookup({"Projects": projects, "Themes": themes}, build)
+    control_lookup({"Themes": themes.copy(), "Projects": projects.copy()}, build)
+    control_lookup({"Projects": projects, "Themes": themes.replace("Improving the local economy", "Other")}, build)
+
+    assert build.call_count == 2
+
+
+def test_extract_process_validate_tables_reuses_control_tables(test_session, pf_r1_workbook, mocker):
+    from data_store.table_extraction.config.pf_r1_config import PF_TABLE_CONFIG
+
+    process = mocker.spy(TableProcessor, "process")
+    first_tables, first_errors = extract_process_validate_tables(pf_r1_workbook, PF_TABLE_CONFIG)
+    processed_first = [call.args[1].id_tag for call in process.call_args_list]
+    process.reset_mock()
+    second_tables, second_errors = extract_process_validate_tables(pf_r1_workbook, PF_TABLE_CONFIG)
+    processed_second = [call.args[1].id_tag for call in process.call_args_list]
+
+    assert len(processed_first) == len(PF_TABLE_CONFIG)
+    assert all(not id_tag.startswith("PF-CONTROL_") for id_tag in processed_second)
+    assert len(processed_second) < len(processed_first)
+    assert first_errors == second_errors == []
+    assert list(first_tables) == list(second_tables)
+    for table_name, df in first_tables.items():
+        assert_frame_equal(df, second_tables[table_name])
+    # the cached tables are copied, so changes to one ingest's tables don't leak into the next
+    assert second_tables["Project details control"] is not first_tables["Project details control"]
+
+
+def test_extract_process_validate_tables_processes_altered_control_tables(test_session, pf_r1_workbook, mocker):
+    from data_store.table_extraction.config.pf_r1_config import PF_TABLE_CONFIG
+
+    tables, _ = extract_process_validate_tables(pf_r1_workbook, PF_TABLE_CONFIG)
+    worksheet_name = PF_TABLE_CONFIG["Project details control"].extract.worksheet_name
+    project_name = tables["Project details control"]["Full name"].iloc[0]
+    altered_worksheet = pf_r1_workbook[worksheet_name].replace(project_name, "An altered project name")
+    altered_workbook = {**pf_r1_workbook, worksheet_name: altered_worksheet}
+
+    process = mocker.spy(TableProcessor, "process")
+    extract_process_validate_tables(altered_workbook, PF_TABLE_CONFIG)
+
+    assert len(process.call_args_list) == len(PF_TABLE_CONFIG)
+
+
+def test_extract_process_validate_tables_reuses_table_positions(test_session, pf_r1_workbook, mocker):
+    from data_store.table_extraction.config.pf_r1_config import PF_TABLE_CONFIG
+
+    get_tags = mocker.spy(TableExtractor, "_get_tags")
+    first_tables, _ = extract_process_validate_tables(pf_r1_workbook, PF_TABLE_CONFIG)
+    searched_first = [call.args[1] for call in get_tags.call_args_list]
+    get_tags.reset_mock()
+    second_tables, _ = extract_process_validate_tables(pf_r1_workbook, PF_TABLE_CONFIG)
+    searched_second = [call.args[1] for call in get_tags.call_args_list]
+
+    assert len(searched_first) == len(PF_TABLE_CONFIG)
+    # only the control tables, which identify the template, are searched for
+    assert searched_second and all(id_tag.startswith("PF-CONTROL_") for id_tag in searched_second)
+    for table_name, df in first_tables.items():
+        assert_frame_equal(df, second_tables[table_name])
@@ -1,7 +1,11 @@
+from unittest import mock
+
+import pytest
+from flask import g
 from werkzeug.datastructures import FileStorage
 
 from data_store.messaging import Message
-from data_store.metrics import capture_ingest_metrics
+from data_store.metrics import FundingMetrics, capture_ingest_metrics, ingest_stage
 
 
 def test_metrics_can_handle_errors_with_no_cell_reference(test_client, mock_sentry_metrics):
@@ -16,3 +20,30 @@ def test_metrics_can_handle_errors_with_no_cell_reference(test_client, mock_sent
 
     assert mock_sentry_metrics.incr.call_count > 0
     assert mock_sentry_metrics.distribution.call_count > 0
+
+
+def test_metrics_report_ingest_stages(test_client, mock_sentry_metrics):
+    @capture_ingest_metrics
+    def view_func(*args, **kwargs):
+        with ingest_stage("transform") as stage:
+            stage.rows = 3
+        with pytest.raises(ValueError), ingest_stage("tf_validate"):
+            raise ValueError
+        return {}, 200
+
+    view_func(excel_file=FileStorage(), fund_name="test", reporting_round=1)
+
+    assert [stage.name for stage in g.ingest_stages] == ["transform", "tf_validate"]
+    assert (
+        mock.call(
+            FundingMetrics.SUBMISSION_INGEST_STAGE_ROWS,
+            3,
+            tags={"fund": "unknown", "reporting_round": -1, "stage": "transform"},
+        )
+        in mock_sentry_metrics.distribution.call_args_list
+    )
+    assert {
+        call.kwargs["tags"]["stage"]
+        for call in mock_sentry_metrics.distribution.call_args_list
+        if call.args[0] == FundingMetrics.SUBMISSION_INGEST_STAGE_DURATION
+    } == {"transform", "tf_validate"}
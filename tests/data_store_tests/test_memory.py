@@ -0,0 +1,28 @@
+from data_store.memory import get_peak_rss, track_memory
+
+
+def test_track_memory_reports_peak_rss():
+    with track_memory() as memory:
+        data = bytearray(64 * 1024 * 1024)
+        del data
+
+    assert memory["peak_rss"] >= 64 * 1024 * 1024
+    assert "top_allocations" not in memory
+    if memory["peak_rss_since_task_start"]:
+        with track_memory() as memory_after:
+            pass
+        assert memory_after["peak_rss"] < memory["peak_rss"]
+
+
+def test_track_memory_reports_top_allocations():
+    with track_memory(top_allocations=2) as memory:
+        data = [str(i) for i in range(100_000)]
+
+    assert 0 < len(memory["top_allocations"]) <= 2
+    assert __file__ in memory["top_allocations"][0]["location"]
+    assert memory["top_allocations"][0]["size"] > 0
+    assert len(data) == 100_000
+
+
+def test_get_peak_rss():
+    assert get_peak_rss() > 0
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from data_store.profiling import (
+    ProfileStore,
+    StackSampler,
+    parse_profile_name,
+    profile_name,
+    sample_profile,
+    should_sample,
+    to_collapsed,
+)
+
+
+def _busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_stack_sampler_samples_the_profiled_thread():
+    sampler = StackSampler(threading.get_ident(), interval=0.001)
+    sampler.start()
+    _busy_wait(0.1)
+    stacks = sampler.stop()
+
+    assert sum(stacks.values()) > 0
+    # stacks are ordered from the outermost frame
+    [stack, *_] = [stack.split(";") for stack in stacks if "_busy_wait" in stack.split(";")[-1]]
+    assert stack[-2].startswith("test_stack_sampler_samples_the_profiled_thread")
+
+
+def test_to_collapsed():
+    assert to_collapsed(Counter({"a;b": 1, "a;c": 3})) == b"a;c 3\na;b 1\n"
+
+
+def test_profile_name_round_trip():
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678)
+    name = profile_name(created_at, 1.2345, "/find/download?x=1")
+
+    assert name == "20240102T030405000678_1234ms_-find-download-x-1.collapsed"
+    profile = parse_profile_name(name)
+    assert profile is not None
+    assert profile.created_at == created_at
+    assert profile.duration == 1.234
+    assert profile.source == "-find-download-x-1"
+    assert parse_profile_name("../../etc/passwd") is None
+
+
+def test_should_sample():
+    assert should_sample(1)
+    assert not should_sample(0)
+    assert 300 < sum(should_sample(4) for _ in range(2000)) < 700
+
+
+def test_local_profile_store_keeps_most_recent(tmp_path):
+    store = ProfileStore(bucket=None, directory=tmp_path, retention=2)
+    names = [profile_name(datetime(2024, 1, day), day, "find.download") for day in range(1, 4)]
+    for name in names:
+        store.save(name, b"a;b 1\n")
+
+    assert [profile.name for profile in store.list_profiles()] == [names[2], names[1]]
+    assert store.get_profile(names[2]) == b"a;b 1\n"
+    with pytest.raises(FileNotFoundError):
+        store.get_profile(names[0])
+
+
+@pytest.mark.parametrize("retention", [0, -1])
+def test_profile_store_must_keep_at_least_one_profile(tmp_path, retention):
+    with pytest.raises(ValueError, match="SAMPLING_PROFILER_RETENTION"):
+        ProfileStore(bucket=None, directory=tmp_path, retention=retention)
+
+
+@pytest.mark.usefixtures("test_buckets")
+def test_s3_profile_store_keeps_most_recent(test_session):
+    store = ProfileStore(
+        bucket=test_session.application.config["AWS_S3_BUCKET_FAILED_FILES"], directory="", retention=1
+    )
+    names = [profile_name(datetime(2024, 1, day), day, "async_download") for day in range(1, 3)]
+    for name in names:
+        store.save(name, b"a;b 1\n")
+
+    assert [profile.name for profile in store.list_profiles()] == [names[1]]
+    assert store.get_profile(names[1]) == b"a;b 1\n"
+    store._delete(names[1])
+
+
+def test_sample_profile_saves_profile(test_session, tmp_path, monkeypatch):
+    monkeypatch.setitem(test_session.application.config, "SAMPLING_PROFILER_DIR", str(tmp_path))
+    monkeypatch.setitem(test_session.application.config, "SAMPLING_PROFILER_INTERVAL", 0.001)
+
+    with sample_profile("find.download"):
+        _busy_wait(0.05)
+
+    [profile] = ProfileStore(bucket=None, directory=tmp_path, retention=1).list_profiles()
+    assert profile.source == "find.download"
+    assert profile.duration >= 0.05
+    assert b"_busy_wait" in (tmp_path / profile.name).read_bytes()
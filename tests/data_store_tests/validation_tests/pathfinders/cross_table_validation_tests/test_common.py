@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from data_store.table_extraction.template_cache import control_lookups_cache
+from data_store.validation.pathfinders.cross_table_validation.common import (
+    ControlIndex,
+    check_values_against_allowed,
+    check_values_against_mapped_allowed,
+    lowercase_pairs,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_control_lookups_cache():
+    control_lookups_cache.clear()
+    yield
+    control_lookups_cache.clear()
+
+
+def test_check_values_against_allowed_is_case_insensitive():
+    df = pd.DataFrame(
+        {"Project name": ["PF-BOL-001: Wellsprings", "pf-bol-002: market", "Invalid project", pd.NA]},
+        index=[20, 21, 22, 23],
+    )
+
+    breaching_row_indices = check_values_against_allowed(
+        df=df,
+        value_column="Project name",
+        allowed_values=frozenset({"pf-bol-001: wellsprings", "pf-bol-002: market"}),
+    )
+
+    assert breaching_row_indices == [22, 23]
+
+
+def test_check_values_against_mapped_allowed_anti_joins_allowed_pairs():
+    df = pd.DataFrame(
+        {
+            "Intervention theme": ["Improving the local economy", "IMPROVING THE LOCAL ECONOMY", "Unknown theme"],
+            "Output": ["Jobs created", "jobs created", "Jobs created"],
+        },
+        index=[10, 11, 12],
+    )
+    allowed_pairs = lowercase_pairs({"Improving the local economy": ["Jobs created"], "Other theme": []})
+
+    breaching_row_indices = check_values_against_mapped_allowed(
+        df=df,
+        value_column="Output",
+        allowed_values_key_column="Intervention theme",
+        allowed_pairs=allowed_pairs,
+    )
+
+    assert breaching_row_indices == [12]
+
+
+def test_check_values_against_mapped_allowed_with_no_allowed_pairs():
+    df = pd.DataFrame({"Output": ["Jobs created"], "Unit of measurement": ["n of"]}, index=[5])
+
+    breaching_row_indices = check_values_against_mapped_allowed(
+        df=df,
+        value_column="Unit of measurement",
+        allowed_values_key_column="Output",
+        allowed_pairs=lowercase_pairs({}),
+    )
+
+    assert breaching_row_indices == [5]
+
+
+def test_control_index_is_built_once_per_template(mock_pf_r2_df_dict):
+    control_index = ControlIndex.from_tables(mock_pf_r2_df_dict)
+    copied_tables = {name: df.copy() for name, df in mock_pf_r2_df_dict.items()}
+
+    assert ControlIndex.from_tables(copied_tables).projects_by_programme is control_index.projects_by_programme
+    assert "pf-bol-001: wellsprings innovation hub" in control_index.projects_by_programme["Bolton Council"]
+
+
+def test_control_index_applies_bespoke_output_corrections(mock_pf_r2_df_dict):
+    bespoke_outputs_control = mock_pf_r2_df_dict["Bespoke outputs control"]
+    misspelt_output = bespoke_outputs_control["Output"].iloc[0]
+
+    control_index = ControlIndex.from_tables(
+        mock_pf_r2_df_dict, bespoke_output_corrections={misspelt_output: "Corrected output"}
+    )
+
+    allowed_outputs = control_index.bespoke_outputs_by_programme[bespoke_outputs_control["Local Authority"].iloc[0]]
+    assert "corrected output" in allowed_outputs
+    assert misspelt_output.lower() not in allowed_outputs
+    # the extracted control table itself isn't changed
+    assert bespoke_outputs_control["Output"].iloc[0] == misspelt_output
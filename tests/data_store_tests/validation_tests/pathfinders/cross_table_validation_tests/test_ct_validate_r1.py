@@ -10,6 +10,7 @@ from data_store.validation.pathfinders.cross_table_validation.ct_validate_r1 imp
     _check_intervention_themes_in_pfcs,
     _check_projects,
     _check_standard_outcomes,
+    _control_index,
     cross_table_validate,
 )
 
@@ -68,12 +69,12 @@ def test_cross_table_validation_fails(mock_pf_r1_df_dict):
 
 
 def test__check_projects_passes(mock_pf_r1_df_dict):
-    _check_projects(mock_pf_r1_df_dict)
+    _check_projects(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
 
 
 def test__check_projects_fails(mock_pf_r1_df_dict):
     mock_pf_r1_df_dict["Project progress"]["Project name"][0] = "Invalid Project"
-    error_messages = _check_projects(mock_pf_r1_df_dict)
+    error_messages = _check_projects(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
     assert error_messages == [
         Message(
             sheet="Progress",
@@ -86,12 +87,12 @@ def test__check_projects_fails(mock_pf_r1_df_dict):
 
 
 def test__check_standard_outcomes_passes(mock_pf_r1_df_dict):
-    _check_standard_outcomes(mock_pf_r1_df_dict)
+    _check_standard_outcomes(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
 
 
 def test__check_standard_outcomes_fails(mock_pf_r1_df_dict):
     mock_pf_r1_df_dict["Outcomes"].loc[0, "Outcome"] = "Invalid Outcome"
-    error_messages = _check_standard_outcomes(mock_pf_r1_df_dict)
+    error_messages = _check_standard_outcomes(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
     assert error_messages == [
         Message(
             sheet="Outcomes",
@@ -105,12 +106,12 @@ def test__check_standard_outcomes_fails(mock_pf_r1_df_dict):
 
 
 def test__check_bespoke_outputs_passes(mock_pf_r1_df_dict):
-    _check_bespoke_outputs(mock_pf_r1_df_dict)
+    _check_bespoke_outputs(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
 
 
 def test__check_bespoke_outputs_fails(mock_pf_r1_df_dict):
     mock_pf_r1_df_dict["Bespoke outputs"].loc[0, "Output"] = "Invalid Bespoke Output"
-    error_messages = _check_bespoke_outputs(mock_pf_r1_df_dict)
+    error_messages = _check_bespoke_outputs(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
     assert error_messages == [
         Message(
             sheet="Outputs",
@@ -172,7 +173,7 @@ def test__check_current_underspend_fails(mock_pf_r1_df_dict):
 
 
 def test__check_intervention_themes_in_pfcs_passes(mock_pf_r1_df_dict):
-    _check_intervention_themes_in_pfcs(mock_pf_r1_df_dict)
+    _check_intervention_themes_in_pfcs(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
 
 
 def test__check_intervention_themes_in_pfcs_fails(mock_pf_r1_df_dict):
@@ -180,7 +181,7 @@ def test__check_intervention_themes_in_pfcs_fails(mock_pf_r1_df_dict):
     mock_pf_r1_df_dict["Project finance changes"].loc[0, "Intervention theme moved to"] = (
         "Another Invalid Intervention Theme"
     )
-    error_messages = _check_intervention_themes_in_pfcs(mock_pf_r1_df_dict)
+    error_messages = _check_intervention_themes_in_pfcs(mock_pf_r1_df_dict, _control_index(mock_pf_r1_df_dict))
     assert error_messages == [
         Message(
             sheet="Finances",
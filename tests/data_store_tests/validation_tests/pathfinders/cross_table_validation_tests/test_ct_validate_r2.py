@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 
 from data_store.messaging import Message
+from data_store.validation.budget import ValidationBudget
 from data_store.validation.pathfinders.cross_table_validation.ct_validate_r2 import (
     _check_actual_forecast_reporting_period,
     _check_bespoke_outputs,
@@ -9,6 +10,7 @@ from data_store.validation.pathfinders.cross_table_validation.ct_validate_r2 imp
     _check_intervention_themes_in_pfcs,
     _check_projects,
     _check_standard_outcomes,
+    _control_index,
     cross_table_validate,
 )
 
@@ -58,13 +60,28 @@ def test_cross_table_validation_fails(mock_pf_r2_df_dict):
     ]
 
 
+def test_cross_table_validation_stops_once_budget_spent(mock_pf_r2_df_dict):
+    mock_pf_r2_df_dict["Project progress"].loc[0, "Project name"] = "Invalid Project"
+    mock_pf_r2_df_dict["Outcomes"].loc[0, "Outcome"] = "Invalid Outcome"
+    mock_pf_r2_df_dict["Outputs"].loc[0, "Unit of measurement"] = "Invalid Unit of Measurement"
+    all_error_messages = cross_table_validate(mock_pf_r2_df_dict)
+    budget = ValidationBudget(max_errors=2)
+
+    error_messages = cross_table_validate(mock_pf_r2_df_dict, budget)
+
+    assert len(all_error_messages) > 2
+    assert error_messages == all_error_messages[:2]
+    assert budget.exhausted
+    assert cross_table_validate(mock_pf_r2_df_dict, budget) == []
+
+
 def test__check_projects_passes(mock_pf_r2_df_dict):
-    _check_projects(mock_pf_r2_df_dict)
+    _check_projects(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
 
 
 def test__check_projects_fails(mock_pf_r2_df_dict):
     mock_pf_r2_df_dict["Project progress"]["Project name"][0] = "Invalid Project"
-    error_messages = _check_projects(mock_pf_r2_df_dict)
+    error_messages = _check_projects(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
     assert error_messages == [
         Message(
             sheet="Progress",
@@ -77,18 +94,18 @@ def test__check_projects_fails(mock_pf_r2_df_dict):
 
 
 def test__check_standard_outcomes_passes(mock_pf_r2_df_dict):
-    _check_standard_outcomes(mock_pf_r2_df_dict)
+    _check_standard_outcomes(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
 
 
 def test__check_standard_outcomes_passes_with_differently_cased_outcome(mock_pf_r2_df_dict):
     mock_pf_r2_df_dict["Outcomes"].loc[0, "Outcome"] = "vEhIcLe FlOw"
-    error_messages = _check_standard_outcomes(mock_pf_r2_df_dict)
+    error_messages = _check_standard_outcomes(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
     assert error_messages == []
 
 
 def test__check_standard_outcomes_fails(mock_pf_r2_df_dict):
     mock_pf_r2_df_dict["Outcomes"].loc[0, "Outcome"] = "Invalid Outcome"
-    error_messages = _check_standard_outcomes(mock_pf_r2_df_dict)
+    error_messages = _check_standard_outcomes(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
     assert error_messages == [
         Message(
             sheet="Outcomes",
@@ -102,7 +119,7 @@ def test__check_standard_outcomes_fails(mock_pf_r2_df_dict):
 
 
 def test__check_bespoke_outputs_passes(mock_pf_r2_df_dict):
-    _check_bespoke_outputs(mock_pf_r2_df_dict)
+    _check_bespoke_outputs(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
 
 
 @pytest.mark.parametrize(
@@ -129,13 +146,13 @@ def test__check_bespoke_outputs_passes_with_text_changes(mock_pf_r2_df_dict, old
     )
     mock_pf_r2_df_dict["Bespoke outputs"].loc[0, "Output"] = new_text
     mock_pf_r2_df_dict["Bespoke outputs"].loc[0, "Unit of measurement"] = uom
-    error_messages = _check_bespoke_outputs(mock_pf_r2_df_dict)
+    error_messages = _check_bespoke_outputs(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
     assert error_messages == []
 
 
 def test__check_bespoke_outputs_fails(mock_pf_r2_df_dict):
     mock_pf_r2_df_dict["Bespoke outputs"].loc[0, "Output"] = "Invalid Bespoke Output"
-    error_messages = _check_bespoke_outputs(mock_pf_r2_df_dict)
+    error_messages = _check_bespoke_outputs(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
     assert error_messages == [
         Message(
             sheet="Outputs",
@@ -179,7 +196,7 @@ def test__check_current_underspend_fails(mock_pf_r2_df_dict):
 
 
 def test__check_intervention_themes_in_pfcs_passes(mock_pf_r2_df_dict):
-    _check_intervention_themes_in_pfcs(mock_pf_r2_df_dict)
+    _check_intervention_themes_in_pfcs(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
 
 
 def test__check_intervention_themes_in_pfcs_fails(mock_pf_r2_df_dict):
@@ -187,7 +204,7 @@ def test__check_intervention_themes_in_pfcs_fails(mock_pf_r2_df_dict):
     mock_pf_r2_df_dict["Project finance changes"].loc[0, "Intervention theme moved to"] = (
         "Another Invalid Intervention Theme"
     )
-    error_messages = _check_intervention_themes_in_pfcs(mock_pf_r2_df_dict)
+    error_messages = _check_intervention_themes_in_pfcs(mock_pf_r2_df_dict, _control_index(mock_pf_r2_df_dict))
     assert error_messages == [
         Message(
             sheet="Finances",
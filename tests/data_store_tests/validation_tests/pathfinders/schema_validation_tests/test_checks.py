@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any
 
 import pandas as pd
@@ -107,3 +108,45 @@ def test_phone_regex_failure(number, phone_regex_check_schema: pa.DataFrameSchem
     df = pd.DataFrame({"phone_number": [number]})
     with pytest.raises(pa.errors.SchemaError):
         phone_regex_check_schema.validate(df)
+
+
+def failing_indexes(check: pa.Check, values: pd.Series) -> list:
+    schema = pa.DataFrameSchema(columns={"col": pa.Column(checks=[check], nullable=True)})
+    try:
+        schema.validate(pd.DataFrame({"col": values}), lazy=True)
+    except pa.errors.SchemaErrors as errors:
+        return errors.failure_cases["index"].tolist()
+    return []
+
+
+@pytest.mark.parametrize(
+    "check, values, expected_failures",
+    [
+        (checks.is_in(["Yes", "No"]), ["Yes", "No", "Maybe", float("nan"), 1], [2, 4]),
+        (checks.is_datetime(), [datetime(2024, 1, 1), "2024-01-01", "not a date", float("nan")], [2]),
+        (checks.is_float(), [1.5, 2, "3.5", "three", float("nan"), datetime(2024, 1, 1)], [3, 5]),
+        (checks.is_int(), [1.0, 2, "3", "three"], [3]),
+        (checks.is_int(), pd.Series([1, 2, 3], dtype="int64"), []),
+        (checks.max_word_count(3), ["one two three", " one  two\tthree\n", "one two three four", float("nan")], [2]),
+        (checks.postcode_list(), ["SW1A 1AA", " M1 1AE , CR2 6XH ", "SW1A 1AA,", "Town Hall", 123], [2, 3, 4]),
+        (checks.not_in_future(), pd.to_datetime(pd.Series(["2020-01-01", None, "2199-01-01"])), [2]),
+    ],
+)
+def test_checks_fail_invalid_values(check, values, expected_failures):
+    assert failing_indexes(check, pd.Series(values)) == expected_failures
+
+
+@pytest.mark.parametrize(
+    "check, values",
+    [
+        (checks.max_word_count(3), ["one two", 12]),
+        (checks.not_in_future(), [pd.Timestamp(2020, 1, 1), "2020-01-01"]),
+    ],
+)
+def test_checks_raise_type_error_on_values_of_the_wrong_type(check, values):
+    schema = pa.DataFrameSchema(columns={"col": pa.Column(checks=[check])})
+    with pytest.raises(pa.errors.SchemaErrors) as errors:
+        schema.validate(pd.DataFrame({"col": pd.Series(values, dtype=object)}), lazy=True)
+
+    # these are ignored by TableValidator, as the values will fail to be coerced
+    assert errors.value.failure_cases["failure_case"].str.startswith("TypeError(").all()
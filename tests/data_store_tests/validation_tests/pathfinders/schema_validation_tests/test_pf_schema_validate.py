@@ -264,6 +264,34 @@ def test_table_validation_handles_table_level_checks(table_level_check_validate_
     assert v_error.value.validation_errors[0].cell is None
 
 
+def test_table_validation_references_cells_and_ignores_type_errors(
+    greater_than_5_validate_config: ValidateConfig,
+) -> None:
+    table = Table(
+        pd.DataFrame({"Column1": [4, 10, "not a number", None, 3]}, index=range(7, 12)),
+        start_tag=Cell(row=6, column=2),
+        id_tag="example-tag",
+    )
+
+    with pytest.raises(TableValidationErrors) as v_error:
+        TableValidator(greater_than_5_validate_config).validate(table)
+
+    errors = []
+    for error in v_error.value.validation_errors:
+        assert error.cell is not None
+        errors.append((error.message, error.cell.str_ref))
+    # greater_than raises a TypeError on the text, which is ignored in favour of the is_float failure, so the values
+    # that aren't greater than 5 aren't reported until the text is replaced
+    assert errors == [
+        ("The cell is blank but is required.", "C11"),
+        (
+            "You entered text instead of a number. Remove any names of measurements and only use numbers, for "
+            "example, '9'.",
+            "C10",
+        ),
+    ]
+
+
 def test_standardise_indexes(dataframe_with_missing_indexes: pd.DataFrame) -> None:
     standardise_indexes(dataframe_with_missing_indexes)
 
@@ -0,0 +1,42 @@
+import pytest
+
+from data_store.validation.budget import ValidationBudget
+
+
+def test_budget_without_a_maximum_is_never_exhausted():
+    budget = ValidationBudget()
+
+    assert budget.spend(list(range(1000))) == list(range(1000))
+    assert not budget.exhausted
+
+
+def test_budget_spend_keeps_only_the_errors_that_fit():
+    budget = ValidationBudget(max_errors=3)
+
+    assert budget.spend(["a", "b"]) == ["a", "b"]
+    assert not budget.exhausted
+    assert budget.spend(["c", "d"]) == ["c"]
+    assert budget.exhausted
+    assert budget.spend(["e"]) == []
+
+
+def test_budget_run_skips_checks_once_exhausted():
+    ran = []
+
+    def check(name, errors):
+        def run():
+            ran.append(name)
+            return errors
+
+        return run
+
+    errors = ValidationBudget.fail_fast().run([check("first", []), check("second", ["x", "y"]), check("third", ["z"])])
+
+    assert errors == ["x"]
+    assert ran == ["first", "second"]
+
+
+@pytest.mark.parametrize("max_errors", [0, -1])
+def test_budget_must_allow_at_least_one_error(max_errors):
+    with pytest.raises(ValueError):
+        ValidationBudget(max_errors=max_errors)
@@ -1,5 +1,4 @@
 import datetime
-from enum import StrEnum
 
 import numpy as np
 import pandas as pd
@@ -8,10 +7,10 @@ from pandas.testing import assert_frame_equal
 
 from data_store.util import get_project_number_by_id, get_project_number_by_position
 from data_store.validation.utils import (
-    find_null_values,
+    blank_values_mask,
     is_blank,
-    is_from_dropdown,
     is_numeric,
+    null_values_mask,
     remove_duplicate_indexes,
 )
 
@@ -91,16 +90,10 @@ def test_is_blank():
     assert not is_blank(datetime.datetime.now())
 
 
-def test_is_from_dropdown():
-    class TestEnum(StrEnum):
-        TEST1 = "Test1"
-        TEST2 = "Test2"
+def test_blank_values_mask():
+    values = pd.Series(["", pd.NA, pd.NaT, np.NaN, None, "something", 1, 1.1, datetime.datetime.now()])
 
-    assert is_from_dropdown("Test1", TestEnum)
-    assert is_from_dropdown("Test2", TestEnum)
-    assert not is_from_dropdown("Something else", TestEnum)
-    assert not is_from_dropdown("", TestEnum)
-    assert not is_from_dropdown(pd.NA, TestEnum)
+    assert blank_values_mask(values).tolist() == [is_blank(value) for value in values]
 
 
 def test_remove_duplicate_indexes():
@@ -126,23 +119,7 @@ def test_remove_duplicate_indexes():
     assert_frame_equal(df, expected_df)
 
 
-def test_find_null_values():
-    df = pd.DataFrame(
-        index=[7, 9],
-        data=[
-            {"not-nullable": "", "nullable": ""},
-            {"not-nullable": "random input", "nullable": ""},
-        ],
-    )
-    column = "not-nullable"
-
-    invalid_rows = find_null_values(df, column)
-
-    expected_invalid_rows = pd.DataFrame(
-        index=[7],
-        data=[
-            {"not-nullable": "", "nullable": ""},
-        ],
-    )
+def test_null_values_mask():
+    values = pd.Series(["", np.NaN, None, pd.NA, pd.NaT, "random input", 0])
 
-    assert_frame_equal(invalid_rows, expected_invalid_rows)
+    assert null_values_mask(values).tolist() == [True, True, True, True, True, False, False]
@@ -1,11 +1,16 @@
+import typing
+from pathlib import Path
+
 import pandas as pd
 import pytest
 
 from data_store.const import StatusEnum, YesNoEnum
+from data_store.controllers.ingest_dependencies import TFIngestDependencies, ingest_dependencies_factory
 from data_store.messaging.tf_messaging import TFMessages as msgs
 from data_store.validation.towns_fund.fund_specific_validation.fs_validate_r4 import (
     PRE_DEFINED_FUNDING_SOURCES,
     GenericFailure,
+    funding_spent_by_project,
     validate,
     validate_funding_profiles_at_least_one_other_funding_source_fhsf,
     validate_funding_profiles_funding_secured_not_null,
@@ -21,6 +26,9 @@ from data_store.validation.towns_fund.fund_specific_validation.fs_validate_r4 im
     validate_psi_funding_not_negative,
     validate_sign_off,
 )
+from data_store.validation.towns_fund.schema_validation.casting import cast_to_schema
+
+MOCK_TF_RETURNS = Path(__file__).parents[4] / "integration_tests" / "mock_tf_returns"
 
 
 @pytest.fixture()
@@ -830,6 +838,74 @@ def test_validate_funding_spent_skipped_if_non_numeric_data(mocker, allocated_fu
     assert failures is None
 
 
+def test_funding_spent_by_project():
+    funding_df = pd.DataFrame(
+        data=[
+            {
+                "Project ID": "TD-FAK-01",
+                "Funding Source Name": "Towns Fund",
+                "Funding Source Type": "funding CDEL",
+                "Spend for Reporting Period": 100.5,
+            },
+            {
+                "Project ID": "TD-FAK-01",
+                "Funding Source Name": "Towns Fund",
+                "Funding Source Type": "funding RDEL",
+                "Spend for Reporting Period": 20,
+            },
+            # contractually committed funding isn't spent
+            {
+                "Project ID": "TD-FAK-01",
+                "Funding Source Name": "Towns Fund",
+                "Funding Source Type": "How much of your CDEL forecast is contractually committed?",
+                "Spend for Reporting Period": 1000,
+            },
+            # nor is funding from other sources
+            {
+                "Project ID": "TD-FAK-02",
+                "Funding Source Name": "Other funding source",
+                "Funding Source Type": "funding CDEL",
+                "Spend for Reporting Period": 1000,
+            },
+            {
+                "Project ID": "TD-FAK-03",
+                "Funding Source Name": "Towns Fund",
+                "Funding Source Type": "funding CDEL",
+                "Spend for Reporting Period": 5,
+            },
+            {
+                "Project ID": "TD-FAK-03",
+                "Funding Source Name": "Towns Fund",
+                "Funding Source Type": "funding CDEL",
+                "Spend for Reporting Period": pd.NA,
+            },
+        ]
+    )
+
+    funding_spent = funding_spent_by_project(funding_df)
+
+    assert funding_spent.to_dict(orient="index") == {
+        "TD-FAK-01": {"CDEL": 100.5, "RDEL": 20, "Total": 120.5},
+        "TD-FAK-03": {"CDEL": 5, "RDEL": 0, "Total": 5},
+    }
+
+
+def test_funding_spent_by_project_raises_type_error_for_non_text_funding_source_type():
+    funding_df = pd.DataFrame(
+        data=[
+            {
+                "Project ID": "TD-FAK-01",
+                "Funding Source Name": "Towns Fund",
+                "Funding Source Type": pd.NA,
+                "Spend for Reporting Period": 1,
+            },
+        ]
+    )
+
+    with pytest.raises(TypeError):
+        funding_spent_by_project(funding_df)
+
+
 def test_validate_funding_profiles_funding_secured_not_null():
     funding_df = pd.DataFrame(
         index=[47, 48, 49, 49],
@@ -1303,3 +1379,173 @@ def test_validate_sign_off_failure(invalid_workbook_round_four):
         GenericFailure(table="Review & Sign-Off", section="-", cell_index="C18", message=msgs.BLANK),
         GenericFailure(table="Review & Sign-Off", section="-", cell_index="C8", message=msgs.BLANK),
     ]
+
+
+def transformed_round_four_return(file_name: str) -> tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame]]:
+    workbook = typing.cast(
+        dict[str, pd.DataFrame],
+        pd.read_excel(
+            MOCK_TF_RETURNS / file_name,
+            sheet_name=None,
+            header=None,
+            index_col=None,
+            engine="openpyxl",
+            na_values=[""],
+            keep_default_na=False,
+        ),
+    )
+    ingest_dependencies = ingest_dependencies_factory("Towns Fund", 4)
+    assert isinstance(ingest_dependencies, TFIngestDependencies)
+    data_dict = ingest_dependencies.transform(workbook, 4)
+    cast_to_schema(data_dict, ingest_dependencies.validation_schema)
+    return data_dict, workbook
+
+
+@pytest.mark.parametrize(
+    "file_name, expected_failures",
+    [
+        ("TF_Round_4_Success.xlsx", []),
+        ("TF_Round_4_Success_Duplicate.xlsx", []),
+        ("TF_Round_4_Round_Agnostic_Failures.xlsx", []),
+        (
+            "TF_Round_4_HS_Funding_Failure.xlsx",
+            [
+                GenericFailure(
+                    table="Funding",
+                    section="Project Funding Profiles",
+                    column="Funding Source Type",
+                    message=msgs.MISSING_OTHER_FUNDING_SOURCES,
+                    row_index=None,
+                ),
+            ],
+        ),
+        (
+            "TF_Round_4_PSI_RiskRegister_Failure.xlsx",
+            [
+                GenericFailure(
+                    table="RiskRegister",
+                    section="Project Risks - Project 1",
+                    column="RiskName",
+                    message=msgs.PROJECT_RISKS,
+                    row_index=21,
+                ),
+                GenericFailure(
+                    table="RiskRegister",
+                    section="Programme Risks",
+                    column="RiskName",
+                    message=msgs.PROGRAMME_RISKS,
+                    row_index=10,
+                ),
+                GenericFailure(
+                    table="Private Investments",
+                    section="Private Sector Investment",
+                    column="Additional Comments",
+                    message=msgs.BLANK_PSI,
+                    row_index=14,
+                ),
+                GenericFailure(
+                    table="Private Investments",
+                    section="Private Sector Investment",
+                    column="Private Sector Funding Secured",
+                    message=msgs.NEGATIVE_NUMBER,
+                    row_index=14,
+                ),
+                GenericFailure(table="Review & Sign-Off", section="-", cell_index="C8", message=msgs.BLANK),
+            ],
+        ),
+        (
+            "TF_Round_4_Project_Admin_Project_Progress_Failure.xlsx",
+            [
+                GenericFailure(
+                    table="Project Details",
+                    section="Project Details",
+                    column="GIS Provided",
+                    message=msgs.BLANK,
+                    row_index=27,
+                ),
+                GenericFailure(
+                    table="Project Details",
+                    section="Project Details",
+                    column="Postcodes",
+                    message=msgs.POSTCODE,
+                    row_index=31,
+                ),
+                GenericFailure(
+                    table="Project Progress",
+                    section="Projects Progress Summary",
+                    column="Current Project Delivery Stage",
+                    message=msgs.BLANK_IF_PROJECT_INCOMPLETE,
+                    row_index=22,
+                ),
+            ],
+        ),
+        (
+            "TF_Round_4_TD_Funding_Failure.xlsx",
+            [
+                GenericFailure(
+                    table="Funding",
+                    section="Project Funding Profiles - Project 1",
+                    column="Funding Source Type",
+                    message=msgs.DROPDOWN,
+                    row_index=50,
+                ),
+                GenericFailure(
+                    table="Funding",
+                    section="Project Funding Profiles - Project 2",
+                    column="Grand Total",
+                    message=msgs.OVERSPEND.format(expense_type="CDEL"),
+                    row_index=69,
+                ),
+                GenericFailure(
+                    table="Funding",
+                    section="Project Funding Profiles - Project 1",
+                    column="Grand Total",
+                    message=msgs.OVERSPEND.format(expense_type="RDEL"),
+                    row_index=44,
+                ),
+                GenericFailure(
+                    table="Funding",
+                    section="Project Funding Profiles - Project 1",
+                    column="Secured",
+                    message=msgs.BLANK,
+                    row_index=50,
+                ),
+                GenericFailure(
+                    table="Funding Questions",
+                    section='Towns Deal Only - "Other/Early" TD Funding',
+                    column="All Columns",
+                    message=msgs.BLANK,
+                    row_index=15,
+                ),
+                GenericFailure(
+                    table="Funding Questions",
+                    section='Towns Deal Only - "Other/Early" TD Funding',
+                    column="TD RDEL Capacity Funding",
+                    message=msgs.DROPDOWN,
+                    row_index=17,
+                ),
+                GenericFailure(
+                    table="Funding Questions",
+                    section='Towns Deal Only - "Other/Early" TD Funding',
+                    column="TD Accelerated Funding",
+                    message=msgs.DROPDOWN,
+                    row_index=19,
+                ),
+                GenericFailure(
+                    table="Funding Questions",
+                    section='Towns Deal Only - "Other/Early" TD Funding',
+                    column="TD RDEL Capacity Funding",
+                    message=msgs.DROPDOWN,
+                    row_index=19,
+                ),
+            ],
+        ),
+    ],
+)
+def test_validate_round_four_returns(file_name, expected_failures):
+    """The failures from each round four return, in the order they are reported."""
+    data_dict, workbook = transformed_round_four_return(file_name)
+
+    failures = validate(data_dict, workbook, 4)
+
+    assert failures == expected_failures
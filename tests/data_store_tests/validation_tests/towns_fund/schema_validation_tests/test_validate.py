@@ -1,9 +1,13 @@
 """Provides tests for the validation functionality from validate.py."""
 
+from datetime import datetime
+
 import pandas as pd
 import pytest
 from pandas import Timestamp
 
+from data_store.messaging.messaging import failures_to_messages
+from data_store.messaging.tf_messaging import TFMessenger
 from data_store.validation.towns_fund.failures.internal import (
     EmptyTableFailure,
     ExtraColumnFailure,
@@ -21,6 +25,8 @@ from data_store.validation.towns_fund.failures.user import (
     WrongTypeFailure,
 )
 from data_store.validation.towns_fund.schema_validation.validate import (
+    TableValues,
+    compile_table_plan,
     remove_undefined_tables,
     validate_columns,
     validate_data,
@@ -328,6 +334,27 @@ def test_validate_wrong_type_captures_failed_row(valid_workbook_and_schema):
     assert failures[0].failed_row.equals(expected_failed_row)
 
 
+def test_validate_types_reports_failures_row_by_row(valid_workbook_and_schema):
+    workbook, schema = valid_workbook_and_schema
+
+    workbook["Project Sheet"]["Project Started"] = [True, "No", "Yes"]
+    workbook["Project Sheet"]["Funding Cost"] = [1002.2, "10.2", DUMMY_DATETIME]
+
+    failures = validate_types(
+        data_dict=workbook,
+        table="Project Sheet",
+        column_to_type=schema["Project Sheet"]["columns"],
+    )
+
+    assert [(failure.row_index, failure.column, failure.actual_type) for failure in failures] == [
+        (6, "Project Started", str),
+        (6, "Funding Cost", str),
+        (7, "Project Started", str),
+        (7, "Funding Cost", pd.Timestamp),
+    ]
+    assert failures[0].failed_row is failures[1].failed_row
+
+
 ####################################
 # Test validate_uniques
 ####################################
@@ -832,6 +859,25 @@ def test_validate_non_nullable_captures_failed_row(valid_workbook_and_schema):
     assert failures[0].failed_row.equals(expected_failed_row)
 
 
+def test_validate_non_nullable_reports_failures_row_by_row(valid_workbook_and_schema):
+    workbook, schema = valid_workbook_and_schema
+    workbook["Project Sheet"]["Project_ID"] = ["PID001", "", None]
+    workbook["Project Sheet"]["Fund_ID"] = ["", "F002", pd.NA]
+
+    failures = validate_nullable(
+        data_dict=workbook,
+        table="Project Sheet",
+        non_nullable=["Project_ID", "Fund_ID"],
+    )
+
+    assert [(failure.row_index, failure.column) for failure in failures] == [
+        (5, "Fund_ID"),
+        (6, "Project_ID"),
+        (7, "Project_ID"),
+        (7, "Fund_ID"),
+    ]
+
+
 ####################################
 # Test validate_workbook
 ####################################
@@ -859,6 +905,38 @@ def test_validate_workbook_invalid(valid_workbook_and_schema, invalid_workbook):
     assert len(failures) == 9
 
 
+def test_compile_table_plan(valid_workbook_and_schema):
+    _, schema = valid_workbook_and_schema
+    table_schema = schema["Another Sheet"]
+
+    plan = compile_table_plan(table_schema)
+
+    assert not plan.table_nullable
+    assert plan.constraints == [
+        (validate_columns, table_schema["columns"]),
+        (validate_types, table_schema["columns"]),
+        (validate_unique_composite_key, table_schema["composite_key"]),
+    ]
+    assert compile_table_plan({"columns": {}, "table_nullable": True}).table_nullable
+
+
+def test_validations_matches_each_constraint(valid_workbook_and_schema, invalid_workbook):
+    _, schema = valid_workbook_and_schema
+    invalid_workbook.pop("Empty Sheet")
+
+    failures = validations(invalid_workbook, schema)
+
+    expected_failures = [
+        failure
+        for table in invalid_workbook
+        for validation_func, schema_section in compile_table_plan(schema[table]).constraints
+        for failure in validation_func(invalid_workbook, table, schema_section)
+    ]
+    assert failures
+    # failures holding a failed row can't be compared with ==
+    assert [repr(failure) for failure in failures] == [repr(failure) for failure in expected_failures]
+
+
 ####################################
 # Test remove_undefined_sheets
 ####################################
@@ -991,3 +1069,53 @@ def test_validate_project_dates(
     )
 
     assert failures == expected_failures
+
+
+def test_validate_project_dates_ignores_missing_dates():
+    workbook = {
+        "Project Progress": pd.DataFrame.from_dict(
+            {
+                "Start Date": pd.Series(
+                    [Timestamp("2024-01-01"), pd.NaT, "2024-01-01", Timestamp("2024-01-01")], dtype=object
+                ),
+                "Completion Date": [pd.NaT, Timestamp("2023-01-01"), Timestamp("2023-01-01"), Timestamp("2023-01-01")],
+            }
+        )
+    }
+
+    failures = validate_project_dates(
+        data_dict=workbook,
+        table="Project Progress",
+        project_date_cols=["Start Date", "Completion Date"],
+    )
+
+    assert [failure.row_index for failure in failures] == [3]
+
+
+def test_table_values_nulls_and_blanks_need_a_present_column():
+    table_values = TableValues(pd.DataFrame({"Name": ["a", "", None]}))
+
+    assert table_values.column("Missing") is None
+    assert table_values.is_blank("Name").tolist() == [False, True, True]
+    with pytest.raises(KeyError):
+        table_values.is_null("Missing")
+    with pytest.raises(KeyError):
+        table_values.is_blank("Missing")
+
+
+def test_validate_data_outcome_failures_convert_to_messages():
+    # outcome cell indexes are worked out from the row's index label, which must be an int as iterrows would give it
+    workbook = {
+        "Outcome_Data": pd.DataFrame(
+            {"Start_Date": [datetime(2023, 4, 1), datetime(2023, 4, 1)], "Amount": [None, "lots"]}, index=[21, 22]
+        )
+    }
+    schema = {"Outcome_Data": {"columns": {"Start_Date": datetime, "Amount": float}, "non-nullable": ["Amount"]}}
+
+    failures = validate_data(workbook, schema)
+    messages = failures_to_messages(failures, TFMessenger())
+
+    assert [(message.cell_indexes, message.error_type) for message in messages] == [
+        (("I21",), "NonNullableConstraintFailure"),
+        (("I22",), "WrongTypeFailure"),
+    ]
@@ -1,4 +1,5 @@
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 from unittest.mock import patch
 from urllib.parse import quote
 
@@ -6,6 +7,10 @@ import pytest
 from bs4 import BeautifulSoup
 from flask import url_for
 
+from data_store.const import DownloadJobStatusEnum
+from data_store.db import db
+from data_store.db.entities import DownloadJob, DownloadJobRequester
+
 
 def test_index_page_redirect(find_test_client):
     response = find_test_client.get("/")
@@ -298,3 +303,80 @@ def test_file_not_exist(find_test_client):
         response.location
         == "/retrieve-download/fund-monitoring-data-2024-07-05-11:18:45-e4c77136-18ca-4ba3-9896-0ce572984e72.json"
     )
+
+
+@pytest.fixture()
+def download_jobs(test_session):
+    """A completed and a running download requested by the Find test user, and one requested by someone else."""
+    now = datetime.now()
+
+    def download_job(email_address, status, age, **progress):
+        download_job = DownloadJob(
+            filters_key=str(uuid.uuid4()),
+            file_format="xlsx",
+            filters={},
+            status=status,
+            created_at=now - age,
+            updated_at=now - age,
+            sheets_total=18,
+            **progress,
+        )
+        download_job.requesters.append(DownloadJobRequester(email_address=email_address, requested_at=now - age))
+        db.session.add(download_job)
+        return download_job
+
+    jobs = [
+        download_job(
+            "test-user@communities.gov.uk",
+            DownloadJobStatusEnum.COMPLETED,
+            timedelta(hours=1),
+            sheets_done=18,
+            rows_written=1234,
+            bytes_uploaded=5678,
+            file_name="fund-monitoring-data.xlsx",
+        ),
+        download_job("test-user@communities.gov.uk", DownloadJobStatusEnum.RUNNING, timedelta(), sheets_done=5),
+        download_job("someone-else@communities.gov.uk", DownloadJobStatusEnum.RUNNING, timedelta()),
+    ]
+    db.session.commit()
+    yield jobs
+    db.session.query(DownloadJob).delete()
+    db.session.commit()
+
+
+def test_downloads_lists_the_users_jobs(find_test_client, download_jobs):
+    response = find_test_client.get("/downloads")
+    assert response.status_code == 200
+
+    page = BeautifulSoup(response.text, "html.parser")
+    rows = page.select("#download-jobs tbody tr")
+    assert [row.select_one(".govuk-tag").text for row in rows] == ["In progress", "Ready"]
+    assert "5 of 18 sheets" in rows[0].text
+    assert rows[1].select_one("a")["href"] == "/retrieve-download/fund-monitoring-data.xlsx"
+
+
+def test_downloads_with_no_jobs(find_test_client, test_session):
+    response = find_test_client.get("/downloads")
+    assert response.status_code == 200
+    assert b"You have not requested any downloads." in response.data
+
+
+def test_download_status(find_test_client, download_jobs):
+    completed, running, _ = download_jobs
+
+    response = find_test_client.get(f"/downloads/{completed.id}")
+    assert response.status_code == 200
+    assert response.json["status"] == "completed"
+    assert response.json["rows_written"] == 1234
+    assert response.json["bytes_uploaded"] == 5678
+    assert response.json["download_url"] == "/retrieve-download/fund-monitoring-data.xlsx"
+
+    response = find_test_client.get(f"/downloads/{running.id}")
+    assert response.json["status"] == "running"
+    assert response.json["sheets_done"] == 5
+    assert "download_url" not in response.json
+
+
+def test_download_status_of_another_users_job(find_test_client, download_jobs):
+    response = find_test_client.get(f"/downloads/{download_jobs[2].id}")
+    assert response.status_code == 404
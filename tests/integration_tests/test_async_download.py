@@ -1,13 +1,35 @@
+import uuid
+from datetime import datetime, timedelta
 from unittest import mock
 from urllib.parse import urlparse
 
 import pytest
 import requests
 
+from app import app as celery_flask_app
+from config import Config
+from data_store.aws import get_s3_client
+from data_store.const import DownloadJobStatusEnum
+from data_store.controllers import async_download as async_download_module
 from data_store.controllers.async_download import (
+    DOWNLOAD_PARTS_PREFIX,
     async_download,
+    get_download_job,
+    set_download_job_status,
     trigger_async_download,
 )
+from data_store.controllers.download import count_download_projects
+from data_store.db import db
+from data_store.db.entities import DownloadJob
+from data_store.serialisation.data_serialiser import DOWNLOAD_SHEETS
+
+
+@pytest.fixture(autouse=True)
+def clear_download_jobs():
+    yield
+    db.session.rollback()
+    db.session.query(DownloadJob).delete()
+    db.session.commit()
 
 
 def test_invalid_file_format(test_session):
@@ -64,3 +86,175 @@ def test_trigger_async_download_endpoint(mocker, seeded_test_client, find_test_c
             continue  # this key has no seeded data
 
         assert len(response.json()[key]) > 0, f"No data has been exported for the {key} field"
+
+
+@pytest.mark.parametrize("threshold, queue", [(0, "large-downloads"), (1_000_000, "celery")])
+def test_trigger_async_download_routes_by_size(mocker, seeded_test_client, threshold, queue):
+    mocker.patch.object(Config, "LARGE_DOWNLOAD_PROJECT_THRESHOLD", threshold)
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+
+    trigger_async_download(body={"email_address": "dev@communities.test", "file_format": "json", "funds": ["HS"]})
+
+    assert apply_async.call_args.kwargs["queue"] == queue
+    assert apply_async.call_args.kwargs["kwargs"]["funds"] == ["HS"]
+
+
+def test_count_download_projects(seeded_test_client):
+    assert count_download_projects() > 0
+    assert count_download_projects(funds=["HS"]) > 0
+    assert count_download_projects(funds=["PF"]) == 0
+    assert count_download_projects(organisations=[str(uuid.uuid4())]) == 0
+
+
+@pytest.mark.usefixtures("test_buckets")
+def test_async_download_task_logs_memory_use(mocker, seeded_test_client):
+    mocker.patch("data_store.controllers.async_download.send_email_for_find_download")
+    mocker.patch.dict(celery_flask_app.config, {"CELERY_TRACEMALLOC_TOP_N": 3})
+    log_info = mocker.spy(celery_flask_app.logger, "info")
+
+    async_download.delay(email_address="dev@communities.test", file_format="json")
+
+    [completed] = [
+        call
+        for call in log_info.call_args_list
+        if "time_taken" in call.kwargs["extra"] and call.kwargs["extra"]["celery_task"] == async_download.name
+    ]
+    assert completed.kwargs["extra"]["peak_rss"] > 0
+    assert len(completed.kwargs["extra"]["top_allocations"]) == 3
+
+
+def test_identical_downloads_share_a_job(mocker, seeded_test_client):
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json", "funds": ["HS", "TD"]})
+    trigger_async_download(
+        body={"email_address": "b@communities.test", "file_format": "json", "funds": ["TD", "HS"], "regions": []}
+    )
+
+    assert apply_async.call_count == 1
+    [download_job] = db.session.query(DownloadJob).all()
+    assert download_job.status == DownloadJobStatusEnum.QUEUED
+    assert [requester.email_address for requester in download_job.requesters] == [
+        "a@communities.test",
+        "b@communities.test",
+    ]
+    assert apply_async.call_args.kwargs["kwargs"]["download_job_id"] == str(download_job.id)
+
+
+def test_different_downloads_get_their_own_jobs(mocker, seeded_test_client):
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json", "funds": ["HS"]})
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "xlsx", "funds": ["HS"]})
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json", "funds": ["TD"]})
+
+    assert apply_async.call_count == 3
+    assert db.session.query(DownloadJob).count() == 3
+
+
+@pytest.mark.parametrize(
+    "status, age",
+    [
+        (DownloadJobStatusEnum.COMPLETED, timedelta()),
+        (DownloadJobStatusEnum.FAILED, timedelta()),
+        (DownloadJobStatusEnum.RUNNING, timedelta(days=1)),
+    ],
+)
+def test_finished_or_stale_jobs_are_not_joined(mocker, seeded_test_client, status, age):
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json"})
+    download_job = db.session.query(DownloadJob).one()
+    download_job.status = status
+    download_job.updated_at = datetime.now() - age
+    db.session.commit()
+
+    trigger_async_download(body={"email_address": "b@communities.test", "file_format": "json"})
+
+    assert apply_async.call_count == 2
+    assert db.session.query(DownloadJob).count() == 2
+
+
+@pytest.mark.usefixtures("test_buckets")
+def test_all_requesters_are_emailed_the_shared_download(mocker, seeded_test_client):
+    mock_send_email = mocker.patch("data_store.controllers.async_download.send_email_for_find_download")
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+    for email_address in ["a@communities.test", "b@communities.test", "a@communities.test"]:
+        trigger_async_download(body={"email_address": email_address, "file_format": "json"})
+
+    async_download.apply(kwargs=apply_async.call_args.kwargs["kwargs"])
+
+    assert [call.kwargs["email_address"] for call in mock_send_email.call_args_list] == [
+        "a@communities.test",
+        "b@communities.test",
+    ]
+    assert len({call.kwargs["download_url"] for call in mock_send_email.call_args_list}) == 1
+    db.session.expire_all()
+    download_job = db.session.query(DownloadJob).one()
+    assert download_job.status == DownloadJobStatusEnum.COMPLETED
+    assert mock_send_email.call_args.kwargs["download_url"].endswith(download_job.file_name)
+    assert download_job.sheets_done == download_job.sheets_total == len(DOWNLOAD_SHEETS)
+    assert download_job.rows_written > 0
+    assert download_job.bytes_uploaded > 0
+
+
+def test_failed_download_fails_its_job(mocker, seeded_test_client):
+    mocker.patch("data_store.controllers.async_download.download_sheet_part", side_effect=ValueError("boom"))
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json"})
+
+    with pytest.raises(ValueError):
+        async_download(**apply_async.call_args.kwargs["kwargs"])
+
+    db.session.expire_all()
+    assert db.session.query(DownloadJob).one().status == DownloadJobStatusEnum.FAILED
+
+
+def test_set_download_job_status_keeps_the_sessions_other_changes(mocker, seeded_test_client):
+    mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json"})
+    download_job = db.session.query(DownloadJob).one()
+    now = datetime.now()
+    db.session.add(DownloadJob(filters_key="other", file_format="xlsx", filters={}, created_at=now, updated_at=now))
+
+    set_download_job_status(str(download_job.id), DownloadJobStatusEnum.FAILED)
+
+    assert download_job.status == DownloadJobStatusEnum.FAILED
+    assert db.session.query(DownloadJob).count() == 2
+
+
+def test_get_download_job_raises_if_it_does_not_exist(test_session):
+    with pytest.raises(ValueError, match="not found"):
+        get_download_job(uuid.uuid4())
+
+
+def _find_download_files_keys() -> list[str]:
+    response = get_s3_client().list_objects_v2(Bucket=Config.AWS_S3_BUCKET_FIND_DOWNLOAD_FILES)
+    return [obj["Key"] for obj in response.get("Contents", [])]
+
+
+@pytest.mark.usefixtures("test_buckets")
+def test_async_download_fans_out_per_sheet_and_cleans_up_parts(mocker, seeded_test_client):
+    mocker.patch("data_store.controllers.async_download.send_email_for_find_download")
+    download_sheet_part = mocker.spy(async_download_module, "download_sheet_part")
+
+    async_download.delay(email_address="dev@communities.test", file_format="xlsx")
+
+    assert [call.args[1] for call in download_sheet_part.call_args_list] == DOWNLOAD_SHEETS
+    keys = _find_download_files_keys()
+    assert any(key.startswith("fund-monitoring-data-") and key.endswith(".xlsx") for key in keys)
+    assert not [key for key in keys if key.startswith(DOWNLOAD_PARTS_PREFIX)]
+
+
+@pytest.mark.usefixtures("test_buckets")
+def test_failed_assembly_fails_its_job_and_cleans_up_parts(mocker, seeded_test_client):
+    mocker.patch("data_store.controllers.async_download.assemble_download_parts", side_effect=ValueError("boom"))
+    mock_send_email = mocker.patch("data_store.controllers.async_download.send_email_for_find_download")
+    apply_async = mocker.patch("data_store.controllers.async_download.async_download.apply_async")
+    trigger_async_download(body={"email_address": "a@communities.test", "file_format": "json"})
+
+    async_download.apply(kwargs=apply_async.call_args.kwargs["kwargs"])
+
+    assert not mock_send_email.called
+    assert not [key for key in _find_download_files_keys() if key.startswith(DOWNLOAD_PARTS_PREFIX)]
+    db.session.expire_all()
+    assert db.session.query(DownloadJob).one().status == DownloadJobStatusEnum.FAILED
@@ -1,5 +1,6 @@
 import io
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import parse_qs, unquote, urlparse
 
 import pytest
@@ -8,11 +9,11 @@ from werkzeug.datastructures import FileStorage
 
 from config import Config
 from data_store.aws import (
-    _S3_CLIENT,
     create_presigned_url,
     get_failed_file_key,
     get_file,
     get_file_header,
+    get_s3_client,
     upload_file,
 )
 from data_store.const import EXCEL_MIMETYPE
@@ -44,9 +45,11 @@ def mock_failed_submission(test_buckets):
     fake_file = io.BytesIO(b"some file")
     fake_key = f"{fake_failure_uuid}.xlsx"
     metadata = {"filename": "fake_file.xlsx"}
-    _S3_CLIENT.upload_fileobj(fake_file, Config.AWS_S3_BUCKET_FAILED_FILES, fake_key, ExtraArgs={"Metadata": metadata})
+    get_s3_client().upload_fileobj(
+        fake_file, Config.AWS_S3_BUCKET_FAILED_FILES, fake_key, ExtraArgs={"Metadata": metadata}
+    )
     yield fake_failure_uuid
-    _S3_CLIENT.delete_object(Bucket=Config.AWS_S3_BUCKET_FAILED_FILES, Key=fake_key)
+    get_s3_client().delete_object(Bucket=Config.AWS_S3_BUCKET_FAILED_FILES, Key=fake_key)
 
 
 @pytest.fixture()
@@ -61,9 +64,9 @@ def uploaded_mock_file(test_generic_bucket):
         "ContentType": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     }
 
-    _S3_CLIENT.upload_fileobj(fake_file, TEST_GENERIC_BUCKET, fake_filename, ExtraArgs=extra_args)
+    get_s3_client().upload_fileobj(fake_file, TEST_GENERIC_BUCKET, fake_filename, ExtraArgs=extra_args)
     yield
-    _S3_CLIENT.delete_object(Bucket=TEST_GENERIC_BUCKET, Key=fake_filename)
+    get_s3_client().delete_object(Bucket=TEST_GENERIC_BUCKET, Key=fake_filename)
 
 
 def test_upload_file(test_session, test_generic_bucket):
@@ -75,7 +78,7 @@ def test_upload_file(test_session, test_generic_bucket):
     uploaded_file = io.BytesIO(b"some file")
     upload_success = upload_file(uploaded_file, TEST_GENERIC_BUCKET, "test-upload-file")
     assert upload_success
-    _S3_CLIENT.delete_object(Bucket=TEST_GENERIC_BUCKET, Key="test-upload-file")  # tear down
+    get_s3_client().delete_object(Bucket=TEST_GENERIC_BUCKET, Key="test-upload-file")  # tear down
 
 
 def test_save_submission_file_s3(seeded_test_client, test_buckets):
@@ -87,7 +90,7 @@ def test_save_submission_file_s3(seeded_test_client, test_buckets):
 
     save_submission_file_s3(file, submission_id)
 
-    response = _S3_CLIENT.get_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=f"HS/{uuid}")
+    response = get_s3_client().get_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=f"HS/{uuid}")
     metadata = response["Metadata"]
 
     assert response["Body"].read() == filebytes
@@ -106,7 +109,7 @@ def test_save_submission_file_s3_ascii_safe(seeded_test_client, test_buckets):
 
     save_submission_file_s3(file, submission_id)
 
-    response = _S3_CLIENT.get_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=f"HS/{uuid}")
+    response = get_s3_client().get_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=f"HS/{uuid}")
     metadata = response["Metadata"]
 
     assert metadata["filename"] == ascii_safe_filename
@@ -135,7 +138,7 @@ def test_get_file_handles_errors(mocker, test_session, test_buckets, raised_exce
     WHEN an error occurs
     THEN the error should be raised
     """
-    mocker.patch("data_store.aws._S3_CLIENT.get_object", side_effect=raised_exception)
+    mocker.patch.object(get_s3_client(), "get_object", side_effect=raised_exception)
     with pytest.raises((ClientError, EndpointConnectionError)) as exception:
         get_file("A_MOCKED_BUCKET", "filename")
     assert str(exception.value) == str(raised_exception)
@@ -219,3 +222,19 @@ def test_create_presigned_url_failure(test_session, uploaded_mock_file):
     """
     with pytest.raises(FileNotFoundError):
         create_presigned_url(bucket_name=TEST_GENERIC_BUCKET, file_key="wrong-file-key", filename="wrong-file.xlsx")
+
+
+def test_get_s3_client_is_created_lazily_and_once(mocker):
+    """
+    GIVEN the S3 client has not yet been created
+    WHEN several threads ask for it at the same time
+    THEN the client should be created exactly once and shared between them
+    """
+    mocker.patch("data_store.aws._S3_CLIENT", None)
+    create_client = mocker.patch("data_store.aws._create_s3_client", side_effect=lambda: object())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: get_s3_client(), range(32)))
+
+    assert create_client.call_count == 1
+    assert all(client is clients[0] for client in clients)
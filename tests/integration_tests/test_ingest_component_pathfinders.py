@@ -328,6 +328,33 @@ def test_ingest_pf_r1_general_validation_errors(
     assert validation_errors == expected_validation_errors
 
 
+def test_ingest_pf_r1_general_validation_errors_fail_fast(
+    test_client, pathfinders_round_1_file_general_validation_failures, test_buckets
+):
+    data, status_code = ingest(
+        excel_file=FileStorage(pathfinders_round_1_file_general_validation_failures, content_type=EXCEL_MIMETYPE),
+        fund_name="Pathfinders",
+        reporting_round=1,
+        do_load=False,
+        auth={
+            "Programme": ("Bolton Council",),
+            "Fund Types": ("Pathfinders",),
+        },
+        max_validation_errors=1,
+    )
+
+    assert status_code == 400
+    assert data["validation_errors"] == [
+        {
+            "cell_index": "B24",
+            "description": "Enter a valid email address, for example, 'name.example@gmail.com'.",
+            "error_type": None,
+            "section": "Contact email",
+            "sheet": "Admin",
+        }
+    ]
+
+
 def test_ingest_pf_r2_general_validation_errors(
     test_client, pathfinders_round_2_file_general_validation_failures, test_buckets
 ):
@@ -6,6 +6,7 @@ import pytest
 from botocore.exceptions import ClientError, EndpointConnectionError
 from werkzeug.datastructures import FileStorage
 
+from data_store.aws import get_s3_client
 from data_store.const import EXCEL_MIMETYPE
 from data_store.controllers.ingest import ingest
 from data_store.db import db
@@ -661,6 +662,25 @@ def test_ingest_with_r4_round_agnostic_failures(test_client, towns_fund_round_4_
     }
 
 
+def test_ingest_with_r4_round_agnostic_failures_capped(
+    test_client, towns_fund_round_4_round_agnostic_failures, test_buckets
+):
+    data, status_code = ingest(
+        excel_file=FileStorage(towns_fund_round_4_round_agnostic_failures, content_type=EXCEL_MIMETYPE),
+        fund_name="Towns Fund",
+        reporting_round=4,
+        do_load=False,
+        auth={
+            "Place Names": ("Blackfriars - Northern City Centre",),
+            "Fund Types": ("Town_Deal", "Future_High_Street_Fund"),
+        },
+        max_validation_errors=2,
+    )
+
+    assert status_code == 400
+    assert len(data["validation_errors"]) == 2
+
+
 def test_ingest_endpoint_invalid_file_type(test_client, wrong_format_test_file, test_buckets):
     """
     Tests that, given a file of the wrong format, the endpoint returns a 400 error.
@@ -735,7 +755,7 @@ def test_ingest_endpoint_s3_upload_failure_db_rollback(
     seed_geospatial_dim_table()  # the geospatial_dim table must be seeded before /ingest can be called
     seed_reporting_round_table()
 
-    mocker.patch("data_store.aws._S3_CLIENT.upload_fileobj", side_effect=raised_exception)
+    mocker.patch.object(get_s3_client(), "upload_fileobj", side_effect=raised_exception)
     with pytest.raises((ClientError, EndpointConnectionError)):
         ingest(
             excel_file=FileStorage(towns_fund_round_4_file_success, content_type=EXCEL_MIMETYPE),
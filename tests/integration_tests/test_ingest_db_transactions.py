@@ -1,4 +1,5 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
@@ -6,14 +7,16 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import pytest
+from sqlalchemy import func, select
 from werkzeug.datastructures import FileStorage
 
 from data_store.const import EXCEL_MIMETYPE
 from data_store.controllers.ingest import clean_data, ingest, populate_db
 from data_store.controllers.load_functions import (
-    add_project_geospatial_relationship,
+    SUBMISSION_PURGE_ORDER,
     delete_existing_submission,
     get_or_generate_submission_id,
+    get_project_geospatial_associations,
     get_submission_by_programme_and_round,
     get_table_to_load_function_mapping,
     load_outputs_outcomes_ref,
@@ -21,6 +24,7 @@ from data_store.controllers.load_functions import (
     load_submission_level_data,
     next_submission_id,
     remove_unreferenced_organisations,
+    upsert_outcomes_outputs,
 )
 from data_store.controllers.mappings import INGEST_MAPPINGS
 from data_store.db import db
@@ -37,12 +41,15 @@ from data_store.db.entities import (
     Project,
     ReportingRound,
     Submission,
+    SubmissionIdCounter,
     project_geospatial_association,
 )
 from data_store.db.queries import (
     get_programme_by_id_and_previous_round,
     get_programme_by_id_and_round,
 )
+from data_store.db.utils import advisory_lock_key
+from data_store.reference_data import KNOWN_OUTPUT_OUTCOME_NAMES
 
 resources = Path(__file__).parent / "mock_tf_r3_transformed_data"
 
@@ -674,6 +681,21 @@ def test_next_submission_numpy_type(test_client_rollback):
     assert sub_id == "S-R01-4"
 
 
+def test_next_submission_id_increments_counter(test_client_rollback):
+    db.session.add(SubmissionIdCounter(submission_id_prefix="S-R01-", last_submission_number=41))
+    db.session.flush()
+
+    # TD and HS share submission IDs, so share a counter
+    assert next_submission_id(round_number=1, fund_code="HS") == "S-R01-42"
+    assert next_submission_id(round_number=1, fund_code="TD") == "S-R01-43"
+    # with no counter or submissions for the prefix, a counter is started at 1
+    assert next_submission_id(round_number=1, fund_code="PF") == "S-PF-R01-1"
+    assert next_submission_id(round_number=1, fund_code="PF") == "S-PF-R01-2"
+
+    counters = {counter.submission_id_prefix: counter.last_submission_number for counter in SubmissionIdCounter.query}
+    assert counters == {"S-R01-": 43, "S-PF-R01-": 2}
+
+
 def test_remove_unreferenced_org(test_client_reset):
     hs_fund_id = Fund.query.filter_by(fund_code="HS").first().id
     organisation_1 = Organisation(
@@ -727,6 +749,20 @@ def test_get_or_generate_submission_id_already_existing_programme_same_round(
     assert submission_to_del is not None
 
 
+def test_submission_purge_order_covers_every_child_table():
+    """Every table that cascades from a submission must be purged explicitly, after its own children."""
+    purged = [(getattr(model, "__table__", model).name, column) for model, column, _ in SUBMISSION_PURGE_ORDER]
+    parents = {"submission_dim", "programme_junction", "project_dim"}
+
+    for table in db.metadata.sorted_tables:
+        for foreign_key in table.foreign_keys:
+            if foreign_key.column.table.name in parents:
+                assert (table.name, foreign_key.parent.name) in purged
+                child_position = purged.index((table.name, foreign_key.parent.name))
+                parent_positions = [i for i, (name, _) in enumerate(purged) if name == foreign_key.column.table.name]
+                assert all(child_position < position for position in parent_positions)
+
+
 def test_get_submission_by_programme_and_round(
     test_client_reset, mock_r3_data_dict, mock_excel_file, mock_successful_file_upload
 ):
@@ -782,9 +818,13 @@ def test_delete_existing_submission(test_client_reset, mock_r3_data_dict, mock_e
 
     assert programme_projects
 
-    delete_existing_submission(programme_projects.in_round_programmes[0].submission_id)
+    timings = delete_existing_submission(programme_projects.in_round_programmes[0].submission_id)
     db.session.commit()
 
+    assert {"project_dim", "outcome_data", "programme_junction", "submission_dim"} <= timings.keys()
+    for model, _, _ in SUBMISSION_PURGE_ORDER:
+        assert db.session.execute(select(func.count()).select_from(model)).scalar() == 0
+
     programme_projects = (
         Programme.query.join(ProgrammeJunction)
         .join(Submission)
@@ -834,6 +874,50 @@ def test_load_outputs_outcomes_ref(test_client_reset, mock_r3_data_dict, mock_ex
     assert outcome
 
 
+def test_upsert_outcomes_outputs(test_client_reset):
+    outcome_mapping = INGEST_MAPPINGS[14]
+    db.session.add(OutcomeDim(outcome_name="existing outcome", outcome_category="cat"))
+    db.session.commit()
+
+    models = [
+        OutcomeDim(outcome_name="existing outcome", outcome_category="cat"),
+        OutcomeDim(outcome_name="new outcome", outcome_category="cat"),
+        OutcomeDim(outcome_name="new outcome", outcome_category="cat"),
+    ]
+    inserted = upsert_outcomes_outputs(outcome_mapping, models)
+    # names are only cached once the transaction commits
+    assert "existing outcome" not in KNOWN_OUTPUT_OUTCOME_NAMES["Outcome_Ref"]
+    db.session.commit()
+
+    assert inserted == ["new outcome"]
+    assert OutcomeDim.query.filter(OutcomeDim.outcome_name == "new outcome").count() == 1
+    # only names that already existed are cached, newly inserted ones are learnt on a later ingest
+    assert "existing outcome" in KNOWN_OUTPUT_OUTCOME_NAMES["Outcome_Ref"]
+    assert "new outcome" not in KNOWN_OUTPUT_OUTCOME_NAMES["Outcome_Ref"]
+
+
+def test_upsert_outcomes_outputs_does_not_cache_names_from_a_rolled_back_transaction(test_client_reset):
+    outcome_mapping = INGEST_MAPPINGS[14]
+    # the second upsert conflicts with the first, whose row only exists in the current transaction
+    upsert_outcomes_outputs(outcome_mapping, [OutcomeDim(outcome_name="uncommitted outcome", outcome_category="cat")])
+    upsert_outcomes_outputs(outcome_mapping, [OutcomeDim(outcome_name="uncommitted outcome", outcome_category="cat")])
+    db.session.rollback()
+    db.session.commit()
+
+    assert "uncommitted outcome" not in KNOWN_OUTPUT_OUTCOME_NAMES["Outcome_Ref"]
+
+
+def test_upsert_outcomes_outputs_skips_known_names(test_client_reset, mocker):
+    outcome_mapping = INGEST_MAPPINGS[14]
+    mocker.patch.dict(KNOWN_OUTPUT_OUTCOME_NAMES, {"Outcome_Ref": {"known outcome"}})
+    scalars = mocker.spy(db.session, "scalars")
+
+    inserted = upsert_outcomes_outputs(outcome_mapping, [OutcomeDim(outcome_name="known outcome")])
+
+    assert inserted == []
+    scalars.assert_not_called()
+
+
 def test_load_submission_level_data(test_client_reset, mock_r3_data_dict, mock_excel_file, mock_successful_file_upload):
     # add mock_r3 data to database
     populate_db(
@@ -856,26 +940,39 @@ def test_load_submission_level_data(test_client_reset, mock_r3_data_dict, mock_e
     assert place
 
 
-def test_add_project_geospatial_relationship(test_client_reset):
+def test_get_project_geospatial_associations(test_client_reset):
     project1 = Project(postcodes=["WC1A 6BD", "  G3 6RQ"])
     project2 = Project(postcodes=["L2 6RE"])
     project3 = Project(postcodes=None)
     project4 = Project(postcodes=["XY2C 5PQ", "ZB1 6RE", "Y2 9LQ"])
+    geospatial_ids = {row.postcode_prefix: row.id for row in GeospatialDim.query.all()}
 
-    passing_result = add_project_geospatial_relationship([project1, project2, project3])
-    assert len(passing_result[0].geospatial_dims) == 2
-    assert passing_result[0].geospatial_dims[0].postcode_prefix == "G"
-    assert passing_result[0].geospatial_dims[1].postcode_prefix == "WC"
-    assert len(passing_result[1].geospatial_dims) == 1
-    assert passing_result[1].geospatial_dims[0].postcode_prefix == "L"
-    assert len(passing_result[2].geospatial_dims) == 0
+    associations = get_project_geospatial_associations([project1, project2, project3])
+    assert associations == [
+        {"project_id": project1.id, "geospatial_id": geospatial_ids["G"]},
+        {"project_id": project1.id, "geospatial_id": geospatial_ids["WC"]},
+        {"project_id": project2.id, "geospatial_id": geospatial_ids["L"]},
+    ]
+    assert project3.id is None
 
     with pytest.raises(Exception) as error:
-        add_project_geospatial_relationship([project4])
+        get_project_geospatial_associations([project4])
     assert error.typename == "MissingGeospatialException"
     assert error.value.description == "Postcode prefixes not found in geospatial table: XY, Y, ZB"
 
 
+def test_get_project_geospatial_associations_refreshes_index_on_miss(test_client_reset):
+    get_project_geospatial_associations([Project(postcodes=["L2 6RE"])])  # loads the index
+    new_geospatial = GeospatialDim(postcode_prefix="XY", itl1_region_code="TLX", itl1_region_name="Nowhere")
+    db.session.add(new_geospatial)
+    db.session.flush()
+
+    project = Project(postcodes=["XY2C 5PQ"])
+    associations = get_project_geospatial_associations([project])
+
+    assert associations == [{"project_id": project.id, "geospatial_id": new_geospatial.id}]
+
+
 def test_ingest_same_submission_different_project_postcodes(
     test_client_reset,
     pathfinders_round_1_file_success,
@@ -955,3 +1052,115 @@ def test_ingest_same_submission_different_project_postcodes(
     ).all()
     for geospatial in geospatial_non_bl_projects:
         assert len(geospatial.projects) == 1
+
+
+def _reload_r3_data():
+    data_dictionary = {table_name: pd.read_csv(path) for path in resources.glob("*.csv") for table_name in [path.stem]}
+    clean_data(data_dictionary)
+    data_dictionary["Project Details"]["Postcodes"] = data_dictionary["Project Details"]["Postcodes"].str.split(",")
+    return data_dictionary
+
+
+def test_populate_db_differential_reingest_of_unchanged_data(
+    test_client_reset, mock_r3_data_dict, mock_excel_file, mock_successful_file_upload
+):
+    populate_db(
+        round_number=3,
+        transformed_data=mock_r3_data_dict,
+        mappings=INGEST_MAPPINGS,
+        excel_file=mock_excel_file,
+        load_mapping=get_table_to_load_function_mapping("Towns Fund"),
+    )
+    submission_before = Submission.query.one()
+    project_ids_before = {project.id for project in Project.query.all()}
+    outcome_ids_before = {outcome.id for outcome in OutcomeData.query.all()}
+    db.session.commit()
+
+    load_report = populate_db(
+        round_number=3,
+        transformed_data=_reload_r3_data(),
+        mappings=INGEST_MAPPINGS,
+        excel_file=mock_excel_file,
+        load_mapping=get_table_to_load_function_mapping("Towns Fund"),
+        differential=True,
+    )
+
+    assert load_report.submission_id == "S-R03-1"
+    assert load_report.rows_touched == 0
+    assert Submission.query.one().id == submission_before.id
+    assert {project.id for project in Project.query.all()} == project_ids_before
+    assert {outcome.id for outcome in OutcomeData.query.all()} == outcome_ids_before
+
+
+def test_populate_db_differential_reingest_applies_only_changes(
+    test_client_reset, mock_r3_data_dict, mock_excel_file, mock_successful_file_upload
+):
+    populate_db(
+        round_number=3,
+        transformed_data=mock_r3_data_dict,
+        mappings=INGEST_MAPPINGS,
+        excel_file=mock_excel_file,
+        load_mapping=get_table_to_load_function_mapping("Towns Fund"),
+    )
+    project_before = Project.query.filter_by(project_id="FHSFDCC001").one()
+    project_uuid, funding_comment_count = project_before.id, FundingComment.query.count()
+    db.session.commit()
+
+    data = _reload_r3_data()
+    data["Project Details"].loc[data["Project Details"]["Project ID"] == "FHSFDCC001", "Project Name"] = "Renamed"
+    data["Funding Comments"] = data["Funding Comments"].iloc[1:]
+    new_question = pd.DataFrame([{"Programme ID": "FHSF001", "Question": "A new question", "Answer": "An answer"}])
+    data["Programme Progress"] = pd.concat([data["Programme Progress"], new_question], ignore_index=True)
+
+    load_report = populate_db(
+        round_number=3,
+        transformed_data=data,
+        mappings=INGEST_MAPPINGS,
+        excel_file=mock_excel_file,
+        load_mapping=get_table_to_load_function_mapping("Towns Fund"),
+        differential=True,
+    )
+
+    assert load_report.rows_touched == 3
+    assert load_report.to_dict()["tables"]["Project Details"] == {"inserted": 0, "updated": 1, "deleted": 0}
+    assert load_report.to_dict()["tables"]["Funding Comments"] == {"inserted": 0, "updated": 0, "deleted": 1}
+    assert load_report.to_dict()["tables"]["Programme Progress"] == {"inserted": 1, "updated": 0, "deleted": 0}
+
+    project_after = Project.query.filter_by(project_id="FHSFDCC001").one()
+    assert project_after.id == project_uuid
+    assert project_after.project_name == "Renamed"
+    # children of the updated project are retained rather than re-inserted
+    assert project_after.funding_comments
+    assert FundingComment.query.count() == funding_comment_count - 1
+    assert project_after.geospatial_dims
+
+
+def test_populate_db_concurrent_ingests_of_same_programme_queue_without_retrying(
+    test_client_reset, mock_excel_file, mock_successful_file_upload, caplog
+):
+    app = test_client_reset.application
+    db.session.commit()
+
+    def ingest_r3_data():
+        with app.app_context():
+            populate_db(
+                round_number=3,
+                transformed_data=_reload_r3_data(),
+                mappings=INGEST_MAPPINGS,
+                excel_file=mock_excel_file,
+                load_mapping=get_table_to_load_function_mapping("Towns Fund"),
+            )
+            db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for future in [executor.submit(ingest_r3_data) for _ in range(3)]:
+            future.result()
+
+    assert [submission.submission_id for submission in Submission.query.all()] == ["S-R03-1"]
+    assert "Retry count" not in caplog.text
+
+
+def test_advisory_lock_key_is_stable_and_distinct():
+    assert advisory_lock_key("programme", "FHSF001") == advisory_lock_key("programme", "FHSF001")
+    assert advisory_lock_key("programme", "FHSF001") != advisory_lock_key("programme", "FHSF002")
+    assert -(2**63) <= advisory_lock_key("submission_id", "S-R{0:0=2d}-{1}", 3) < 2**63
@@ -87,7 +87,8 @@ def test_sentry_metrics_emitted_from_ingest_endpoint(
             tags={"fund": "Pathfinders", "reporting_round": 2, "organisation": "Bolton Council", "result": "success"},
         ),
     ]
-    assert mock_sentry_metrics.distribution.call_args_list == [
+    stage_metrics = {FundingMetrics.SUBMISSION_INGEST_STAGE_DURATION, FundingMetrics.SUBMISSION_INGEST_STAGE_ROWS}
+    assert [call for call in mock_sentry_metrics.distribution.call_args_list if call.args[0] not in stage_metrics] == [
         mock.call(
             FundingMetrics.SUBMISSION_VALIDATION_ERRORS_TOTAL,
             0,
@@ -150,3 +151,45 @@ def test_sentry_metrics_emitted_from_ingest_endpoint(
             tags={"fund": "Pathfinders", "reporting_round": 2, "organisation": "Bolton Council"},
         ),
     ]
+
+
+def test_ingest_stage_metrics_emitted_from_ingest_endpoint(
+    test_client_reset, pathfinders_round_1_file_success, test_buckets, mock_sentry_metrics
+):
+    ingest(
+        excel_file=FileStorage(pathfinders_round_1_file_success, content_type=EXCEL_MIMETYPE),
+        fund_name="Pathfinders",
+        reporting_round=1,
+        do_load=True,
+        auth={"Programme": ("Bolton Council",), "Fund Types": ("Pathfinders",)},
+    )
+
+    durations, rows = {}, {}
+    for call in mock_sentry_metrics.distribution.call_args_list:
+        metric, value = call.args
+        if metric == FundingMetrics.SUBMISSION_INGEST_STAGE_DURATION:
+            durations[call.kwargs["tags"]["stage"]] = value
+            assert call.kwargs["unit"] == "second"
+        elif metric == FundingMetrics.SUBMISSION_INGEST_STAGE_ROWS:
+            rows[call.kwargs["tags"]["stage"]] = value
+        else:
+            continue
+        assert call.kwargs["tags"]["fund"] == "Pathfinders"
+        assert call.kwargs["tags"]["reporting_round"] == 1
+
+    assert list(durations) == [
+        "extract_data",
+        "initial_validate",
+        "extract_process_validate_tables",
+        "cross_table_validate",
+        "coerce_data",
+        "transform",
+        "clean_data",
+        *[stage for stage in durations if stage.startswith("load:")],
+        "s3_upload",
+    ]
+    assert "load:Project Details" in durations
+    assert all(duration >= 0 for duration in durations.values())
+    assert rows["extract_data"] > 0
+    assert rows["transform"] == rows["clean_data"] > 0
+    assert "s3_upload" not in rows
@@ -0,0 +1,52 @@
+"""Caps the number of SQL statements issued by the main ingest, download and find journeys.
+
+If one of these fails, the change has most likely added a query per row or per table - check the slowest statements in
+the failure message before raising the budget.
+"""
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from data_store.const import EXCEL_MIMETYPE
+from data_store.controllers.download import download
+from data_store.controllers.ingest import ingest
+
+
+def test_towns_fund_ingest_query_budget(test_client_reset, towns_fund_round_3_file_success, test_buckets, query_budget):
+    with query_budget(1450):
+        _, status_code = ingest(
+            excel_file=FileStorage(towns_fund_round_3_file_success, content_type=EXCEL_MIMETYPE),
+            fund_name="Towns Fund",
+            reporting_round=3,
+            do_load=True,
+        )
+
+    assert status_code == 200
+
+
+def test_pathfinders_ingest_query_budget(
+    test_client_reset, pathfinders_round_1_file_success, test_buckets, query_budget
+):
+    with query_budget(500):
+        _, status_code = ingest(
+            excel_file=FileStorage(pathfinders_round_1_file_success, content_type=EXCEL_MIMETYPE),
+            fund_name="Pathfinders",
+            reporting_round=1,
+            do_load=True,
+            auth={"Programme": ("Bolton Council",), "Fund Types": ("Pathfinders",)},
+        )
+
+    assert status_code == 200
+
+
+@pytest.mark.parametrize("file_format", ["json", "xlsx"])
+def test_download_query_budget(seeded_test_client, query_budget, file_format):
+    with query_budget(60):
+        download(file_format=file_format)
+
+
+def test_find_download_page_query_budget(seeded_test_client, find_test_client, query_budget):
+    with query_budget(10):
+        response = find_test_client.get("/download")
+
+    assert response.status_code == 200
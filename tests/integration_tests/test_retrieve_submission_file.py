@@ -4,7 +4,7 @@ from urllib.parse import parse_qs, unquote, urlparse
 import pytest
 
 from config import Config
-from data_store.aws import _S3_CLIENT
+from data_store.aws import get_s3_client
 from data_store.const import EXCEL_MIMETYPE
 from data_store.controllers.retrieve_submission_file import get_custom_file_name, retrieve_submission_file
 from data_store.db.entities import Submission
@@ -19,14 +19,14 @@ def uploaded_mock_file(seeded_test_client, test_buckets):
     )
     key = f"HS/{uuid}"
     metadata = {"filename": "fake_file.xlsx"}
-    _S3_CLIENT.upload_fileobj(
+    get_s3_client().upload_fileobj(
         fake_file,
         Config.AWS_S3_BUCKET_SUCCESSFUL_FILES,
         key,
         ExtraArgs={"Metadata": metadata, "ContentType": EXCEL_MIMETYPE},
     )
     yield
-    _S3_CLIENT.delete_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=key)
+    get_s3_client().delete_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=key)
 
 
 @pytest.fixture()
@@ -45,14 +45,14 @@ def uploaded_mock_file_ingest_spreadsheet_name(seeded_test_client, test_buckets)
         "submission_id": "S-R03-1",
         "programme_name": "Leaky Cauldron regeneration",
     }
-    _S3_CLIENT.upload_fileobj(
+    get_s3_client().upload_fileobj(
         fake_file,
         Config.AWS_S3_BUCKET_SUCCESSFUL_FILES,
         key,
         ExtraArgs={"Metadata": metadata, "ContentType": EXCEL_MIMETYPE},
     )
     yield
-    _S3_CLIENT.delete_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=key)
+    get_s3_client().delete_object(Bucket=Config.AWS_S3_BUCKET_SUCCESSFUL_FILES, Key=key)
 
 
 def test_retrieve_submission_file_invalid_id(seeded_test_client):